@@ -1,21 +1,71 @@
 from __future__ import annotations
 
-from fastapi import FastAPI, Header, HTTPException
+from contextlib import asynccontextmanager
+from dataclasses import asdict
+from datetime import datetime
+
+from fastapi import FastAPI, Header, HTTPException, Request
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
 
+from backend.audit.export import EXPORT_FORMATS, AuditExportFilter, stream_audit_export
+from backend.audit.service import log_event
+from backend.audit.timeline import DEFAULT_HISTORY_LIMIT, document_history, timeline_length
+from backend.auth.hashing import HashingBusy, password_hasher
 from backend.auth.models import Role
 from backend.auth.rbac import PermissionDenied
-from backend.auth.service import AuthError, create_user, login, validate_token
+from backend.auth.service import (
+    AuthError,
+    complete_login,
+    create_user,
+    get_password_hash,
+    hash_password,
+    log_login_failure,
+    revoke_all_sessions,
+    validate_token,
+    verify_password,
+)
+from backend.auth.sweeper import session_sweeper
+from backend.auth.throttle import login_throttle, signature_reauth_throttle
 from backend.db.base import Base
 from backend.db.session import engine, get_session
-from backend.documents.service import DocumentError, add_version, create_document, transition_document
-from backend.signatures.service import SignatureError, sign_and_approve
+from backend.documents import blobstore
+from backend.documents.blobstore import BlobStoreError, BlobTooLarge
+from backend.documents.diff import diff_versions
+from backend.documents.queries import DEFAULT_PAGE_SIZE, get_document_summary, list_documents
+from backend.documents.search import DEFAULT_SEARCH_LIMIT, SearchUnavailable, search_documents
+from backend.documents.service import (
+    ConcurrentUpdateError,
+    DocumentError,
+    add_version,
+    add_version_from_blob,
+    create_document,
+    get_streamable_version,
+    get_versionable_document,
+    iter_version_content,
+    retry_on_conflict,
+    transition_document,
+    transition_documents_bulk,
+    version_content_size,
+)
+from backend.signatures.service import BatchSignatureError, SignatureError, sign_and_approve, sign_and_approve_batch
+from backend.signatures.verification import SIGNATURE_VERIFY_PAGE_SIZE, SignatureFilter, verify_signatures
 from backend.workflow.state_machine import DocumentState, WorkflowError
 
-app = FastAPI(title="GxP EDMS")
 Base.metadata.create_all(engine)
 
 
+@asynccontextmanager
+async def lifespan(_app: FastAPI):
+    session_sweeper.start()
+    yield
+    session_sweeper.stop()
+
+
+app = FastAPI(title="GxP EDMS", lifespan=lifespan)
+
+
 class UserIn(BaseModel):
     username: str
     password: str
@@ -30,6 +80,7 @@ class LoginIn(BaseModel):
 class DocumentIn(BaseModel):
     doc_number: str
     title: str
+    workflow: str | None = None
 
 
 class VersionIn(BaseModel):
@@ -40,6 +91,18 @@ class SignIn(BaseModel):
     meaning: str
 
 
+class BulkTransitionIn(BaseModel):
+    doc_numbers: list[str]
+    target_state: DocumentState
+
+
+class BatchSignIn(BaseModel):
+    doc_numbers: list[str]
+    meaning: str
+    password: str
+    all_or_nothing: bool = True
+
+
 def _token_to_claims(authorization: str | None, session) -> dict:
     if not authorization:
         raise HTTPException(401, "Missing Authorization header")
@@ -54,32 +117,141 @@ def _token_to_claims(authorization: str | None, session) -> dict:
 
 @app.post("/users")
 def create_user_route(payload: UserIn):
+    try:
+        password_hash = password_hasher.run(hash_password, payload.password)
+    except HashingBusy as exc:
+        raise HTTPException(503, str(exc)) from exc
+    except AuthError as exc:
+        raise HTTPException(400, str(exc)) from exc
     with get_session() as session:
         try:
-            create_user(session, payload.username, payload.password, payload.role)
+            create_user(session, payload.username, payload.password, payload.role, password_hash=password_hash)
         except AuthError as exc:
             raise HTTPException(400, str(exc)) from exc
     return {"status": "created"}
 
 
+def _reject_login(username: str, status_code: int, detail: str) -> HTTPException:
+    reports = login_throttle.take_evicted()
+    attempts = login_throttle.record_failure(username)
+    if attempts:
+        reports.append((username, attempts))
+    if reports:
+        with get_session() as session:
+            for reported, count in reports:
+                log_login_failure(session, reported, count)
+    return HTTPException(status_code, detail)
+
+
 @app.post("/auth/login")
-def login_route(payload: LoginIn):
+def login_route(payload: LoginIn, request: Request):
+    client = request.client.host if request.client else None
+    if not login_throttle.allow(payload.username, client):
+        raise _reject_login(payload.username, 429, "Too many login attempts, retry later")
+    with get_session() as session:
+        encoded = get_password_hash(session, payload.username)
+    try:
+        verified = encoded is not None and password_hasher.run(verify_password, payload.password, encoded)
+    except HashingBusy as exc:
+        raise HTTPException(503, str(exc)) from exc
+    try:
+        with get_session() as session:
+            token = complete_login(session, payload.username, verified, audit_failure=False)
+    except AuthError as exc:
+        raise _reject_login(payload.username, 401, str(exc)) from exc
+    return {"access_token": token}
+
+
+@app.post("/users/{username}/sessions/revoke")
+def revoke_sessions_route(username: str, authorization: str | None = Header(default=None)):
     with get_session() as session:
+        claims = _token_to_claims(authorization, session)
+        if claims["sub"] != username and Role(claims["role"]) != Role.ADMIN:
+            raise HTTPException(403, "Only Admin can revoke another user's sessions")
         try:
-            token = login(session, payload.username, payload.password)
+            revoked = revoke_all_sessions(session, username, claims["sub"])
         except AuthError as exc:
-            raise HTTPException(401, str(exc)) from exc
-    return {"access_token": token}
+            raise HTTPException(404, str(exc)) from exc
+    return {"status": "revoked", "sessions": revoked}
 
 
 @app.post("/documents")
 def create_document_route(payload: DocumentIn, authorization: str | None = Header(default=None)):
     with get_session() as session:
         claims = _token_to_claims(authorization, session)
-        create_document(session, payload.doc_number, payload.title, claims["sub"])
+        try:
+            create_document(session, payload.doc_number, payload.title, claims["sub"], payload.workflow)
+        except DocumentError as exc:
+            raise HTTPException(400, str(exc)) from exc
     return {"status": "created"}
 
 
+@app.get("/documents")
+def list_documents_route(
+    state: DocumentState | None = None,
+    owner: str | None = None,
+    locked: bool | None = None,
+    created_from: datetime | None = None,
+    created_to: datetime | None = None,
+    cursor: str | None = None,
+    limit: int = DEFAULT_PAGE_SIZE,
+    authorization: str | None = Header(default=None),
+):
+    with get_session() as session:
+        _token_to_claims(authorization, session)
+        try:
+            items, next_cursor = list_documents(
+                session,
+                state=state,
+                owner_username=owner,
+                locked=locked,
+                created_from=created_from,
+                created_to=created_to,
+                cursor=cursor,
+                limit=limit,
+            )
+        except DocumentError as exc:
+            raise HTTPException(400, str(exc)) from exc
+    return {"items": items, "next_cursor": next_cursor}
+
+
+@app.get("/search")
+def search_route(q: str, limit: int = DEFAULT_SEARCH_LIMIT, authorization: str | None = Header(default=None)):
+    with get_session() as session:
+        _token_to_claims(authorization, session)
+        try:
+            return {"hits": search_documents(session, q, max(1, min(limit, 100)))}
+        except SearchUnavailable as exc:
+            raise HTTPException(400, str(exc)) from exc
+
+
+@app.get("/documents/{doc_number}")
+def get_document_route(doc_number: str, authorization: str | None = Header(default=None)):
+    with get_session() as session:
+        _token_to_claims(authorization, session)
+        try:
+            return get_document_summary(session, doc_number)
+        except DocumentError as exc:
+            raise HTTPException(404, str(exc)) from exc
+
+
+@app.get("/documents/{doc_number}/history")
+def document_history_route(
+    doc_number: str,
+    before_position: int | None = None,
+    limit: int = DEFAULT_HISTORY_LIMIT,
+    authorization: str | None = Header(default=None),
+):
+    with get_session() as session:
+        _token_to_claims(authorization, session)
+        items = document_history(session, doc_number, before_position=before_position, limit=limit)
+        total = timeline_length(session, doc_number)
+    if not total:
+        raise HTTPException(404, "Document not found")
+    next_before = items[-1]["position"] if items and items[-1]["position"] > 1 else None
+    return {"items": items, "total": total, "next_before_position": next_before}
+
+
 @app.post("/documents/{doc_number}/versions")
 def add_version_route(doc_number: str, payload: VersionIn, authorization: str | None = Header(default=None)):
     with get_session() as session:
@@ -91,23 +263,278 @@ def add_version_route(doc_number: str, payload: VersionIn, authorization: str |
     return {"status": "versioned"}
 
 
+def _authorize_upload(doc_number: str, authorization: str | None) -> dict:
+    with get_session() as session:
+        claims = _token_to_claims(authorization, session)
+        try:
+            get_versionable_document(session, doc_number, Role(claims["role"]))
+        except (PermissionDenied, DocumentError) as exc:
+            raise HTTPException(403, str(exc)) from exc
+    return claims
+
+
+def _register_uploaded_version(doc_number: str, checksum: str, claims: dict) -> int:
+    with get_session() as session:
+        try:
+            version = add_version_from_blob(session, doc_number, checksum, claims["sub"], Role(claims["role"]))
+        except (PermissionDenied, DocumentError) as exc:
+            raise HTTPException(403, str(exc)) from exc
+        return version.version_no
+
+
+@app.post("/documents/{doc_number}/versions/stream")
+async def upload_version_stream_route(
+    doc_number: str,
+    request: Request,
+    authorization: str | None = Header(default=None),
+):
+    if blobstore.blob_store is None:
+        raise HTTPException(503, "Streaming upload requires DOCUMENT_BLOB_DIR")
+    declared = request.headers.get("content-length")
+    if declared and declared.isdigit() and int(declared) > blobstore.MAX_UPLOAD_BYTES:
+        raise HTTPException(413, f"Version content exceeds {blobstore.MAX_UPLOAD_BYTES} bytes")
+    claims = await run_in_threadpool(_authorize_upload, doc_number, authorization)
+    # Disk writes and the final fsync run off the event loop.
+    writer = await run_in_threadpool(blobstore.blob_store.writer)
+    try:
+        async for chunk in request.stream():
+            await run_in_threadpool(writer.write, chunk)
+        checksum = await run_in_threadpool(writer.commit)
+    except BlobTooLarge as exc:
+        writer.abort()
+        raise HTTPException(413, str(exc)) from exc
+    except BlobStoreError as exc:
+        writer.abort()
+        raise HTTPException(400, str(exc)) from exc
+    except BaseException:
+        writer.abort()
+        raise
+    version_no = await run_in_threadpool(_register_uploaded_version, doc_number, checksum, claims)
+    return {"status": "versioned", "version_no": version_no, "checksum": checksum, "size": writer.size}
+
+
+def _parse_range(header: str | None, size: int) -> tuple[int, int] | None:
+    if not header:
+        return None
+    unit, _, spec = header.partition("=")
+    try:
+        if unit.strip() != "bytes" or "," in spec:
+            raise ValueError(header)
+        first, _, last = spec.strip().partition("-")
+        if first:
+            start = int(first)
+            end = min(int(last) + 1, size) if last else size
+        else:
+            start, end = max(size - int(last), 0), size
+    except ValueError as exc:
+        raise HTTPException(416, "Unsupported Range header") from exc
+    if start >= end:
+        raise HTTPException(416, "Requested range not satisfiable", headers={"Content-Range": f"bytes */{size}"})
+    return start, end
+
+
+@app.get("/documents/{doc_number}/versions/{version_no}/content")
+def download_version_route(
+    doc_number: str,
+    version_no: int,
+    range_header: str | None = Header(default=None, alias="Range"),
+    authorization: str | None = Header(default=None),
+):
+    with get_session() as session:
+        _token_to_claims(authorization, session)
+        try:
+            version = get_streamable_version(session, doc_number, version_no)
+            size = version_content_size(version)
+        except DocumentError as exc:
+            raise HTTPException(404, str(exc)) from exc
+    byte_range = _parse_range(range_header, size)
+    start, end = byte_range or (0, size)
+    headers = {"Accept-Ranges": "bytes", "Content-Length": str(end - start), "ETag": f'"{version.checksum}"'}
+    if byte_range:
+        headers["Content-Range"] = f"bytes {start}-{end - 1}/{size}"
+    return StreamingResponse(
+        iter_version_content(version, start, end),
+        status_code=206 if byte_range else 200,
+        media_type="text/plain; charset=utf-8",
+        headers=headers,
+    )
+
+
+@app.get("/documents/{doc_number}/diff")
+def diff_versions_route(
+    doc_number: str,
+    to_version: int,
+    from_version: int | None = None,
+    authorization: str | None = Header(default=None),
+):
+    with get_session() as session:
+        _token_to_claims(authorization, session)
+        try:
+            lines = diff_versions(session, doc_number, from_version or to_version - 1, to_version)
+        except DocumentError as exc:
+            raise HTTPException(404, str(exc)) from exc
+    return StreamingResponse(lines, media_type="text/x-diff; charset=utf-8")
+
+
 @app.post("/documents/{doc_number}/submit-review")
 def submit_review_route(doc_number: str, authorization: str | None = Header(default=None)):
+    with get_session() as session:
+        claims = _token_to_claims(authorization, session)
+    try:
+        retry_on_conflict(
+            get_session,
+            lambda session: transition_document(
+                session, doc_number, DocumentState.REVIEW, claims["sub"], Role(claims["role"])
+            ),
+        )
+    except ConcurrentUpdateError as exc:
+        raise HTTPException(409, str(exc)) from exc
+    except (PermissionDenied, WorkflowError, DocumentError) as exc:
+        raise HTTPException(403, str(exc)) from exc
+    return {"status": "in_review"}
+
+
+@app.post("/documents/transitions")
+def bulk_transition_route(payload: BulkTransitionIn, authorization: str | None = Header(default=None)):
     with get_session() as session:
         claims = _token_to_claims(authorization, session)
         try:
-            transition_document(session, doc_number, DocumentState.REVIEW, claims["sub"], Role(claims["role"]))
-        except (PermissionDenied, WorkflowError, DocumentError) as exc:
+            result = transition_documents_bulk(
+                session, payload.doc_numbers, payload.target_state, claims["sub"], Role(claims["role"])
+            )
+        except (PermissionDenied, WorkflowError) as exc:
             raise HTTPException(403, str(exc)) from exc
-    return {"status": "in_review"}
+    return {"changed": result.changed, "skipped": result.skipped}
 
 
 @app.post("/documents/{doc_number}/sign-approve")
 def sign_approve_route(doc_number: str, payload: SignIn, authorization: str | None = Header(default=None)):
     with get_session() as session:
         claims = _token_to_claims(authorization, session)
+    try:
+        retry_on_conflict(
+            get_session,
+            lambda session: sign_and_approve(session, doc_number, claims["sub"], payload.meaning, Role(claims["role"])),
+        )
+    except ConcurrentUpdateError as exc:
+        raise HTTPException(409, str(exc)) from exc
+    except (PermissionDenied, SignatureError, WorkflowError, DocumentError) as exc:
+        raise HTTPException(403, str(exc)) from exc
+    return {"status": "approved"}
+
+
+def _reject_reauth(username: str, documents: int, status_code: int, detail: str) -> HTTPException:
+    reports = signature_reauth_throttle.take_evicted()
+    attempts = signature_reauth_throttle.record_failure(username)
+    if attempts:
+        reports.append((username, attempts))
+    if not reports:
+        return HTTPException(status_code, detail)
+    with get_session() as session:
+        for reported, count in reports:
+            metadata = {"attempts": count} if count > 1 else {}
+            if reported == username:
+                metadata["documents"] = documents
+            log_event(session, "SIGNATURE_REAUTH_FAILED", reported, metadata)
+    return HTTPException(status_code, detail)
+
+
+@app.post("/documents/sign-approve-batch")
+def sign_approve_batch_route(payload: BatchSignIn, authorization: str | None = Header(default=None)):
+    with get_session() as session:
+        claims = _token_to_claims(authorization, session)
+        encoded = get_password_hash(session, claims["sub"])
+    # Shares /auth/login's per-username buckets, so a bearer token cannot be used to guess the password here.
+    if not signature_reauth_throttle.allow(claims["sub"], None):
+        raise _reject_reauth(claims["sub"], len(payload.doc_numbers), 429, "Too many re-authentication attempts")
+    try:
+        verified = encoded is not None and password_hasher.run(verify_password, payload.password, encoded)
+    except HashingBusy as exc:
+        raise HTTPException(503, str(exc)) from exc
+    if not verified:
+        raise _reject_reauth(claims["sub"], len(payload.doc_numbers), 401, "Signature re-authentication failed")
+    with get_session() as session:
         try:
-            sign_and_approve(session, doc_number, claims["sub"], payload.meaning, Role(claims["role"]))
-        except (PermissionDenied, SignatureError, WorkflowError, DocumentError) as exc:
+            results = sign_and_approve_batch(
+                session,
+                payload.doc_numbers,
+                claims["sub"],
+                payload.meaning,
+                Role(claims["role"]),
+                all_or_nothing=payload.all_or_nothing,
+            )
+        except BatchSignatureError as exc:
+            raise HTTPException(409, {"message": str(exc), "results": [asdict(r) for r in exc.results]}) from exc
+        except ConcurrentUpdateError as exc:
+            raise HTTPException(409, str(exc)) from exc
+        except (PermissionDenied, SignatureError) as exc:
             raise HTTPException(403, str(exc)) from exc
-    return {"status": "approved"}
+    signed = sum(result.signed for result in results)
+    return {
+        "status": "approved" if signed == len(results) else "partial",
+        "signed": signed,
+        "results": [asdict(result) for result in results],
+    }
+
+
+@app.get("/signatures/verify")
+def verify_signatures_route(
+    signer: str | None = None,
+    doc_number: str | None = None,
+    signed_from: datetime | None = None,
+    signed_to: datetime | None = None,
+    after_id: int | None = None,
+    limit: int = SIGNATURE_VERIFY_PAGE_SIZE,
+    authorization: str | None = Header(default=None),
+):
+    filters = SignatureFilter(signer, doc_number, signed_from, signed_to)
+    limit = max(1, min(limit, SIGNATURE_VERIFY_PAGE_SIZE))
+    with get_session() as session:
+        claims = _token_to_claims(authorization, session)
+        if Role(claims["role"]) != Role.ADMIN:
+            raise HTTPException(403, "Only Admin can verify signatures in bulk")
+        # One bounded page, in-process: the worker pool is for the offline CLI.
+        verification = verify_signatures(session, filters, workers=1, after_id=after_id, limit=limit)
+        log_event(
+            session,
+            "SIGNATURE_VERIFICATION",
+            claims["sub"],
+            {key: str(value) for key, value in asdict(filters).items() if value}
+            | {"after_id": after_id, "checked": verification.checked, "mismatches": len(verification.mismatches)},
+        )
+    return {
+        "checked": verification.checked,
+        "ok": verification.ok,
+        "mismatches": verification.mismatches,
+        "seconds": round(verification.seconds, 3),
+        "next_after_id": verification.last_id if verification.checked == limit else None,
+    }
+
+
+@app.get("/audit/export")
+def export_audit_route(
+    format: str = "ndjson",
+    record_type: str | None = None,
+    record_id: str | None = None,
+    actor: str | None = None,
+    created_from: datetime | None = None,
+    created_to: datetime | None = None,
+    after_id: int = 0,
+    authorization: str | None = Header(default=None),
+):
+    if format not in EXPORT_FORMATS:
+        raise HTTPException(400, f"Unsupported export format: {format}")
+    filters = AuditExportFilter(record_type, record_id, actor, created_from, created_to, after_id)
+    with get_session() as session:
+        claims = _token_to_claims(authorization, session)
+        if Role(claims["role"]) != Role.ADMIN:
+            raise HTTPException(403, "Only Admin can export the audit trail")
+        log_event(
+            session,
+            "AUDIT_EXPORT",
+            claims["sub"],
+            {key: str(value) for key, value in asdict(filters).items() if value} | {"format": format},
+            record_type or "system",
+            record_id or "n/a",
+        )
+    return StreamingResponse(stream_audit_export(format, filters), media_type=EXPORT_FORMATS[format])
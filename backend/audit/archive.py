@@ -0,0 +1,360 @@
+"""Time-partitioned cold storage for the audit trail.
+
+Usage:
+    python -m backend.audit.archive seal [--before ISO]
+    python -m backend.audit.archive verify
+
+``seal`` moves the oldest run of the chain, up to the first event created on or
+after the cutoff (by default the start of the month ``AUDIT_HOT_RETENTION_DAYS``
+ago) and rounded down to the last completed checkpoint block, out of
+``audit_events`` into one read-only segment file per month. A segment is a
+series of zlib-compressed NDJSON blocks; its ``.idx`` sidecar is a sparse
+index of each block's id, sequence and created_at bounds plus a per-block
+checksum. ``audit_segments`` records every segment's bounds and file
+checksums, so retention is complete while the hot table stays bounded.
+
+Because segments are contiguous, disjoint runs of the chain that all precede
+the hot table, reading segments in order and then the hot table yields events
+in ``id`` order.
+"""
+
+from __future__ import annotations
+
+import argparse
+from collections.abc import Iterator
+from datetime import datetime, timedelta, timezone
+import hashlib
+import json
+import os
+from pathlib import Path
+import secrets
+from typing import TYPE_CHECKING
+import zlib
+
+from sqlalchemy import delete, func, select
+from sqlalchemy.orm import Session
+
+from backend.audit.chain import GENESIS_HASH, canonical_event_bytes, chain_hash
+from backend.audit.models import AuditCheckpoint, AuditEvent, AuditSegment
+from backend.audit.service import log_event
+from backend.db.session import get_session
+from backend.db.types import COMPRESSION_LEVEL, utcnow
+
+if TYPE_CHECKING:
+    from backend.audit.export import AuditExportFilter
+
+AUDIT_ARCHIVE_DIR = os.getenv("AUDIT_ARCHIVE_DIR")
+AUDIT_HOT_RETENTION_DAYS = int(os.getenv("AUDIT_HOT_RETENTION_DAYS", "90"))
+SEGMENT_BLOCK_EVENTS = 1024
+SEAL_BATCH_SIZE = 1000
+_RECORD_FIELDS = (
+    "id",
+    "sequence",
+    "created_at",
+    "event_type",
+    "actor",
+    "record_type",
+    "record_id",
+    "metadata",
+    "prev_hash",
+    "event_hash",
+)
+
+
+class ArchiveError(Exception):
+    pass
+
+
+def _utc(value: datetime | None) -> datetime | None:
+    if value is None or value.tzinfo is not None:
+        return value
+    return value.replace(tzinfo=timezone.utc)
+
+
+def archive_root() -> Path:
+    if not AUDIT_ARCHIVE_DIR:
+        raise ArchiveError("AUDIT_ARCHIVE_DIR is not configured")
+    return Path(AUDIT_ARCHIVE_DIR)
+
+
+def default_cutoff(now: datetime | None = None) -> datetime:
+    """Start of the month that was current ``AUDIT_HOT_RETENTION_DAYS`` ago."""
+    edge = (now or utcnow()) - timedelta(days=AUDIT_HOT_RETENTION_DAYS)
+    return edge.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+
+
+class SegmentWriter:
+    """Appends records to a temporary segment, one compressed block per ``block_events`` records."""
+
+    def __init__(self, root: Path, period: str, block_events: int = SEGMENT_BLOCK_EVENTS) -> None:
+        self.root = root
+        self.period = period
+        self.block_events = block_events
+        self.blocks: list[dict] = []
+        self.first: dict | None = None
+        self.last: dict | None = None
+        self.count = 0
+        self._pending: list[dict] = []
+        self._offset = 0
+        self._digest = hashlib.sha256()
+        root.mkdir(parents=True, exist_ok=True)
+        self._tmp_path = root / f".{period}.{secrets.token_hex(8)}.tmp"
+        self._handle = self._tmp_path.open("wb")
+
+    def add(self, record: dict) -> None:
+        if self.first is None:
+            self.first = record
+        self.last = record
+        self.count += 1
+        self._pending.append(record)
+        if len(self._pending) >= self.block_events:
+            self._write_block()
+
+    def _write_block(self) -> None:
+        records, self._pending = self._pending, []
+        lines = "".join(json.dumps(r, separators=(",", ":"), ensure_ascii=False) + "\n" for r in records)
+        data = zlib.compress(lines.encode("utf-8"), COMPRESSION_LEVEL)
+        self._handle.write(data)
+        self._digest.update(data)
+        self.blocks.append(
+            {
+                "offset": self._offset,
+                "length": len(data),
+                "sha256": hashlib.sha256(data).hexdigest(),
+                "first_id": records[0]["id"],
+                "last_id": records[-1]["id"],
+                "first_sequence": records[0]["sequence"],
+                "last_sequence": records[-1]["sequence"],
+                "created_from": min(r["created_at"] for r in records),
+                "created_to": max(r["created_at"] for r in records),
+            }
+        )
+        self._offset += len(data)
+
+    def seal(self) -> AuditSegment:
+        """Flush, fsync and atomically publish the segment and its index as read-only files."""
+        if self._pending:
+            self._write_block()
+        self._handle.flush()
+        os.fsync(self._handle.fileno())
+        self._handle.close()
+        filename = f"audit-{self.period}-{self.first['sequence']:012d}-{self.last['sequence']:012d}.seg"
+        index = json.dumps({"filename": filename, "blocks": self.blocks}, separators=(",", ":")).encode("utf-8")
+        index_tmp = self._tmp_path.with_suffix(".idx.tmp")
+        index_tmp.write_bytes(index)
+        for tmp, target in ((self._tmp_path, filename), (index_tmp, filename + ".idx")):
+            os.chmod(tmp, 0o444)
+            os.replace(tmp, self.root / target)
+        return AuditSegment(
+            period=self.period,
+            filename=filename,
+            first_id=self.first["id"],
+            last_id=self.last["id"],
+            first_sequence=self.first["sequence"],
+            last_sequence=self.last["sequence"],
+            event_count=self.count,
+            created_from=datetime.fromisoformat(min(block["created_from"] for block in self.blocks)),
+            created_to=datetime.fromisoformat(max(block["created_to"] for block in self.blocks)),
+            sha256=self._digest.hexdigest(),
+            index_sha256=hashlib.sha256(index).hexdigest(),
+            head_hash=self.last["event_hash"],
+        )
+
+    def abort(self) -> None:
+        self._handle.close()
+        self._tmp_path.unlink(missing_ok=True)
+
+
+def _hot_batches(session: Session, last_sequence: int, through: int) -> Iterator[list]:
+    columns = [getattr(AuditEvent, "event_metadata" if f == "metadata" else f) for f in _RECORD_FIELDS]
+    while True:
+        query = select(*columns).where(AuditEvent.sequence > last_sequence, AuditEvent.sequence <= through)
+        rows = session.execute(query.order_by(AuditEvent.sequence).limit(SEAL_BATCH_SIZE)).all()
+        if not rows:
+            return
+        yield rows
+        last_sequence = rows[-1].sequence
+
+
+def seal_before(session: Session, before: datetime, block_events: int = SEGMENT_BLOCK_EVENTS) -> list[AuditSegment]:
+    """Seal the chain prefix created before ``before`` into per-month segments and drop it from the hot table.
+
+    The prefix stops at the first event created on or after ``before``, so
+    segments stay contiguous even when backdated events were imported later,
+    and is then cut back to the last completed checkpoint block: checkpoints
+    and proofs read a block's hashes from the hot table, so a block is never
+    split between a segment and ``audit_events``. Hot rows are removed with a
+    Core DELETE, deliberately bypassing the ORM immutability listeners, only
+    after their segment is durable on disk.
+    """
+    root = archive_root()
+    boundary = session.scalar(select(func.min(AuditEvent.sequence)).where(AuditEvent.created_at >= before))
+    checkpointed = select(func.max(AuditCheckpoint.last_sequence))
+    if boundary is not None:
+        checkpointed = checkpointed.where(AuditCheckpoint.last_sequence < boundary)
+    through = session.scalar(checkpointed)
+    if through is None:
+        return []
+    segments: list[AuditSegment] = []
+    writer: SegmentWriter | None = None
+    try:
+        for rows in _hot_batches(session, 0, through):
+            for row in rows:
+                record = dict(zip(_RECORD_FIELDS, row))
+                record["created_at"] = record["created_at"].isoformat()
+                period = record["created_at"][:7]
+                if writer is not None and period > writer.period:
+                    segments.append(writer.seal())
+                    writer = None
+                if writer is None:
+                    writer = SegmentWriter(root, period, block_events)
+                writer.add(record)
+        if writer is not None:
+            segments.append(writer.seal())
+            writer = None
+    finally:
+        if writer is not None:
+            writer.abort()
+    if not segments:
+        return []
+    session.add_all(segments)
+    session.execute(delete(AuditEvent).where(AuditEvent.sequence <= segments[-1].last_sequence))
+    session.flush()
+    log_event(
+        session,
+        "AUDIT_SEGMENT_SEAL",
+        "system",
+        {
+            "before": before.isoformat(),
+            "segments": [segment.filename for segment in segments],
+            "events": sum(segment.event_count for segment in segments),
+        },
+    )
+    return segments
+
+
+def read_index(root: Path, segment: AuditSegment) -> list[dict]:
+    data = (root / (segment.filename + ".idx")).read_bytes()
+    if hashlib.sha256(data).hexdigest() != segment.index_sha256:
+        raise ArchiveError(f"Index checksum mismatch for {segment.filename}")
+    return json.loads(data)["blocks"]
+
+
+def _iter_blocks(root: Path, segment: AuditSegment, blocks: list[dict]) -> Iterator[dict]:
+    with (root / segment.filename).open("rb") as handle:
+        for block in blocks:
+            handle.seek(block["offset"])
+            data = handle.read(block["length"])
+            if hashlib.sha256(data).hexdigest() != block["sha256"]:
+                raise ArchiveError(f"Block checksum mismatch in {segment.filename} at offset {block['offset']}")
+            for line in zlib.decompress(data).decode("utf-8").splitlines():
+                yield json.loads(line)
+
+
+def _matches(record: dict, filters: AuditExportFilter) -> bool:
+    if record["id"] <= filters.after_id:
+        return False
+    if filters.record_id is not None:
+        if record["record_type"] != (filters.record_type or "document") or record["record_id"] != filters.record_id:
+            return False
+    elif filters.record_type is not None and record["record_type"] != filters.record_type:
+        return False
+    if filters.actor is not None and record["actor"] != filters.actor:
+        return False
+    created_at = datetime.fromisoformat(record["created_at"])
+    if filters.created_from is not None and created_at < _utc(filters.created_from):
+        return False
+    if filters.created_to is not None and created_at >= _utc(filters.created_to):
+        return False
+    return True
+
+
+def iter_cold_rows(session: Session, filters: AuditExportFilter, columns: tuple[str, ...]) -> Iterator[tuple]:
+    """Sealed events matching ``filters`` in ``id`` order, as tuples of ``columns``.
+
+    Segments and blocks outside the id/created_at bounds are skipped using the
+    segment rows and the sparse index, without reading their data.
+    """
+    query = select(AuditSegment).where(AuditSegment.last_id > filters.after_id)
+    if filters.created_from is not None:
+        query = query.where(AuditSegment.created_to >= filters.created_from)
+    if filters.created_to is not None:
+        query = query.where(AuditSegment.created_from < filters.created_to)
+    segments = session.scalars(query.order_by(AuditSegment.first_id)).all()
+    if not segments:
+        return
+    root = archive_root()
+    created_from, created_to = _utc(filters.created_from), _utc(filters.created_to)
+    for segment in segments:
+        blocks = [
+            block
+            for block in read_index(root, segment)
+            if block["last_id"] > filters.after_id
+            and (created_from is None or datetime.fromisoformat(block["created_to"]) >= created_from)
+            and (created_to is None or datetime.fromisoformat(block["created_from"]) < created_to)
+        ]
+        for record in _iter_blocks(root, segment, blocks):
+            if _matches(record, filters):
+                record["created_at"] = datetime.fromisoformat(record["created_at"])
+                yield tuple(record[column] for column in columns)
+
+
+def verify_segments(session: Session) -> list[str]:
+    """Re-check every segment's file checksums and the hash chain through all sealed events."""
+    root = archive_root()
+    problems = []
+    prev_hash = GENESIS_HASH
+    expected_sequence = 1
+    for segment in session.scalars(select(AuditSegment).order_by(AuditSegment.first_sequence)):
+        digest = hashlib.sha256()
+        with (root / segment.filename).open("rb") as handle:
+            while chunk := handle.read(1024 * 1024):
+                digest.update(chunk)
+        if digest.hexdigest() != segment.sha256:
+            problems.append(f"{segment.filename}: file checksum mismatch")
+            continue
+        try:
+            for record in _iter_blocks(root, segment, read_index(root, segment)):
+                payload = canonical_event_bytes(
+                    record["sequence"],
+                    record["event_type"],
+                    record["actor"],
+                    record["record_type"],
+                    record["record_id"],
+                    record["metadata"],
+                    datetime.fromisoformat(record["created_at"]),
+                )
+                if (
+                    record["sequence"] != expected_sequence
+                    or record["prev_hash"] != prev_hash
+                    or chain_hash(prev_hash, payload) != record["event_hash"]
+                ):
+                    problems.append(f"{segment.filename}: chain broken at sequence {record['sequence']}")
+                prev_hash = record["event_hash"]
+                expected_sequence = record["sequence"] + 1
+        except ArchiveError as exc:
+            problems.append(str(exc))
+    return problems
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("command", choices=["seal", "verify"])
+    parser.add_argument("--before", type=datetime.fromisoformat)
+    args = parser.parse_args(argv)
+    with get_session() as session:
+        if args.command == "seal":
+            segments = seal_before(session, args.before or default_cutoff())
+            for segment in segments:
+                print(f"Sealed {segment.event_count} events into {segment.filename}")
+            return
+        problems = verify_segments(session)
+    for problem in problems:
+        print(problem)
+    print(f"{len(problems)} problems found")
+    if problems:
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
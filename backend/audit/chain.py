@@ -0,0 +1,279 @@
+"""Hash chain and Merkle checkpoints over the audit trail.
+
+Every event stores ``event_hash = sha256(prev_hash || canonical event bytes)``
+and its position in the chain (``sequence``). Every
+``AUDIT_CHECKPOINT_INTERVAL`` events an ``AuditCheckpoint`` row records the
+Merkle root of that block's event hashes, so a single event can be proven
+against its checkpoint with a logarithmic number of hashes, and a time range
+can be verified without re-hashing the history before it.
+
+Usage: python -m backend.audit.chain verify [--since ISO] [--until ISO]
+"""
+
+from __future__ import annotations
+
+import argparse
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+import hashlib
+import json
+import os
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session, undefer
+
+from backend.audit.models import AuditCheckpoint, AuditEvent, AuditSegment
+from backend.db.session import get_session
+
+GENESIS_HASH = "0" * 64
+AUDIT_CHECKPOINT_INTERVAL = int(os.getenv("AUDIT_CHECKPOINT_INTERVAL", "1024"))
+VERIFY_BATCH_SIZE = 1000
+
+
+class AuditChainError(Exception):
+    pass
+
+
+def canonical_event_bytes(
+    sequence: int,
+    event_type: str,
+    actor: str,
+    record_type: str,
+    record_id: str,
+    metadata: dict,
+    created_at: datetime,
+) -> bytes:
+    if created_at.tzinfo is None:
+        created_at = created_at.replace(tzinfo=timezone.utc)
+    fields = [
+        sequence,
+        event_type,
+        actor,
+        record_type,
+        record_id,
+        metadata,
+        created_at.astimezone(timezone.utc).isoformat(),
+    ]
+    return json.dumps(fields, sort_keys=True, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+
+
+def chain_hash(prev_hash: str, payload: bytes) -> str:
+    return hashlib.sha256(prev_hash.encode("ascii") + payload).hexdigest()
+
+
+def compute_event_hash(evt: AuditEvent) -> str:
+    """Recompute ``evt.event_hash`` from its stored fields."""
+    payload = canonical_event_bytes(
+        evt.sequence,
+        evt.event_type,
+        evt.actor,
+        evt.record_type,
+        evt.record_id,
+        evt.event_metadata,
+        evt.created_at,
+    )
+    return chain_hash(evt.prev_hash, payload)
+
+
+def _leaf(event_hash: str) -> bytes:
+    return hashlib.sha256(b"\x00" + bytes.fromhex(event_hash)).digest()
+
+
+def _node(left: bytes, right: bytes) -> bytes:
+    return hashlib.sha256(b"\x01" + left + right).digest()
+
+
+def _next_level(level: list[bytes]) -> list[bytes]:
+    # An unpaired last node is promoted unchanged.
+    return [_node(level[i], level[i + 1]) if i + 1 < len(level) else level[i] for i in range(0, len(level), 2)]
+
+
+def merkle_root(event_hashes: list[str]) -> str:
+    if not event_hashes:
+        raise AuditChainError("Cannot build a Merkle root over no events")
+    level = [_leaf(h) for h in event_hashes]
+    while len(level) > 1:
+        level = _next_level(level)
+    return level[0].hex()
+
+
+def merkle_proof(event_hashes: list[str], index: int) -> list[tuple[str, bool]]:
+    """Sibling hashes from leaf ``index`` up to the root, each flagged ``True`` when it sits on the left."""
+    level = [_leaf(h) for h in event_hashes]
+    proof = []
+    while len(level) > 1:
+        sibling = index ^ 1
+        if sibling < len(level):
+            proof.append((level[sibling].hex(), sibling < index))
+        level = _next_level(level)
+        index //= 2
+    return proof
+
+
+def verify_proof(event_hash: str, proof: list[tuple[str, bool]], root: str) -> bool:
+    node = _leaf(event_hash)
+    for sibling, is_left in proof:
+        node = _node(bytes.fromhex(sibling), node) if is_left else _node(node, bytes.fromhex(sibling))
+    return node.hex() == root
+
+
+def block_bounds(sequence: int) -> tuple[int, int]:
+    """First and last sequence of the checkpoint block holding ``sequence``."""
+    first = (sequence - 1) // AUDIT_CHECKPOINT_INTERVAL * AUDIT_CHECKPOINT_INTERVAL + 1
+    return first, first + AUDIT_CHECKPOINT_INTERVAL - 1
+
+
+def write_checkpoints(session: Session, previous_sequence: int, last_sequence: int) -> list[AuditCheckpoint]:
+    """Add a checkpoint for every block completed by sequences ``previous_sequence + 1 .. last_sequence``."""
+    interval = AUDIT_CHECKPOINT_INTERVAL
+    checkpoints = []
+    for boundary in range((previous_sequence // interval + 1) * interval, last_sequence + 1, interval):
+        first = boundary - interval + 1
+        hashes = session.scalars(
+            select(AuditEvent.event_hash)
+            .where(AuditEvent.sequence.between(first, boundary))
+            .order_by(AuditEvent.sequence)
+        ).all()
+        checkpoint = AuditCheckpoint(
+            first_sequence=first,
+            last_sequence=boundary,
+            merkle_root=merkle_root(hashes),
+            head_hash=hashes[-1],
+        )
+        session.add(checkpoint)
+        checkpoints.append(checkpoint)
+    if checkpoints:
+        session.flush()
+    return checkpoints
+
+
+@dataclass(slots=True)
+class ChainVerification:
+    events: int = 0
+    checkpoints: int = 0
+    broken: list[int] = field(default_factory=list)
+
+    @property
+    def ok(self) -> bool:
+        return not self.broken
+
+
+def verify_chain(
+    session: Session,
+    since: datetime | None = None,
+    until: datetime | None = None,
+    batch_size: int = VERIFY_BATCH_SIZE,
+) -> ChainVerification:
+    """Re-hash the events created in ``[since, until)`` and check their links and covering checkpoints.
+
+    Only the range itself and the event (or sealed segment head) just before
+    it are read; sealed events are checked by ``archive.verify_segments``. ``broken``
+    lists the sequences whose hash, link or block root does not match.
+    """
+    result = ChainVerification()
+    query = select(AuditEvent.sequence)
+    if since is not None:
+        query = query.where(AuditEvent.created_at >= since)
+    if until is not None:
+        query = query.where(AuditEvent.created_at < until)
+    first = session.scalar(query.order_by(AuditEvent.sequence).limit(1))
+    last = session.scalar(query.order_by(AuditEvent.sequence.desc()).limit(1))
+    if first is None:
+        return result
+
+    expected_prev = (
+        GENESIS_HASH
+        if first == 1
+        else session.scalar(select(AuditEvent.event_hash).where(AuditEvent.sequence == first - 1))
+        or session.scalar(select(AuditSegment.head_hash).where(AuditSegment.last_sequence == first - 1))
+    )
+    expected_sequence = first
+    block_hashes: list[str] = []
+    checkpoints = {
+        cp.last_sequence: cp
+        for cp in session.scalars(
+            select(AuditCheckpoint).where(
+                AuditCheckpoint.first_sequence >= first, AuditCheckpoint.last_sequence <= last
+            )
+        )
+    }
+    cursor = first - 1
+    while cursor < last:
+        events = session.scalars(
+            select(AuditEvent)
+            .options(undefer(AuditEvent.event_metadata))
+            .where(AuditEvent.sequence > cursor, AuditEvent.sequence <= last)
+            .order_by(AuditEvent.sequence)
+            .limit(batch_size)
+        ).all()
+        if not events:
+            break
+        for evt in events:
+            if (
+                evt.sequence != expected_sequence
+                or evt.prev_hash != expected_prev
+                or compute_event_hash(evt) != evt.event_hash
+            ):
+                result.broken.append(evt.sequence)
+            result.events += 1
+            expected_sequence = evt.sequence + 1
+            expected_prev = evt.event_hash
+            block_hashes.append(evt.event_hash)
+            checkpoint = checkpoints.get(evt.sequence)
+            if checkpoint is not None:
+                result.checkpoints += 1
+                if merkle_root(block_hashes) != checkpoint.merkle_root or checkpoint.head_hash != evt.event_hash:
+                    result.broken.append(evt.sequence)
+            if evt.sequence % AUDIT_CHECKPOINT_INTERVAL == 0:
+                block_hashes = []
+        cursor = events[-1].sequence
+    return result
+
+
+def prove_event(session: Session, sequence: int) -> dict:
+    """Merkle proof tying event ``sequence`` to its block checkpoint."""
+    evt = session.scalar(
+        select(AuditEvent).options(undefer(AuditEvent.event_metadata)).where(AuditEvent.sequence == sequence)
+    )
+    if evt is None:
+        raise AuditChainError(f"Audit event {sequence} not found")
+    first, last = block_bounds(sequence)
+    checkpoint = session.scalar(select(AuditCheckpoint).where(AuditCheckpoint.last_sequence == last))
+    if checkpoint is None:
+        raise AuditChainError(f"Audit event {sequence} is not covered by a checkpoint yet")
+    hashes = session.scalars(
+        select(AuditEvent.event_hash).where(AuditEvent.sequence.between(first, last)).order_by(AuditEvent.sequence)
+    ).all()
+    return {
+        "sequence": sequence,
+        "event_hash": evt.event_hash,
+        "recomputed_hash": compute_event_hash(evt),
+        "proof": merkle_proof(hashes, sequence - first),
+        "merkle_root": checkpoint.merkle_root,
+    }
+
+
+def verify_event(session: Session, sequence: int) -> bool:
+    """Check one event's own hash and its membership in the checkpointed block."""
+    proof = prove_event(session, sequence)
+    return proof["recomputed_hash"] == proof["event_hash"] and verify_proof(
+        proof["event_hash"], proof["proof"], proof["merkle_root"]
+    )
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("command", choices=["verify"])
+    parser.add_argument("--since", type=datetime.fromisoformat)
+    parser.add_argument("--until", type=datetime.fromisoformat)
+    args = parser.parse_args(argv)
+    with get_session() as session:
+        result = verify_chain(session, args.since, args.until)
+    print(f"Verified {result.events} events and {result.checkpoints} checkpoints: {len(result.broken)} broken")
+    if result.broken:
+        print("Broken sequences: " + ", ".join(str(sequence) for sequence in result.broken[:100]))
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
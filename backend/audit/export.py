@@ -0,0 +1,179 @@
+"""Streaming inspection export of the audit trail.
+
+Usage:
+    python -m backend.audit.export [--format ndjson|csv] [--record-type T --record-id ID] [--actor A]
+                                   [--since ISO] [--until ISO] [--after-id N] [--output FILE]
+
+Events are streamed in ``id`` order from a server-side cursor, so memory stays
+flat however large the export is. Every row carries its ``id``; passing the last
+one received as ``--after-id`` resumes an interrupted export.
+"""
+
+from __future__ import annotations
+
+import argparse
+from collections.abc import Iterator
+import csv
+from dataclasses import dataclass
+from datetime import datetime
+import io
+import json
+import sys
+
+from sqlalchemy import false, select
+from sqlalchemy.orm import Session
+
+from backend.audit.archive import iter_cold_rows
+from backend.audit.models import AuditEvent
+from backend.audit.terms import lookup_term_id
+from backend.db.session import SessionLocal
+
+EXPORT_FORMATS = {"ndjson": "application/x-ndjson", "csv": "text/csv; charset=utf-8"}
+EXPORT_FETCH_SIZE = 1000
+EXPORT_COLUMNS = (
+    "id",
+    "sequence",
+    "created_at",
+    "event_type",
+    "actor",
+    "record_type",
+    "record_id",
+    "metadata",
+    "event_hash",
+)
+
+
+class ExportError(Exception):
+    pass
+
+
+@dataclass(frozen=True, slots=True)
+class AuditExportFilter:
+    """A ``record_id`` without ``record_type`` selects a document's trail."""
+
+    record_type: str | None = None
+    record_id: str | None = None
+    actor: str | None = None
+    created_from: datetime | None = None
+    created_to: datetime | None = None
+    after_id: int = 0
+
+
+def _term_matches(session: Session, column, kind: str, value: str):
+    term_id = lookup_term_id(session, kind, value)
+    return false() if term_id is None else column == term_id
+
+
+def export_query(session: Session, filters: AuditExportFilter):
+    """Column select in ``id`` order, served by the record, actor or created_at index."""
+    query = select(
+        AuditEvent.id,
+        AuditEvent.sequence,
+        AuditEvent.created_at,
+        AuditEvent.event_type,
+        AuditEvent.actor,
+        AuditEvent.record_type,
+        AuditEvent.record_id,
+        AuditEvent.event_metadata,
+        AuditEvent.event_hash,
+    ).where(AuditEvent.id > filters.after_id)
+    if filters.record_id is not None:
+        record_type = filters.record_type or "document"
+        query = query.where(_term_matches(session, AuditEvent.record_type_id, "record_type", record_type))
+        query = query.where(AuditEvent.record_id == filters.record_id)
+    elif filters.record_type is not None:
+        query = query.where(_term_matches(session, AuditEvent.record_type_id, "record_type", filters.record_type))
+    if filters.actor is not None:
+        query = query.where(_term_matches(session, AuditEvent.actor_id, "actor", filters.actor))
+    if filters.created_from is not None:
+        query = query.where(AuditEvent.created_at >= filters.created_from)
+    if filters.created_to is not None:
+        query = query.where(AuditEvent.created_at < filters.created_to)
+    return query.order_by(AuditEvent.id)
+
+
+def iter_audit_rows(session: Session, filters: AuditExportFilter, fetch_size: int = EXPORT_FETCH_SIZE) -> Iterator:
+    """Sealed cold segments first, then the hot table: together they are in ``id`` order."""
+    yield from iter_cold_rows(session, filters, EXPORT_COLUMNS)
+    yield from session.execute(export_query(session, filters).execution_options(yield_per=fetch_size))
+
+
+def _record(row) -> dict:
+    record = dict(zip(EXPORT_COLUMNS, row))
+    record["created_at"] = record["created_at"].isoformat()
+    return record
+
+
+def _ndjson_chunks(rows: Iterator, fetch_size: int) -> Iterator[str]:
+    chunk = []
+    for row in rows:
+        chunk.append(json.dumps(_record(row), separators=(",", ":"), ensure_ascii=False) + "\n")
+        if len(chunk) >= fetch_size:
+            yield "".join(chunk)
+            chunk = []
+    if chunk:
+        yield "".join(chunk)
+
+
+def _csv_chunks(rows: Iterator, fetch_size: int) -> Iterator[str]:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(EXPORT_COLUMNS)
+    pending = 0
+    for row in rows:
+        record = _record(row)
+        record["metadata"] = json.dumps(record["metadata"], sort_keys=True, separators=(",", ":"))
+        writer.writerow([record[column] for column in EXPORT_COLUMNS])
+        pending += 1
+        if pending >= fetch_size:
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+            pending = 0
+    if buffer.tell():
+        yield buffer.getvalue()
+
+
+def render_export(rows: Iterator, fmt: str, fetch_size: int = EXPORT_FETCH_SIZE) -> Iterator[str]:
+    if fmt == "ndjson":
+        return _ndjson_chunks(rows, fetch_size)
+    if fmt == "csv":
+        return _csv_chunks(rows, fetch_size)
+    raise ExportError(f"Unsupported export format: {fmt}")
+
+
+def stream_audit_export(fmt: str, filters: AuditExportFilter, fetch_size: int = EXPORT_FETCH_SIZE) -> Iterator[str]:
+    """Export chunks produced on a session owned by the stream, so it can outlive the caller's session."""
+    if fmt not in EXPORT_FORMATS:
+        raise ExportError(f"Unsupported export format: {fmt}")
+    return _owned_stream(fmt, filters, fetch_size)
+
+
+def _owned_stream(fmt: str, filters: AuditExportFilter, fetch_size: int) -> Iterator[str]:
+    with SessionLocal() as session:
+        yield from render_export(iter_audit_rows(session, filters, fetch_size), fmt, fetch_size)
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--format", choices=sorted(EXPORT_FORMATS), default="ndjson")
+    parser.add_argument("--record-type")
+    parser.add_argument("--record-id")
+    parser.add_argument("--actor")
+    parser.add_argument("--since", type=datetime.fromisoformat)
+    parser.add_argument("--until", type=datetime.fromisoformat)
+    parser.add_argument("--after-id", type=int, default=0)
+    parser.add_argument("--output")
+    args = parser.parse_args(argv)
+    filters = AuditExportFilter(args.record_type, args.record_id, args.actor, args.since, args.until, args.after_id)
+    out = open(args.output, "w", encoding="utf-8", newline="") if args.output else sys.stdout
+    try:
+        for chunk in stream_audit_export(args.format, filters):
+            out.write(chunk)
+    finally:
+        if out is not sys.stdout:
+            out.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,289 @@
+"""Periodic ALCOA+ re-verification of stored version checksums and signature hashes.
+
+Usage:
+    python -m backend.audit.integrity [--report FILE] [--checkpoint FILE] [--batch-size N] [--workers N]
+
+Rows are streamed in primary-key batches and re-hashed across a process pool.
+Mismatches are appended to the report as JSON lines; progress, including the
+report's length, is checkpointed after every batch so an interrupted sweep
+resumes where it stopped. A completed
+sweep removes its checkpoint and records an ``INTEGRITY_SWEEP`` audit event.
+"""
+
+from __future__ import annotations
+
+import argparse
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import asdict, dataclass
+import hashlib
+import json
+import os
+from pathlib import Path
+import time
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session, undefer
+
+from backend.audit.service import log_event
+from backend.db.session import SessionLocal
+from backend.documents import blobstore
+from backend.documents.blobstore import BLOB_CHUNK_SIZE, BlobStore, BlobStoreError
+from backend.documents.delta import is_delta_ref
+from backend.documents.models import Document, DocumentVersion
+from backend.documents.service import DocumentError, read_version_content
+from backend.signatures.models import ElectronicSignature
+from backend.signatures.verification import check_signature_rows
+
+INTEGRITY_BATCH_SIZE = 2000
+INTEGRITY_ACTOR = "integrity-sweep"
+
+
+@dataclass(slots=True)
+class IntegrityStats:
+    versions: int = 0
+    signatures: int = 0
+    mismatches: int = 0
+    versions_last_id: int = 0
+    signatures_last_id: int = 0
+    seconds: float = 0.0
+    report_bytes: int | None = None
+
+
+def _sha256_blob(blob_dir: str | None, checksum: str) -> str | None:
+    if blob_dir is None:
+        return None
+    digest = hashlib.sha256()
+    try:
+        with BlobStore(blob_dir).path_for(checksum).open("rb") as handle:
+            while chunk := handle.read(BLOB_CHUNK_SIZE):
+                digest.update(chunk)
+    except (OSError, BlobStoreError):
+        return None
+    return digest.hexdigest()
+
+
+def _check_versions(rows: list[tuple], blob_dir: str | None) -> list[dict]:
+    """Worker: ``rows`` are ``(id, doc_number, version_no, checksum, content, blob checksum)``."""
+    mismatches = []
+    for version_id, doc_number, version_no, checksum, content, blob_checksum in rows:
+        if blob_checksum is not None:
+            actual = _sha256_blob(blob_dir, blob_checksum)
+            reason = "blob missing or unreadable" if actual is None else "blob checksum mismatch"
+        else:
+            actual = hashlib.sha256(content.encode("utf-8")).hexdigest() if content is not None else None
+            reason = "content missing" if actual is None else "content checksum mismatch"
+        if actual != checksum:
+            mismatches.append(
+                {
+                    "record_type": "document_version",
+                    "id": version_id,
+                    "doc_number": doc_number,
+                    "version_no": version_no,
+                    "reason": reason,
+                }
+            )
+    return mismatches
+
+
+def _version_rows(session: Session, last_id: int, batch_size: int) -> tuple[list[tuple], list[dict], int | None]:
+    """Next batch of hashable version rows, its delta mismatches and its last id (``None`` when done).
+
+    Delta-stored rows need their chain, so they are reconstructed (which
+    verifies the checksum) in this process instead of a worker, through a
+    separate session on the same connection so the caller's session is left
+    untouched.
+    """
+    rows = session.execute(
+        select(
+            DocumentVersion.id,
+            Document.doc_number,
+            DocumentVersion.version_no,
+            DocumentVersion.checksum,
+            DocumentVersion.content,
+            DocumentVersion.content_ref,
+        )
+        .join(Document, Document.id == DocumentVersion.document_id)
+        .where(DocumentVersion.id > last_id)
+        .order_by(DocumentVersion.id)
+        .limit(batch_size)
+    ).all()
+    if not rows:
+        return [], [], None
+    jobs = []
+    delta_ids = []
+    for version_id, doc_number, version_no, checksum, content, content_ref in rows:
+        if is_delta_ref(content_ref):
+            delta_ids.append(version_id)
+        elif content_ref is not None:
+            jobs.append((version_id, doc_number, version_no, checksum, None, blobstore.blob_checksum(content_ref)))
+        else:
+            jobs.append((version_id, doc_number, version_no, checksum, content, None))
+    mismatches = []
+    if delta_ids:
+        doc_numbers = {row[0]: row[1] for row in rows}
+        with Session(bind=session.connection()) as reader:
+            for version in reader.scalars(
+                select(DocumentVersion)
+                .options(undefer(DocumentVersion.content))
+                .where(DocumentVersion.id.in_(delta_ids))
+            ):
+                try:
+                    read_version_content(version)
+                except (DocumentError, BlobStoreError) as exc:
+                    mismatches.append(
+                        {
+                            "record_type": "document_version",
+                            "id": version.id,
+                            "doc_number": doc_numbers[version.id],
+                            "version_no": version.version_no,
+                            "reason": str(exc),
+                        }
+                    )
+    return jobs, mismatches, rows[-1][0]
+
+
+def _signature_rows(session: Session, last_id: int, batch_size: int) -> list[tuple]:
+    return [
+        tuple(row)
+        for row in session.execute(
+            select(
+                ElectronicSignature.id,
+                Document.doc_number,
+                ElectronicSignature.version_id,
+                ElectronicSignature.signer_username,
+                ElectronicSignature.meaning,
+                ElectronicSignature.signature_hash,
+            )
+            .join(Document, Document.id == ElectronicSignature.document_id)
+            .where(ElectronicSignature.id > last_id)
+            .order_by(ElectronicSignature.id)
+            .limit(batch_size)
+        )
+    ]
+
+
+def _load_checkpoint(checkpoint: Path | None) -> IntegrityStats:
+    if checkpoint is None or not checkpoint.exists():
+        return IntegrityStats()
+    return IntegrityStats(**json.loads(checkpoint.read_text(encoding="utf-8")))
+
+
+def _save_checkpoint(checkpoint: Path | None, stats: IntegrityStats) -> None:
+    if checkpoint is None:
+        return
+    tmp = checkpoint.with_suffix(".tmp")
+    tmp.write_text(json.dumps(asdict(stats)), encoding="utf-8")
+    os.replace(tmp, checkpoint)
+
+
+def _chunks(rows: list[tuple], count: int) -> list[list[tuple]]:
+    size = max(1, -(-len(rows) // count))
+    return [rows[i:i + size] for i in range(0, len(rows), size)]
+
+
+def verify_integrity(
+    session: Session,
+    report: str | Path,
+    checkpoint: str | Path | None = None,
+    batch_size: int = INTEGRITY_BATCH_SIZE,
+    workers: int = os.cpu_count() or 1,
+    progress=None,
+) -> IntegrityStats:
+    """Re-hash every stored version and signature, appending mismatches to ``report``.
+
+    Only one batch of rows is held in memory at a time. Each batch's findings
+    are synced to the report before the checkpoint records the report's new
+    length; a resumed sweep first truncates the report to that length, so
+    findings written after the last checkpoint are redone rather than
+    repeated.
+    """
+    report = Path(report)
+    checkpoint = Path(checkpoint) if checkpoint else None
+    blob_dir = str(blobstore.blob_store.root) if blobstore.blob_store is not None else None
+    stats = _load_checkpoint(checkpoint)
+    if not stats.versions_last_id and not stats.signatures_last_id:
+        report.write_text("", encoding="utf-8")
+    elif stats.report_bytes is not None:
+        with report.open("ab") as handle:
+            handle.truncate(stats.report_bytes)
+    started = time.perf_counter() - stats.seconds
+    executor = ProcessPoolExecutor(max_workers=workers) if workers > 1 else None
+
+    def run(func, rows: list[tuple], *args) -> list[dict]:
+        if executor is None or len(rows) < 2:
+            return func(rows, *args) if rows else []
+        parts = _chunks(rows, workers)
+        return [found for chunk in executor.map(func, parts, *([arg] * len(parts) for arg in args)) for found in chunk]
+
+    def record(found: list[dict], handle) -> None:
+        for mismatch in found:
+            handle.write(json.dumps(mismatch).encode("utf-8") + b"\n")
+        handle.flush()
+        os.fsync(handle.fileno())
+        stats.report_bytes = handle.tell()
+        stats.mismatches += len(found)
+        stats.seconds = time.perf_counter() - started
+        _save_checkpoint(checkpoint, stats)
+        if progress:
+            progress(stats)
+
+    try:
+        with report.open("ab") as handle:
+            while True:
+                jobs, found, last_id = _version_rows(session, stats.versions_last_id, batch_size)
+                if last_id is None:
+                    break
+                checked = len(jobs) + len(found)
+                found += run(_check_versions, jobs, blob_dir)
+                stats.versions += checked
+                stats.versions_last_id = last_id
+                record(found, handle)
+            while rows := _signature_rows(session, stats.signatures_last_id, batch_size):
+                found = run(check_signature_rows, rows)
+                stats.signatures += len(rows)
+                stats.signatures_last_id = rows[-1][0]
+                record(found, handle)
+    finally:
+        if executor is not None:
+            executor.shutdown()
+
+    stats.seconds = time.perf_counter() - started
+    log_event(
+        session,
+        "INTEGRITY_SWEEP",
+        INTEGRITY_ACTOR,
+        {
+            "versions_checked": stats.versions,
+            "signatures_checked": stats.signatures,
+            "mismatches": stats.mismatches,
+            "report": str(report),
+            "seconds": round(stats.seconds, 3),
+        },
+    )
+    session.commit()
+    if checkpoint is not None:
+        checkpoint.unlink(missing_ok=True)
+    return stats
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--report", default="integrity-report.jsonl")
+    parser.add_argument("--checkpoint")
+    parser.add_argument("--batch-size", type=int, default=INTEGRITY_BATCH_SIZE)
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    args = parser.parse_args(argv)
+
+    def report(stats: IntegrityStats) -> None:
+        print(f"{stats.versions} versions, {stats.signatures} signatures, {stats.mismatches} mismatches")
+
+    with SessionLocal() as session:
+        stats = verify_integrity(session, args.report, args.checkpoint, args.batch_size, args.workers, report)
+    print(
+        f"Verified {stats.versions} versions and {stats.signatures} signatures in {stats.seconds:.1f}s: "
+        f"{stats.mismatches} mismatches written to {args.report}"
+    )
+
+
+if __name__ == "__main__":
+    main()
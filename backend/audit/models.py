@@ -3,30 +3,149 @@ from __future__ import annotations
 from datetime import datetime
 
 
-from sqlalchemy import Integer, JSON, String, event
-from sqlalchemy.orm import Mapped, mapped_column
+from sqlalchemy import DDL, ForeignKey, Index, Integer, String, UniqueConstraint, case, event, select
+from sqlalchemy.orm import Mapped, column_property, mapped_column
 
 from backend.db.base import Base
-from backend.db.types import UTCDateTime, utcnow
+from backend.db.types import CompressedJSON, UTCDateTime, utcnow
+
+
+class AuditTerm(Base):
+    """Dictionary of the event types, actors and record types referenced by ``audit_events``."""
+
+    __tablename__ = "audit_terms"
+    __table_args__ = (UniqueConstraint("kind", "value", name="uq_audit_terms_kind_value"),)
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    kind: Mapped[str] = mapped_column(String(20), nullable=False)
+    value: Mapped[str] = mapped_column(String(100), nullable=False)
+
+
+def _term_value(term_id):
+    value = select(AuditTerm.value).where(AuditTerm.id == term_id).correlate_except(AuditTerm).scalar_subquery()
+    # Referencing the id outside the subquery keeps audit_events in the enclosing FROM clause, so the string
+    # columns can be selected on their own like the plain columns they replace.
+    return case((term_id.is_not(None), value))
 
 
 class AuditEvent(Base):
+    """One link of the audit chain.
+
+    ``event_type``, ``actor`` and ``record_type`` are stored as ``audit_terms``
+    ids and read back as strings; writers go through ``backend.audit.terms``.
+    """
+
     __tablename__ = "audit_events"
+    __table_args__ = (
+        Index("ix_audit_events_record_type_record_id_id", "record_type_id", "record_id", "id"),
+        Index("ix_audit_events_actor_id", "actor_id", "id"),
+        Index("ix_audit_events_created_at_id", "created_at", "id"),
+    )
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True)
-    event_type: Mapped[str] = mapped_column(String(100), nullable=False)
-    actor: Mapped[str] = mapped_column(String(100), nullable=False)
-    record_type: Mapped[str] = mapped_column(String(100), nullable=False)
+    event_type_id: Mapped[int] = mapped_column(ForeignKey("audit_terms.id"), nullable=False)
+    actor_id: Mapped[int] = mapped_column(ForeignKey("audit_terms.id"), nullable=False)
+    record_type_id: Mapped[int] = mapped_column(ForeignKey("audit_terms.id"), nullable=False)
+    event_type: Mapped[str] = column_property(_term_value(event_type_id))
+    actor: Mapped[str] = column_property(_term_value(actor_id))
+    record_type: Mapped[str] = column_property(_term_value(record_type_id))
     record_id: Mapped[str] = mapped_column(String(100), nullable=False)
-    metadata: Mapped[dict] = mapped_column(JSON, default=dict, nullable=False)
+    event_metadata: Mapped[dict] = mapped_column(
+        "metadata", CompressedJSON(), default=dict, nullable=False, deferred=True
+    )
     created_at: Mapped[datetime] = mapped_column(UTCDateTime(), default=utcnow, nullable=False)
+    sequence: Mapped[int] = mapped_column(Integer, unique=True, nullable=False)
+    prev_hash: Mapped[str] = mapped_column(String(64), nullable=False)
+    event_hash: Mapped[str] = mapped_column(String(64), nullable=False)
+
+
+class AuditCheckpoint(Base):
+    """Merkle root over the event hashes of one fixed-size block of the chain."""
+
+    __tablename__ = "audit_checkpoints"
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    first_sequence: Mapped[int] = mapped_column(Integer, nullable=False)
+    last_sequence: Mapped[int] = mapped_column(Integer, unique=True, nullable=False)
+    merkle_root: Mapped[str] = mapped_column(String(64), nullable=False)
+    head_hash: Mapped[str] = mapped_column(String(64), nullable=False)
+    created_at: Mapped[datetime] = mapped_column(UTCDateTime(), default=utcnow, nullable=False)
+
+
+class AuditSegment(Base):
+    """A sealed, read-only file holding a contiguous run of the chain moved out of ``audit_events``."""
+
+    __tablename__ = "audit_segments"
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    period: Mapped[str] = mapped_column(String(7), index=True, nullable=False)
+    filename: Mapped[str] = mapped_column(String(255), unique=True, nullable=False)
+    first_id: Mapped[int] = mapped_column(Integer, nullable=False)
+    last_id: Mapped[int] = mapped_column(Integer, nullable=False)
+    first_sequence: Mapped[int] = mapped_column(Integer, nullable=False)
+    last_sequence: Mapped[int] = mapped_column(Integer, unique=True, nullable=False)
+    event_count: Mapped[int] = mapped_column(Integer, nullable=False)
+    created_from: Mapped[datetime] = mapped_column(UTCDateTime(), nullable=False)
+    created_to: Mapped[datetime] = mapped_column(UTCDateTime(), nullable=False)
+    sha256: Mapped[str] = mapped_column(String(64), nullable=False)
+    index_sha256: Mapped[str] = mapped_column(String(64), nullable=False)
+    head_hash: Mapped[str] = mapped_column(String(64), nullable=False)
+    sealed_at: Mapped[datetime] = mapped_column(UTCDateTime(), default=utcnow, nullable=False)
+
+
+class DocumentTimelineEntry(Base):
+    """Read model: a document's audit events numbered 1..n, projected when the events are written."""
+
+    __tablename__ = "document_timeline"
+    __table_args__ = (UniqueConstraint("doc_number", "position", name="uq_document_timeline_doc_position"),)
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    doc_number: Mapped[str] = mapped_column(String(100), nullable=False)
+    position: Mapped[int] = mapped_column(Integer, nullable=False)
+    event_id: Mapped[int] = mapped_column(Integer, unique=True, nullable=False)
+    event_type: Mapped[str] = mapped_column(String(100), nullable=False)
+    actor: Mapped[str] = mapped_column(String(100), nullable=False)
+    event_metadata: Mapped[dict] = mapped_column(
+        "metadata", CompressedJSON(), default=dict, nullable=False, deferred=True
+    )
+    created_at: Mapped[datetime] = mapped_column(UTCDateTime(), nullable=False)
+
+
+# Plain-SQL readers (inspection tools, ad hoc queries) see the string columns through this view.
+_READABLE_VIEW_SELECT = (
+    "SELECT e.id, e.sequence, e.created_at, t.value AS event_type, a.value AS actor, "
+    "r.value AS record_type, e.record_id, e.prev_hash, e.event_hash "
+    "FROM audit_events e "
+    "JOIN audit_terms t ON t.id = e.event_type_id "
+    "JOIN audit_terms a ON a.id = e.actor_id "
+    "JOIN audit_terms r ON r.id = e.record_type_id"
+)
+event.listen(
+    AuditEvent.__table__,
+    "after_create",
+    DDL(f"CREATE VIEW IF NOT EXISTS audit_events_readable AS {_READABLE_VIEW_SELECT}").execute_if(dialect="sqlite"),
+)
+event.listen(
+    AuditEvent.__table__,
+    "after_create",
+    DDL(f"CREATE OR REPLACE VIEW audit_events_readable AS {_READABLE_VIEW_SELECT}").execute_if(
+        dialect="postgresql"
+    ),
+)
+event.listen(AuditEvent.__table__, "before_drop", DDL("DROP VIEW IF EXISTS audit_events_readable"))
 
 
+@event.listens_for(AuditTerm, "before_update", propagate=True)
+@event.listens_for(AuditSegment, "before_update", propagate=True)
+@event.listens_for(AuditCheckpoint, "before_update", propagate=True)
 @event.listens_for(AuditEvent, "before_update", propagate=True)
-def _prevent_update(*_args, **_kwargs):
-    raise ValueError("AuditEvent is append-only and immutable")
+def _prevent_update(mapper, *_args, **_kwargs):
+    raise ValueError(f"{mapper.class_.__name__} is append-only and immutable")
 
 
+@event.listens_for(AuditTerm, "before_delete", propagate=True)
+@event.listens_for(AuditSegment, "before_delete", propagate=True)
+@event.listens_for(AuditCheckpoint, "before_delete", propagate=True)
 @event.listens_for(AuditEvent, "before_delete", propagate=True)
-def _prevent_delete(*_args, **_kwargs):
-    raise ValueError("AuditEvent cannot be deleted")
+def _prevent_delete(mapper, *_args, **_kwargs):
+    raise ValueError(f"{mapper.class_.__name__} cannot be deleted")
@@ -1,8 +1,109 @@
 from __future__ import annotations
 
-from sqlalchemy.orm import Session
+import os
 
-from backend.audit.models import AuditEvent
+from sqlalchemy import event, insert, select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session, SessionTransaction
+from sqlalchemy.sql.util import find_tables
+
+from backend.audit.chain import GENESIS_HASH, AuditChainError, canonical_event_bytes, chain_hash, write_checkpoints
+from backend.audit.models import AuditEvent, AuditSegment
+from backend.audit.terms import TERM_KINDS, intern_terms
+from backend.audit.timeline import project_events
+from backend.db.types import utcnow
+
+AUDIT_APPEND_ATTEMPTS = 3
+# "buffered" queues events per transaction and writes them in one INSERT before commit;
+# "immediate" writes each event as it is logged.
+AUDIT_WRITE_MODE = os.getenv("AUDIT_WRITE_MODE", "buffered")
+_BUFFER_KEY = "audit_buffer"
+
+
+def _chain_head(session: Session) -> tuple[int, str]:
+    """Sequence and hash of the newest event, row-locked where the dialect supports it.
+
+    When every event has been sealed into cold segments the chain continues
+    from the newest segment's head.
+    """
+    row = session.execute(
+        select(AuditEvent.sequence, AuditEvent.event_hash)
+        .order_by(AuditEvent.sequence.desc())
+        .limit(1)
+        .with_for_update()
+    ).first()
+    if row is None:
+        row = session.execute(
+            select(AuditSegment.last_sequence.label("sequence"), AuditSegment.head_hash.label("event_hash"))
+            .order_by(AuditSegment.last_sequence.desc())
+            .limit(1)
+        ).first()
+    return (row.sequence, row.event_hash) if row else (0, GENESIS_HASH)
+
+
+def _encoded(row: dict, term_ids: dict[tuple[str, str], int]) -> dict:
+    values = {key: value for key, value in row.items() if key not in TERM_KINDS}
+    for kind in TERM_KINDS:
+        values[f"{kind}_id"] = term_ids[(kind, row[kind])]
+    return values
+
+
+def _append(session: Session, events: list[dict]) -> int:
+    """Chain ``events`` onto the current head and insert them with one multi-row INSERT.
+
+    Event types, actors and record types are written as interned term ids;
+    the chain hashes and the timeline keep the strings. Document events are
+    projected into their timelines in the same transaction.
+
+    Concurrent writers that read the same chain head collide on the unique
+    ``sequence``; the loser retries from the new head inside a savepoint, so
+    the chain never forks.
+    """
+    now = utcnow()
+    term_ids = intern_terms(session, [(kind, evt.get(kind, "system")) for evt in events for kind in TERM_KINDS])
+    for attempt in range(1, AUDIT_APPEND_ATTEMPTS + 1):
+        head_sequence, prev_hash = _chain_head(session)
+        sequence = head_sequence
+        rows = []
+        for evt in events:
+            sequence += 1
+            row = {
+                "event_type": evt["event_type"],
+                "actor": evt["actor"],
+                "record_type": evt.get("record_type", "system"),
+                "record_id": evt.get("record_id", "n/a"),
+                "event_metadata": evt["metadata"],
+                "created_at": evt.get("created_at", now),
+                "sequence": sequence,
+                "prev_hash": prev_hash,
+            }
+            payload = canonical_event_bytes(
+                sequence,
+                row["event_type"],
+                row["actor"],
+                row["record_type"],
+                row["record_id"],
+                row["event_metadata"],
+                row["created_at"],
+            )
+            prev_hash = row["event_hash"] = chain_hash(prev_hash, payload)
+            rows.append(row)
+        try:
+            with session.begin_nested():
+                inserted = session.execute(
+                    insert(AuditEvent).returning(AuditEvent.sequence, AuditEvent.id),
+                    [_encoded(row, term_ids) for row in rows],
+                )
+                ids = dict(inserted.all())
+            break
+        except IntegrityError as exc:
+            if attempt == AUDIT_APPEND_ATTEMPTS:
+                raise AuditChainError("Concurrent audit append conflict, retry the request") from exc
+    for row in rows:
+        row["id"] = ids[row["sequence"]]
+    project_events(session, rows)
+    write_checkpoints(session, head_sequence, sequence)
+    return len(rows)
 
 
 def log_event(
@@ -12,14 +113,95 @@ def log_event(
     metadata: dict,
     record_type: str = "system",
     record_id: str = "n/a",
-) -> AuditEvent:
-    evt = AuditEvent(
-        event_type=event_type,
-        actor=actor,
-        record_type=record_type,
-        record_id=record_id,
-        metadata=metadata,
-    )
-    session.add(evt)
-    session.flush()
-    return evt
+) -> None:
+    """Record one event as part of the session's current transaction.
+
+    In buffered mode the event is queued and written with the rest of the
+    transaction's events just before commit (or before the next query that
+    reads audit events), and dropped if its transaction or savepoint rolls back.
+    """
+    evt = {
+        "event_type": event_type,
+        "actor": actor,
+        "metadata": metadata,
+        "record_type": record_type,
+        "record_id": record_id,
+        "created_at": utcnow(),
+    }
+    if AUDIT_WRITE_MODE != "buffered":
+        _append(session, [evt])
+        return
+    if not session.in_transaction():
+        session.begin()
+    session.info.setdefault(_BUFFER_KEY, []).append((session.get_nested_transaction(), evt))
+
+
+def pending_events(session: Session) -> list[dict]:
+    return [evt for _savepoint, evt in session.info.get(_BUFFER_KEY, [])]
+
+
+def flush_audit_buffer(session: Session) -> int:
+    """Write the queued events, in logging order, with one bulk INSERT."""
+    buffered = session.info.pop(_BUFFER_KEY, None)
+    if not buffered:
+        return 0
+    return _append(session, [evt for _savepoint, evt in buffered])
+
+
+def log_events_bulk(session: Session, events: list[dict]) -> int:
+    """Append many audit events to the hash chain with a single multi-row INSERT.
+
+    Each item carries the ``log_event`` arguments: ``event_type``, ``actor``,
+    ``metadata`` and optionally ``record_type``/``record_id``/``created_at``.
+    Events already queued by ``log_event`` are written first.
+    """
+    if not events:
+        return 0
+    flush_audit_buffer(session)
+    return _append(session, events)
+
+
+def _opened_within(savepoint: SessionTransaction | None, transaction: SessionTransaction) -> bool:
+    while savepoint is not None:
+        if savepoint is transaction:
+            return True
+        savepoint = savepoint.parent
+    return False
+
+
+@event.listens_for(Session, "before_commit")
+def _write_buffer_before_commit(session: Session) -> None:
+    flush_audit_buffer(session)
+
+
+@event.listens_for(Session, "do_orm_execute")
+def _write_buffer_before_audit_read(orm_execute_state) -> None:
+    # Reads inside a savepoint do not flush: rows written there would be lost
+    # with the savepoint even though they belong to the enclosing transaction.
+    session = orm_execute_state.session
+    if (
+        orm_execute_state.is_select
+        and session.info.get(_BUFFER_KEY)
+        and session.get_nested_transaction() is None
+        and AuditEvent.__table__ in find_tables(orm_execute_state.statement, include_crud=True)
+    ):
+        flush_audit_buffer(session)
+
+
+@event.listens_for(Session, "after_soft_rollback")
+def _discard_rolled_back_events(session: Session, previous_transaction: SessionTransaction) -> None:
+    buffered = session.info.get(_BUFFER_KEY)
+    if not buffered:
+        return
+    if not previous_transaction.nested:
+        session.info.pop(_BUFFER_KEY, None)
+        return
+    session.info[_BUFFER_KEY] = [
+        (savepoint, evt) for savepoint, evt in buffered if not _opened_within(savepoint, previous_transaction)
+    ]
+
+
+@event.listens_for(Session, "after_transaction_end")
+def _drop_buffer_with_transaction(session: Session, transaction: SessionTransaction) -> None:
+    if transaction.parent is None:
+        session.info.pop(_BUFFER_KEY, None)
@@ -0,0 +1,102 @@
+"""Intern cache for the strings dictionary-encoded in ``audit_terms``.
+
+Audit events reference their event type, actor and record type by
+``audit_terms`` id. There are only a handful of distinct values, so ids are
+cached per engine and a warm writer maps strings to ids without touching the
+database. Terms first seen (or inserted) inside a transaction are cached for
+the session only, and published to the engine-wide cache when it commits: a
+rolled-back insert never leaves a dangling id behind.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Iterable
+from weakref import WeakKeyDictionary
+
+from sqlalchemy import event, insert, select, tuple_
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from backend.audit.models import AuditTerm
+
+TERM_KINDS = ("event_type", "actor", "record_type")
+TERM_INSERT_ATTEMPTS = 3
+_PENDING_KEY = "audit_terms_pending"
+_committed: WeakKeyDictionary = WeakKeyDictionary()
+
+
+def _cache(session: Session) -> dict[tuple[str, str], int]:
+    return _committed.setdefault(session.get_bind(), {})
+
+
+def cached_term_id(session: Session, kind: str, value: str) -> int | None:
+    key = (kind, value)
+    return _cache(session).get(key) or session.info.get(_PENDING_KEY, {}).get(key)
+
+
+def _select_ids(session: Session, keys: list[tuple[str, str]]) -> dict[tuple[str, str], int]:
+    rows = session.execute(
+        select(AuditTerm.kind, AuditTerm.value, AuditTerm.id).where(tuple_(AuditTerm.kind, AuditTerm.value).in_(keys))
+    )
+    return {(kind, value): term_id for kind, value, term_id in rows}
+
+
+def lookup_term_id(session: Session, kind: str, value: str) -> int | None:
+    """Id of an existing term, or ``None``; never inserts (used by readers filtering on a term)."""
+    term_id = cached_term_id(session, kind, value)
+    if term_id is None:
+        term_id = _select_ids(session, [(kind, value)]).get((kind, value))
+        if term_id is not None:
+            session.info.setdefault(_PENDING_KEY, {})[(kind, value)] = term_id
+    return term_id
+
+
+def intern_terms(session: Session, keys: Iterable[tuple[str, str]]) -> dict[tuple[str, str], int]:
+    """Map ``(kind, value)`` pairs to term ids, inserting the values never seen before.
+
+    Cache misses cost one SELECT, and one INSERT for genuinely new values. A
+    writer racing to insert the same value loses on the unique constraint and
+    reads the winner's id instead.
+    """
+    ids: dict[tuple[str, str], int] = {}
+    missing = []
+    for key in set(keys):
+        term_id = cached_term_id(session, *key)
+        if term_id is None:
+            missing.append(key)
+        else:
+            ids[key] = term_id
+    if not missing:
+        return ids
+    for attempt in range(1, TERM_INSERT_ATTEMPTS + 1):
+        found = _select_ids(session, missing)
+        new = [{"kind": kind, "value": value} for kind, value in missing if (kind, value) not in found]
+        try:
+            if new:
+                with session.begin_nested():
+                    inserted = session.execute(
+                        insert(AuditTerm).returning(AuditTerm.kind, AuditTerm.value, AuditTerm.id), new
+                    )
+                    found.update({(kind, value): term_id for kind, value, term_id in inserted})
+            break
+        except IntegrityError:
+            if attempt == TERM_INSERT_ATTEMPTS:
+                raise
+    session.info.setdefault(_PENDING_KEY, {}).update(found)
+    ids.update(found)
+    return ids
+
+
+@event.listens_for(Session, "after_commit")
+def _publish_pending_terms(session: Session) -> None:
+    if session.get_nested_transaction() is not None:
+        return  # a savepoint released; the enclosing transaction can still roll back
+    pending = session.info.pop(_PENDING_KEY, None)
+    if pending:
+        _cache(session).update(pending)
+
+
+@event.listens_for(Session, "after_soft_rollback")
+def _forget_pending_terms(session: Session, _previous_transaction) -> None:
+    # Dropping cache entries is always safe: surviving terms are found again by SELECT.
+    session.info.pop(_PENDING_KEY, None)
@@ -0,0 +1,130 @@
+"""Per-document audit timeline read model.
+
+Usage: python -m backend.audit.timeline rebuild [--batch-size N]
+
+Every ``record_type == "document"`` event is copied into ``document_timeline``
+with a per-document ``position`` (1, 2, ...) in the same transaction that
+writes the event. A document's history, its last N events and its event count
+are then range scans on the ``(doc_number, position)`` key, whatever the size
+of the audit trail, and they keep working after old events are sealed into
+cold segments. ``rebuild`` replays the full trail (cold and hot) into an empty
+projection.
+"""
+
+from __future__ import annotations
+
+import argparse
+
+from sqlalchemy import delete, func, insert, select
+from sqlalchemy.orm import Session, undefer
+
+from backend.audit.models import DocumentTimelineEntry
+from backend.db.session import get_session
+
+TIMELINE_RECORD_TYPE = "document"
+DEFAULT_HISTORY_LIMIT = 50
+MAX_HISTORY_LIMIT = 500
+TIMELINE_REBUILD_BATCH_SIZE = 5000
+
+
+def project_events(session: Session, events: list[dict]) -> int:
+    """Append the document events among ``events`` (written audit rows, in chain order) to their timelines."""
+    events = [evt for evt in events if evt["record_type"] == TIMELINE_RECORD_TYPE]
+    if not events:
+        return 0
+    doc_numbers = sorted({evt["record_id"] for evt in events})
+    positions = dict(
+        session.execute(
+            select(DocumentTimelineEntry.doc_number, func.max(DocumentTimelineEntry.position))
+            .where(DocumentTimelineEntry.doc_number.in_(doc_numbers))
+            .group_by(DocumentTimelineEntry.doc_number)
+        ).all()
+    )
+    entries = []
+    for evt in events:
+        position = positions.get(evt["record_id"], 0) + 1
+        positions[evt["record_id"]] = position
+        entries.append(
+            {
+                "doc_number": evt["record_id"],
+                "position": position,
+                "event_id": evt["id"],
+                "event_type": evt["event_type"],
+                "actor": evt["actor"],
+                "event_metadata": evt["event_metadata"],
+                "created_at": evt["created_at"],
+            }
+        )
+    session.execute(insert(DocumentTimelineEntry), entries)
+    return len(entries)
+
+
+def _entry(entry: DocumentTimelineEntry) -> dict:
+    return {
+        "position": entry.position,
+        "event_id": entry.event_id,
+        "event_type": entry.event_type,
+        "actor": entry.actor,
+        "metadata": entry.event_metadata,
+        "created_at": entry.created_at.isoformat(),
+    }
+
+
+def document_history(
+    session: Session,
+    doc_number: str,
+    *,
+    before_position: int | None = None,
+    limit: int = DEFAULT_HISTORY_LIMIT,
+) -> list[dict]:
+    """Newest-first page of a document's events; pass the last ``position`` seen to get the next page."""
+    limit = max(1, min(limit, MAX_HISTORY_LIMIT))
+    query = (
+        select(DocumentTimelineEntry)
+        .options(undefer(DocumentTimelineEntry.event_metadata))
+        .where(DocumentTimelineEntry.doc_number == doc_number)
+    )
+    if before_position is not None:
+        query = query.where(DocumentTimelineEntry.position < before_position)
+    entries = session.scalars(query.order_by(DocumentTimelineEntry.position.desc()).limit(limit)).all()
+    return [_entry(entry) for entry in entries]
+
+
+def latest_events(session: Session, doc_number: str, count: int) -> list[dict]:
+    return document_history(session, doc_number, limit=count)
+
+
+def timeline_length(session: Session, doc_number: str) -> int:
+    return session.scalar(
+        select(func.max(DocumentTimelineEntry.position)).where(DocumentTimelineEntry.doc_number == doc_number)
+    ) or 0
+
+
+def rebuild_timeline(session: Session, batch_size: int = TIMELINE_REBUILD_BATCH_SIZE) -> int:
+    from backend.audit.export import EXPORT_COLUMNS, AuditExportFilter, iter_audit_rows
+
+    session.execute(delete(DocumentTimelineEntry))
+    projected = 0
+    batch: list[dict] = []
+    for row in iter_audit_rows(session, AuditExportFilter(record_type=TIMELINE_RECORD_TYPE), batch_size):
+        evt = dict(zip(EXPORT_COLUMNS, row))
+        evt["event_metadata"] = evt.pop("metadata")
+        batch.append(evt)
+        if len(batch) >= batch_size:
+            projected += project_events(session, batch)
+            batch = []
+    projected += project_events(session, batch)
+    return projected
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("command", choices=["rebuild"])
+    parser.add_argument("--batch-size", type=int, default=TIMELINE_REBUILD_BATCH_SIZE)
+    args = parser.parse_args(argv)
+    with get_session() as session:
+        print(f"Projected {rebuild_timeline(session, args.batch_size)} document events")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+from __future__ import annotations
+
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+import os
+import threading
+import time
+from typing import TypeVar
+
+T = TypeVar("T")
+
+HASH_WORKERS = int(os.getenv("HASH_WORKERS", str(os.cpu_count() or 2)))
+HASH_QUEUE_LIMIT = int(os.getenv("HASH_QUEUE_LIMIT", "32"))
+
+
+class HashingBusy(Exception):
+    pass
+
+
+class HashingPool:
+    """Size-limited executor for PBKDF2 work with fast rejection when saturated.
+
+    ``hashlib.pbkdf2_hmac`` releases the GIL, so a thread pool runs hashes in
+    parallel while keeping CPU-bound work off the request threadpool budget:
+    at most ``workers + queue_limit`` callers can be waiting at any time.
+    """
+
+    def __init__(self, workers: int = HASH_WORKERS, queue_limit: int = HASH_QUEUE_LIMIT) -> None:
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="pbkdf2")
+        self._slots = threading.BoundedSemaphore(workers + queue_limit)
+        self._lock = threading.Lock()
+        self.completed = 0
+        self.rejected = 0
+        self.queue_wait_seconds = 0.0
+        self.hash_seconds = 0.0
+
+    def run(self, func: Callable[..., T], *args, **kwargs) -> T:
+        if not self._slots.acquire(blocking=False):
+            with self._lock:
+                self.rejected += 1
+            raise HashingBusy("Password hashing capacity exhausted, retry later")
+        enqueued = time.perf_counter()
+
+        def task() -> T:
+            started = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                finished = time.perf_counter()
+                with self._lock:
+                    self.completed += 1
+                    self.queue_wait_seconds += started - enqueued
+                    self.hash_seconds += finished - started
+
+        try:
+            return self._executor.submit(task).result()
+        finally:
+            self._slots.release()
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "completed": self.completed,
+                "rejected": self.rejected,
+                "queue_wait_seconds": self.queue_wait_seconds,
+                "hash_seconds": self.hash_seconds,
+            }
+
+
+password_hasher = HashingPool()
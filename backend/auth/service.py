@@ -8,14 +8,17 @@ import json
 import os
 import secrets
 
-from sqlalchemy import select
+from sqlalchemy import delete, or_, select, update
 from sqlalchemy.orm import Session
 
+from backend.auth.hashing import password_hasher
 from backend.auth.models import Role, User, UserSession
+from backend.auth.token_cache import token_cache
 from backend.audit.service import log_event
 
 JWT_SECRET = os.getenv("JWT_SECRET", "dev-secret-change-me")
 JWT_TTL_MINUTES = int(os.getenv("JWT_TTL_MINUTES", "30"))
+SESSION_SWEEP_BATCH_SIZE = int(os.getenv("SESSION_SWEEP_BATCH_SIZE", "1000"))
 
 
 class AuthError(Exception):
@@ -73,18 +76,38 @@ def _jwt_decode(token: str) -> dict:
     return payload
 
 
-def create_user(session: Session, username: str, password: str, role: Role) -> User:
-    user = User(username=username, password_hash=hash_password(password), role=role)
+def create_user(
+    session: Session,
+    username: str,
+    password: str,
+    role: Role,
+    *,
+    password_hash: str | None = None,
+) -> User:
+    if password_hash is None:
+        password_hash = password_hasher.run(hash_password, password)
+    user = User(username=username, password_hash=password_hash, role=role)
     session.add(user)
     session.flush()
     log_event(session, "USER_CREATE", actor=username, metadata={"role": role.value})
     return user
 
 
-def login(session: Session, username: str, password: str) -> str:
-    user = session.scalar(select(User).where(User.username == username, User.is_active.is_(True)))
-    if not user or not verify_password(password, user.password_hash):
-        log_event(session, "LOGIN_FAILED", actor=username, metadata={})
+def get_password_hash(session: Session, username: str) -> str | None:
+    return session.scalar(select(User.password_hash).where(User.username == username, User.is_active.is_(True)))
+
+
+def log_login_failure(session: Session, username: str, attempts: int = 1) -> None:
+    log_event(session, "LOGIN_FAILED", actor=username, metadata={"attempts": attempts} if attempts > 1 else {})
+
+
+def complete_login(session: Session, username: str, verified: bool, *, audit_failure: bool = True) -> str:
+    user = None
+    if verified:
+        user = session.scalar(select(User).where(User.username == username, User.is_active.is_(True)))
+    if not user:
+        if audit_failure:
+            log_login_failure(session, username)
         raise AuthError("Invalid username or password")
 
     now = datetime.now(timezone.utc)
@@ -105,8 +128,17 @@ def login(session: Session, username: str, password: str) -> str:
     return token
 
 
+def login(session: Session, username: str, password: str) -> str:
+    encoded = get_password_hash(session, username)
+    verified = encoded is not None and password_hasher.run(verify_password, password, encoded)
+    return complete_login(session, username, verified)
+
+
 def validate_token(session: Session, token: str) -> dict:
     payload = _jwt_decode(token)
+    if token_cache.get(payload["sid"]) is not None:
+        return payload
+
     user = session.scalar(select(User).where(User.username == payload["sub"], User.is_active.is_(True)))
     if not user:
         raise AuthError("Unknown user")
@@ -121,6 +153,7 @@ def validate_token(session: Session, token: str) -> dict:
         raise AuthError("Session revoked")
     if sess.expires_at < datetime.now(timezone.utc):
         raise AuthError("Session expired")
+    token_cache.put(payload["sid"], payload, sess.expires_at.timestamp())
     return payload
 
 
@@ -129,3 +162,65 @@ def logout(session: Session, session_id: str, actor: str) -> None:
     if db_sess:
         db_sess.revoked = True
         log_event(session, "LOGOUT", actor=actor, metadata={"session": session_id})
+    token_cache.invalidate(session_id)
+
+
+def deactivate_user(session: Session, username: str, actor: str) -> None:
+    user = session.scalar(select(User).where(User.username == username))
+    if not user:
+        raise AuthError("Unknown user")
+    user.is_active = False
+    log_event(session, "USER_DEACTIVATE", actor=actor, metadata={}, record_type="user", record_id=username)
+    token_cache.invalidate_user(username)
+
+
+def revoke_all_sessions(session: Session, username: str, actor: str) -> int:
+    user_id = session.scalar(select(User.id).where(User.username == username))
+    if user_id is None:
+        raise AuthError("Unknown user")
+    result = session.execute(
+        update(UserSession)
+        .where(UserSession.user_id == user_id, UserSession.revoked.is_(False))
+        .values(revoked=True)
+    )
+    token_cache.invalidate_user(username)
+    log_event(
+        session,
+        "SESSIONS_REVOKE_ALL",
+        actor=actor,
+        metadata={"revoked": result.rowcount},
+        record_type="user",
+        record_id=username,
+    )
+    return result.rowcount
+
+
+def sweep_sessions(session: Session, batch_size: int = SESSION_SWEEP_BATCH_SIZE, now: datetime | None = None) -> int:
+    """Delete expired and revoked sessions, committing after every batch so the write lock is held briefly.
+
+    The ``SESSION_SWEEP`` summary is written and committed in its own short
+    transaction once the last batch is gone.
+    """
+    now = now or datetime.now(timezone.utc)
+    removed = 0
+    batches = 0
+    while True:
+        ids = session.scalars(
+            select(UserSession.id)
+            .where(or_(UserSession.revoked.is_(True), UserSession.expires_at < now))
+            .order_by(UserSession.id)
+            .limit(batch_size)
+        ).all()
+        if not ids:
+            break
+        session.execute(
+            delete(UserSession).where(UserSession.id.in_(ids)),
+            execution_options={"synchronize_session": False},
+        )
+        session.commit()
+        removed += len(ids)
+        batches += 1
+    if removed:
+        log_event(session, "SESSION_SWEEP", actor="system", metadata={"removed": removed, "batches": batches})
+        session.commit()
+    return removed
@@ -0,0 +1,61 @@
+from __future__ import annotations
+
+import logging
+import os
+import threading
+
+from sqlalchemy.exc import SQLAlchemyError
+
+from backend.audit.service import log_event
+from backend.auth.service import log_login_failure, sweep_sessions
+from backend.auth.throttle import login_throttle, signature_reauth_throttle
+from backend.db.session import get_session
+
+SESSION_SWEEP_INTERVAL_SECONDS = float(os.getenv("SESSION_SWEEP_INTERVAL_SECONDS", "300"))
+
+logger = logging.getLogger(__name__)
+
+
+class SessionSweeper:
+    """Daemon thread that periodically removes expired and revoked sessions.
+
+    Each pass also audits the login and signature re-authentication failures
+    still folded into closed throttle windows.
+    """
+
+    def __init__(self, interval_seconds: float = SESSION_SWEEP_INTERVAL_SECONDS) -> None:
+        self.interval_seconds = interval_seconds
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    def run_once(self) -> int:
+        with get_session() as session:
+            for username, attempts in login_throttle.flush():
+                log_login_failure(session, username, attempts)
+            for username, attempts in signature_reauth_throttle.flush():
+                log_event(session, "SIGNATURE_REAUTH_FAILED", username, {"attempts": attempts})
+        with get_session() as session:
+            return sweep_sessions(session)
+
+    def _loop(self) -> None:
+        while not self._stop.wait(self.interval_seconds):
+            try:
+                self.run_once()
+            except SQLAlchemyError:
+                logger.exception("Session sweep failed")
+
+    def start(self) -> None:
+        if self.interval_seconds <= 0 or (self._thread and self._thread.is_alive()):
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._loop, name="session-sweeper", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread:
+            self._thread.join()
+            self._thread = None
+
+
+session_sweeper = SessionSweeper()
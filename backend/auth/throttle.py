@@ -0,0 +1,138 @@
+from __future__ import annotations
+
+from collections import OrderedDict
+import os
+import threading
+import time
+
+LOGIN_USER_BURST = int(os.getenv("LOGIN_USER_BURST", "5"))
+LOGIN_USER_REFILL_PER_SECOND = float(os.getenv("LOGIN_USER_REFILL_PER_SECOND", "0.1"))
+LOGIN_ADDRESS_BURST = int(os.getenv("LOGIN_ADDRESS_BURST", "30"))
+LOGIN_ADDRESS_REFILL_PER_SECOND = float(os.getenv("LOGIN_ADDRESS_REFILL_PER_SECOND", "1"))
+LOGIN_THROTTLE_MAX_KEYS = int(os.getenv("LOGIN_THROTTLE_MAX_KEYS", "100000"))
+LOGIN_FAILURE_AUDIT_WINDOW_SECONDS = float(os.getenv("LOGIN_FAILURE_AUDIT_WINDOW_SECONDS", "60"))
+
+
+class TokenBucketLimiter:
+    """Per-key token buckets with a bounded number of tracked keys.
+
+    A bucket that has refilled to capacity carries no state, so idle buckets are
+    dropped opportunistically; beyond ``max_keys`` the least recently used
+    bucket is evicted.
+    """
+
+    def __init__(self, capacity: int, refill_per_second: float, max_keys: int = LOGIN_THROTTLE_MAX_KEYS) -> None:
+        self.capacity = capacity
+        self.refill_per_second = refill_per_second
+        self.max_keys = max_keys
+        self._buckets: OrderedDict[str, tuple[float, float]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _refilled(self, tokens: float, updated: float, now: float) -> float:
+        return min(self.capacity, tokens + (now - updated) * self.refill_per_second)
+
+    def allow(self, key: str, now: float | None = None) -> bool:
+        now = time.monotonic() if now is None else now
+        with self._lock:
+            tokens, updated = self._buckets.pop(key, (self.capacity, now))
+            tokens = self._refilled(tokens, updated, now)
+            allowed = tokens >= 1
+            if allowed:
+                tokens -= 1
+            self._buckets[key] = (tokens, now)
+            self._evict(now)
+            return allowed
+
+    def _evict(self, now: float) -> None:
+        while len(self._buckets) > self.max_keys:
+            self._buckets.popitem(last=False)
+        for _ in range(2):
+            if not self._buckets:
+                break
+            oldest_key, (tokens, updated) = next(iter(self._buckets.items()))
+            if self._refilled(tokens, updated, now) < self.capacity:
+                break
+            del self._buckets[oldest_key]
+
+    def __len__(self) -> int:
+        return len(self._buckets)
+
+
+class LoginThrottle:
+    """Guards ``/auth/login`` by username and client address.
+
+    Rejected attempts are also folded into one ``LOGIN_FAILED`` audit event per
+    username and window: ``record_failure`` returns how many attempts the next
+    event should report, or 0 while the window is still open. Attempts folded
+    into a window that then goes quiet are returned by ``flush`` once it
+    closes, and those of a username evicted to bound memory by
+    ``take_evicted``, so every attempt ends up in some event.
+    """
+
+    def __init__(
+        self,
+        by_username: TokenBucketLimiter | None = None,
+        by_address: TokenBucketLimiter | None = None,
+        failure_window_seconds: float = LOGIN_FAILURE_AUDIT_WINDOW_SECONDS,
+        max_keys: int = LOGIN_THROTTLE_MAX_KEYS,
+    ) -> None:
+        if by_username is None:
+            by_username = TokenBucketLimiter(LOGIN_USER_BURST, LOGIN_USER_REFILL_PER_SECOND)
+        if by_address is None:
+            by_address = TokenBucketLimiter(LOGIN_ADDRESS_BURST, LOGIN_ADDRESS_REFILL_PER_SECOND)
+        self.by_username = by_username
+        self.by_address = by_address
+        self.failure_window_seconds = failure_window_seconds
+        self.max_keys = max_keys
+        self._failures: OrderedDict[str, tuple[float, int]] = OrderedDict()
+        self._evicted: list[tuple[str, int]] = []
+        self._lock = threading.Lock()
+
+    def allow(self, username: str, address: str | None, now: float | None = None) -> bool:
+        user_ok = self.by_username.allow(username, now)
+        address_ok = address is None or self.by_address.allow(address, now)
+        return user_ok and address_ok
+
+    def record_failure(self, username: str, now: float | None = None) -> int:
+        now = time.monotonic() if now is None else now
+        with self._lock:
+            window_start, suppressed = self._failures.pop(username, (None, 0))
+            if window_start is None or now - window_start >= self.failure_window_seconds:
+                self._failures[username] = (now, 0)
+                attempts = suppressed + 1
+            else:
+                self._failures[username] = (window_start, suppressed + 1)
+                attempts = 0
+            while len(self._failures) > self.max_keys:
+                evicted, (_start, pending) = self._failures.popitem(last=False)
+                if pending:
+                    self._evicted.append((evicted, pending))
+            return attempts
+
+    def take_evicted(self) -> list[tuple[str, int]]:
+        """(username, attempts) still unreported for usernames evicted since the last call."""
+        with self._lock:
+            evicted, self._evicted = self._evicted, []
+            return evicted
+
+    def flush(self, now: float | None = None) -> list[tuple[str, int]]:
+        """Close every elapsed window; (username, attempts) still unreported, evictions included."""
+        now = time.monotonic() if now is None else now
+        with self._lock:
+            closed = [
+                (username, window_start, pending)
+                for username, (window_start, pending) in self._failures.items()
+                if now - window_start >= self.failure_window_seconds
+            ]
+            reports, self._evicted = self._evicted, []
+            for username, _start, pending in closed:
+                del self._failures[username]
+                if pending:
+                    reports.append((username, pending))
+            return reports
+
+
+login_throttle = LoginThrottle()
+# Signature re-authentication draws on the same per-username buckets (one
+# password-guessing budget per account) but folds its own audit events.
+signature_reauth_throttle = LoginThrottle(login_throttle.by_username, login_throttle.by_address)
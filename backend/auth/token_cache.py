@@ -0,0 +1,82 @@
+from __future__ import annotations
+
+from collections import OrderedDict
+from dataclasses import dataclass
+import os
+import threading
+import time
+
+TOKEN_CACHE_TTL_SECONDS = float(os.getenv("TOKEN_CACHE_TTL_SECONDS", "30"))
+TOKEN_CACHE_MAX_ENTRIES = int(os.getenv("TOKEN_CACHE_MAX_ENTRIES", "10000"))
+
+
+@dataclass(slots=True)
+class _Entry:
+    claims: dict
+    username: str
+    expires_at: float
+
+
+class ValidatedTokenCache:
+    """In-process TTL/LRU cache of validated token claims keyed by session id.
+
+    Entries never outlive the session they were validated against, and the TTL
+    bounds how long another worker process may serve a revoked session.
+    """
+
+    def __init__(
+        self,
+        ttl_seconds: float = TOKEN_CACHE_TTL_SECONDS,
+        max_entries: int = TOKEN_CACHE_MAX_ENTRIES,
+    ) -> None:
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._entries: OrderedDict[str, _Entry] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, session_id: str) -> dict | None:
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(session_id)
+            if entry is None or entry.expires_at <= now:
+                if entry is not None:
+                    del self._entries[session_id]
+                self.misses += 1
+                return None
+            self._entries.move_to_end(session_id)
+            self.hits += 1
+            return entry.claims
+
+    def put(self, session_id: str, claims: dict, session_expires_at: float) -> None:
+        if self.max_entries <= 0:
+            return
+        expires_at = min(time.time() + self.ttl_seconds, session_expires_at)
+        with self._lock:
+            self._entries[session_id] = _Entry(claims=claims, username=claims["sub"], expires_at=expires_at)
+            self._entries.move_to_end(session_id)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, session_id: str) -> None:
+        with self._lock:
+            self._entries.pop(session_id, None)
+
+    def invalidate_user(self, username: str) -> None:
+        with self._lock:
+            for session_id in [sid for sid, entry in self._entries.items() if entry.username == username]:
+                del self._entries[session_id]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {"hits": self.hits, "misses": self.misses, "size": len(self._entries)}
+
+
+token_cache = ValidatedTokenCache()
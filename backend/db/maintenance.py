@@ -0,0 +1,103 @@
+"""One-shot storage maintenance commands.
+
+Usage: python -m backend.db.maintenance {compress,upgrade} [--batch-size N]
+
+``upgrade`` brings a database created by an earlier release up to the current
+models: ``create_all`` adds missing tables but never alters existing ones, so
+the columns later added to ``documents`` are added (and backfilled through
+their defaults) here, and new lifecycle states are added to a native enum
+type where the dialect has one.
+"""
+
+from __future__ import annotations
+
+import argparse
+
+from sqlalchemy import Column, bindparam, inspect, select, text, update
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session
+
+from backend.audit.models import AuditEvent
+import backend.auth.models  # noqa: F401  (registers the tables create_all must know about)
+from backend.db.base import Base
+from backend.db.session import engine, get_session
+from backend.documents.models import Document, DocumentVersion
+import backend.signatures.models  # noqa: F401
+from backend.workflow.engine import workflow_registry
+from backend.workflow.state_machine import DocumentState
+
+COMPRESS_BATCH_SIZE = 1000
+COMPRESSED_COLUMNS: tuple[Column, ...] = (
+    DocumentVersion.__table__.c.content,
+    AuditEvent.__table__.c.metadata,
+)
+
+
+def recompress_column(session: Session, column: Column, batch_size: int = COMPRESS_BATCH_SIZE) -> int:
+    """Rewrite every value of ``column`` through its current type, in primary-key batches.
+
+    This is a storage-encoding change only: values round-trip unchanged, so the
+    rewrite goes through Core and bypasses ORM immutability listeners.
+    """
+    table = column.table
+    pk = table.primary_key.columns.values()[0]
+    statement = update(table).where(pk == bindparam("row_id")).values({column.name: bindparam("row_value")})
+    rewritten = 0
+    last_id = 0
+    while True:
+        rows = session.execute(
+            select(pk, column).where(pk > last_id, column.is_not(None)).order_by(pk).limit(batch_size)
+        ).all()
+        if not rows:
+            break
+        session.execute(statement, [{"row_id": row[0], "row_value": row[1]} for row in rows])
+        session.commit()
+        rewritten += len(rows)
+        last_id = rows[-1][0]
+    return rewritten
+
+
+def _quote(value: str) -> str:
+    return "'" + value.replace("'", "''") + "'"
+
+
+def upgrade_schema(bind: Engine) -> list[str]:
+    """Create missing tables, add missing ``documents`` columns and enum states; returns the DDL applied."""
+    Base.metadata.create_all(bind)
+    existing = {column["name"] for column in inspect(bind).get_columns(Document.__tablename__)}
+    statements = []
+    if "workflow" not in existing:
+        statements.append(
+            "ALTER TABLE documents ADD COLUMN workflow VARCHAR(50) NOT NULL "
+            f"DEFAULT {_quote(workflow_registry.default)}"
+        )
+    if "row_version" not in existing:
+        statements.append("ALTER TABLE documents ADD COLUMN row_version INTEGER NOT NULL DEFAULT 1")
+    if bind.dialect.name == "postgresql":
+        enum_name = Document.__table__.c.state.type.name
+        statements += [
+            f"ALTER TYPE {enum_name} ADD VALUE IF NOT EXISTS {_quote(state.name)}" for state in DocumentState
+        ]
+    with bind.begin() as conn:
+        for statement in statements:
+            conn.execute(text(statement))
+    return statements
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("command", choices=["compress", "upgrade"])
+    parser.add_argument("--batch-size", type=int, default=COMPRESS_BATCH_SIZE)
+    args = parser.parse_args(argv)
+    if args.command == "upgrade":
+        for statement in upgrade_schema(engine):
+            print(statement)
+        return
+    with get_session() as session:
+        for column in COMPRESSED_COLUMNS:
+            count = recompress_column(session, column, args.batch_size)
+            print(f"{column.table.name}.{column.name}: rewrote {count} rows")
+
+
+if __name__ == "__main__":
+    main()
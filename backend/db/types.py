@@ -1,8 +1,27 @@
 from __future__ import annotations
 
+import base64
 from datetime import datetime, timezone
+import json
+import lzma
+import os
+import zlib
 
-from sqlalchemy.types import DateTime, TypeDecorator
+from sqlalchemy.types import JSON, DateTime, Text, TypeDecorator
+
+COMPRESSION_ALGORITHM = os.getenv("COMPRESSION_ALGORITHM", "zlib")
+COMPRESSION_LEVEL = int(os.getenv("COMPRESSION_LEVEL", "6"))
+COMPRESSION_THRESHOLD_BYTES = int(os.getenv("COMPRESSION_THRESHOLD_BYTES", "256"))
+
+# Encoded values are "\x01" + a one-letter codec + payload; anything else is a
+# plain value written before the column was compressed.
+_PREFIX = "\x01"
+_RAW = "r"
+_CODECS = {
+    "zlib": ("z", lambda data, level: zlib.compress(data, level), zlib.decompress),
+    "lzma": ("x", lambda data, level: lzma.compress(data, preset=level), lzma.decompress),
+}
+_DECOMPRESSORS = {marker: decompress for marker, _compress, decompress in _CODECS.values()}
 
 
 class UTCDateTime(TypeDecorator):
@@ -26,5 +45,93 @@ class UTCDateTime(TypeDecorator):
         return value.astimezone(timezone.utc)
 
 
+class CompressedText(TypeDecorator):
+    """Store text compressed with zlib/lzma, base64-encoded, in a plain ``Text`` column.
+
+    The declared column type is unchanged, so no schema migration is needed:
+    rows written before the column was compressed are returned as they are,
+    and ``python -m backend.db.maintenance compress`` rewrites them. Values
+    shorter than ``threshold`` bytes, or that would not shrink, are stored
+    raw. Decoding runs when the value is loaded; the columns using this type
+    are deferred, so that happens on attribute access.
+    """
+
+    impl = Text
+    cache_ok = True
+
+    def __init__(
+        self,
+        algorithm: str = COMPRESSION_ALGORITHM,
+        level: int = COMPRESSION_LEVEL,
+        threshold: int = COMPRESSION_THRESHOLD_BYTES,
+    ) -> None:
+        if algorithm not in _CODECS:
+            raise ValueError(f"Unsupported compression algorithm: {algorithm}")
+        super().__init__()
+        self.algorithm = algorithm
+        self.level = level
+        self.threshold = threshold
+
+    def _compressed(self, text: str) -> str | None:
+        data = text.encode("utf-8")
+        if len(data) < self.threshold:
+            return None
+        marker, compress, _decompress = _CODECS[self.algorithm]
+        encoded = _PREFIX + marker + base64.b64encode(compress(data, self.level)).decode("ascii")
+        return encoded if len(encoded) < len(text) else None
+
+    def _encode(self, text: str) -> str:
+        compressed = self._compressed(text)
+        if compressed is not None:
+            return compressed
+        return _PREFIX + _RAW + text if text.startswith(_PREFIX) else text
+
+    @staticmethod
+    def _decode(value: str) -> str:
+        if not value.startswith(_PREFIX):
+            return value
+        marker, payload = value[1:2], value[2:]
+        if marker == _RAW:
+            return payload
+        return _DECOMPRESSORS[marker](base64.b64decode(payload)).decode("utf-8")
+
+    def process_bind_param(self, value, dialect):
+        if value is None:
+            return None
+        return self._encode(value)
+
+    def process_result_value(self, value, dialect):
+        if value is None:
+            return None
+        return self._decode(value)
+
+
+class CompressedJSON(CompressedText):
+    """JSON column whose large documents are stored as a ``CompressedText`` string.
+
+    Small documents stay native JSON values, and so do rows written before
+    compression; a compressed document is a JSON string.
+    """
+
+    impl = JSON
+    cache_ok = True
+
+    def process_bind_param(self, value, dialect):
+        if value is None:
+            return None
+        serialized = json.dumps(value, separators=(",", ":"))
+        compressed = self._compressed(serialized)
+        if compressed is not None:
+            return compressed
+        if isinstance(value, str) and value.startswith(_PREFIX):
+            return _PREFIX + _RAW + serialized
+        return value
+
+    def process_result_value(self, value, dialect):
+        if not isinstance(value, str) or not value.startswith(_PREFIX):
+            return value
+        return json.loads(self._decode(value))
+
+
 def utcnow() -> datetime:
     return datetime.now(timezone.utc)
@@ -0,0 +1,158 @@
+from __future__ import annotations
+
+import codecs
+from collections.abc import Iterable, Iterator
+from contextlib import contextmanager
+import hashlib
+import mmap
+import os
+from pathlib import Path
+import secrets
+
+BLOB_REF_PREFIX = "blob:"
+BLOB_CHUNK_SIZE = 64 * 1024
+MAX_UPLOAD_BYTES = int(os.getenv("MAX_UPLOAD_BYTES", str(256 * 1024 * 1024)))
+
+
+class BlobStoreError(Exception):
+    pass
+
+
+class BlobTooLarge(BlobStoreError):
+    pass
+
+
+class BlobStore:
+    """Content-addressed store for version bodies, keyed by SHA-256.
+
+    Blobs live at ``<root>/<aa>/<bb>/<sha256>`` and are written once through a
+    temporary file and an atomic rename, so identical content shared across
+    versions or documents is stored a single time.
+    """
+
+    def __init__(self, root: str | Path) -> None:
+        self.root = Path(root)
+
+    def path_for(self, checksum: str) -> Path:
+        if len(checksum) != 64 or not all(c in "0123456789abcdef" for c in checksum):
+            raise BlobStoreError(f"Invalid blob checksum: {checksum!r}")
+        return self.root / checksum[:2] / checksum[2:4] / checksum
+
+    def exists(self, checksum: str) -> bool:
+        return self.path_for(checksum).exists()
+
+    def put_bytes(self, data: bytes, checksum: str | None = None) -> str:
+        checksum = checksum or hashlib.sha256(data).hexdigest()
+        path = self.path_for(checksum)
+        if path.exists():
+            return checksum
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_name(f".{checksum}.{secrets.token_hex(4)}.tmp")
+        try:
+            with tmp_path.open("wb") as handle:
+                handle.write(data)
+                handle.flush()
+                os.fsync(handle.fileno())
+            os.chmod(tmp_path, 0o444)
+            os.replace(tmp_path, path)
+        finally:
+            tmp_path.unlink(missing_ok=True)
+        return checksum
+
+    def writer(self, max_size: int | None = MAX_UPLOAD_BYTES) -> BlobWriter:
+        return BlobWriter(self, max_size)
+
+    def put_stream(self, chunks: Iterable[bytes], max_size: int | None = MAX_UPLOAD_BYTES) -> tuple[str, int]:
+        writer = self.writer(max_size)
+        try:
+            for chunk in chunks:
+                writer.write(chunk)
+        except BaseException:
+            writer.abort()
+            raise
+        return writer.commit(), writer.size
+
+    @contextmanager
+    def open(self, checksum: str) -> Iterator[mmap.mmap | bytes]:
+        path = self.path_for(checksum)
+        try:
+            handle = path.open("rb")
+        except FileNotFoundError as exc:
+            raise BlobStoreError(f"Blob not found: {checksum}") from exc
+        with handle:
+            if os.fstat(handle.fileno()).st_size == 0:
+                yield b""
+                return
+            with mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                yield mapped
+
+    def read_text(self, checksum: str) -> str:
+        with self.open(checksum) as mapped:
+            return str(mapped, "utf-8")
+
+
+class BlobWriter:
+    """Incremental blob write: hashes and validates UTF-8 while spooling to disk.
+
+    A write that would take the blob past ``max_size`` raises ``BlobTooLarge``;
+    the caller aborts the writer.
+    """
+
+    def __init__(self, store: BlobStore, max_size: int | None = MAX_UPLOAD_BYTES) -> None:
+        self.store = store
+        self.max_size = max_size
+        self.size = 0
+        self._digest = hashlib.sha256()
+        self._decoder = codecs.getincrementaldecoder("utf-8")()
+        store.root.mkdir(parents=True, exist_ok=True)
+        self._tmp_path = store.root / f".upload.{secrets.token_hex(8)}.tmp"
+        self._handle = self._tmp_path.open("wb")
+
+    def write(self, chunk: bytes) -> None:
+        if self.max_size is not None and self.size + len(chunk) > self.max_size:
+            raise BlobTooLarge(f"Version content exceeds {self.max_size} bytes")
+        try:
+            self._decoder.decode(chunk)
+        except UnicodeDecodeError as exc:
+            raise BlobStoreError("Version content must be UTF-8 text") from exc
+        self._digest.update(chunk)
+        self._handle.write(chunk)
+        self.size += len(chunk)
+
+    def commit(self) -> str:
+        try:
+            self._decoder.decode(b"", final=True)
+        except UnicodeDecodeError as exc:
+            self.abort()
+            raise BlobStoreError("Version content must be UTF-8 text") from exc
+        checksum = self._digest.hexdigest()
+        try:
+            self._handle.flush()
+            os.fsync(self._handle.fileno())
+            self._handle.close()
+            path = self.store.path_for(checksum)
+            if not path.exists():
+                path.parent.mkdir(parents=True, exist_ok=True)
+                os.chmod(self._tmp_path, 0o444)
+                os.replace(self._tmp_path, path)
+        finally:
+            self.abort()
+        return checksum
+
+    def abort(self) -> None:
+        self._handle.close()
+        self._tmp_path.unlink(missing_ok=True)
+
+
+def blob_ref(checksum: str) -> str:
+    return f"{BLOB_REF_PREFIX}{checksum}"
+
+
+def blob_checksum(content_ref: str) -> str:
+    if not content_ref.startswith(BLOB_REF_PREFIX):
+        raise BlobStoreError(f"Not a blob reference: {content_ref!r}")
+    return content_ref.removeprefix(BLOB_REF_PREFIX)
+
+
+_blob_dir = os.getenv("DOCUMENT_BLOB_DIR")
+blob_store: BlobStore | None = BlobStore(_blob_dir) if _blob_dir else None
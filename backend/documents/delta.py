@@ -0,0 +1,49 @@
+from __future__ import annotations
+
+import difflib
+import json
+
+DELTA_REF_PREFIX = "delta:"
+
+
+class DeltaError(Exception):
+    pass
+
+
+def make_delta(base: str, target: str) -> str:
+    """Encode ``target`` as line copies from ``base`` plus literal inserts.
+
+    The delta is a JSON list whose items are either ``[start, end]`` (copy
+    ``base`` lines ``start:end``) or a string to insert verbatim.
+    """
+    base_lines = base.splitlines(keepends=True)
+    target_lines = target.splitlines(keepends=True)
+    ops: list[list[int] | str] = []
+    matcher = difflib.SequenceMatcher(None, base_lines, target_lines, autojunk=False)
+    for tag, i1, i2, j1, j2 in matcher.get_opcodes():
+        if tag == "equal":
+            ops.append([i1, i2])
+        elif tag in {"replace", "insert"}:
+            ops.append("".join(target_lines[j1:j2]))
+    return json.dumps(ops, separators=(",", ":"))
+
+
+def apply_delta(base: str, delta: str) -> str:
+    base_lines = base.splitlines(keepends=True)
+    try:
+        ops = json.loads(delta)
+        return "".join(op if isinstance(op, str) else "".join(base_lines[op[0]:op[1]]) for op in ops)
+    except (ValueError, TypeError, IndexError) as exc:
+        raise DeltaError("Malformed version delta") from exc
+
+
+def delta_ref(base_version_no: int) -> str:
+    return f"{DELTA_REF_PREFIX}{base_version_no}"
+
+
+def is_delta_ref(content_ref: str | None) -> bool:
+    return content_ref is not None and content_ref.startswith(DELTA_REF_PREFIX)
+
+
+def delta_base_version_no(content_ref: str) -> int:
+    return int(content_ref.removeprefix(DELTA_REF_PREFIX))
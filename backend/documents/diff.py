@@ -0,0 +1,118 @@
+from __future__ import annotations
+
+from collections import OrderedDict
+from collections.abc import Iterable, Iterator
+import difflib
+import os
+import threading
+
+from sqlalchemy.orm import Session
+
+from backend.documents.service import get_version, read_version_content
+
+DIFF_CACHE_MAX_BYTES = int(os.getenv("DIFF_CACHE_MAX_BYTES", str(64 * 1024 * 1024)))
+DIFF_CONTEXT_LINES = 3
+# Approximate CPython cost of a cached line beyond its text: the str header plus its tuple slot.
+DIFF_CACHE_LINE_OVERHEAD_BYTES = 56
+
+
+def _line_bytes(line: str) -> int:
+    return len(line.encode("utf-8")) + DIFF_CACHE_LINE_OVERHEAD_BYTES
+
+
+class DiffCache:
+    """LRU of diff hunks keyed by ``(old checksum, new checksum)``, bounded by total size.
+
+    Version content is immutable, so a checksum pair always yields the same
+    hunks. Sizes are the UTF-8 length of each line plus a fixed per-line
+    overhead. Diffs larger than an eighth of the budget are streamed uncached.
+    """
+
+    def __init__(self, max_bytes: int = DIFF_CACHE_MAX_BYTES) -> None:
+        self.max_bytes = max_bytes
+        self.max_entry_bytes = max_bytes // 8
+        self.hits = 0
+        self.misses = 0
+        self._size = 0
+        self._entries: OrderedDict[tuple[str, str], tuple[str, ...]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: tuple[str, str]) -> tuple[str, ...] | None:
+        with self._lock:
+            lines = self._entries.get(key)
+            if lines is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return lines
+
+    def put(self, key: tuple[str, str], lines: tuple[str, ...], size: int) -> None:
+        if size > self.max_entry_bytes:
+            return
+        with self._lock:
+            if key in self._entries:
+                return
+            self._entries[key] = lines
+            self._size += size
+            while self._size > self.max_bytes:
+                _key, evicted = self._entries.popitem(last=False)
+                self._size -= sum(_line_bytes(line) for line in evicted)
+
+    def stream_through(self, key: tuple[str, str], lines: Iterable[str]) -> Iterator[str]:
+        """Yield ``lines`` and cache them once fully consumed, unless they outgrow the entry limit."""
+        collected: list[str] | None = []
+        size = 0
+        for line in lines:
+            if collected is not None:
+                size += _line_bytes(line)
+                if size > self.max_entry_bytes:
+                    collected = None
+                else:
+                    collected.append(line)
+            yield line
+        if collected is not None:
+            self.put(key, tuple(collected), size)
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {"hits": self.hits, "misses": self.misses, "entries": len(self._entries), "bytes": self._size}
+
+
+def diff_hunks(old_text: str, new_text: str) -> Iterator[str]:
+    """Unified-diff hunks without the ``---``/``+++`` file header lines."""
+    lines = difflib.unified_diff(
+        old_text.splitlines(keepends=True),
+        new_text.splitlines(keepends=True),
+        n=DIFF_CONTEXT_LINES,
+    )
+    for index, line in enumerate(lines):
+        if index < 2:
+            continue
+        if not line.endswith("\n"):
+            line += "\n\\ No newline at end of file\n"
+        yield line
+
+
+diff_cache = DiffCache()
+
+
+def diff_versions(session: Session, doc_number: str, from_version: int, to_version: int) -> Iterator[str]:
+    """Return a unified diff between two versions that can be consumed after the session closes."""
+    old = get_version(session, doc_number, from_version)
+    new = get_version(session, doc_number, to_version)
+    header = [
+        f"--- {doc_number} v{from_version} ({old.checksum})\n",
+        f"+++ {doc_number} v{to_version} ({new.checksum})\n",
+    ]
+    key = (old.checksum, new.checksum)
+    cached = diff_cache.get(key)
+    if cached is not None:
+        return iter([*header, *cached])
+    hunks = diff_hunks(read_version_content(old), read_version_content(new))
+    return _prepend(header, diff_cache.stream_through(key, hunks))
+
+
+def _prepend(header: list[str], lines: Iterator[str]) -> Iterator[str]:
+    yield from header
+    yield from lines
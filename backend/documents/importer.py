@@ -0,0 +1,266 @@
+"""Offline bulk import of a legacy document repository.
+
+Usage:
+    python -m backend.documents.importer SOURCE [--batch-size N] [--workers N]
+
+SOURCE is either a directory tree laid out as ``<doc_number>/<version files>``
+(files are imported in name order, one version each) or a CSV manifest with
+``doc_number,title,owner_username,path`` columns listed in version order.
+
+Each imported file is recorded in ``document_import_sources`` (document,
+source path, checksum) in the same transaction as its version, so an
+interrupted import is resumed by running it again: files already imported
+are skipped by path, whatever their position in the source, before they are
+read or hashed. The recorded checksum identifies the content each version was
+imported from.
+"""
+
+from __future__ import annotations
+
+import argparse
+from concurrent.futures import ProcessPoolExecutor
+import csv
+from dataclasses import dataclass
+import hashlib
+import os
+from pathlib import Path
+import time
+
+from sqlalchemy import func, insert, select
+from sqlalchemy.orm import Session
+
+from backend.audit.service import log_events_bulk
+from backend.db.base import Base
+from backend.db.session import SessionLocal, engine
+from backend.documents import blobstore
+from backend.documents.blobstore import BlobStore
+from backend.documents.models import Document, DocumentVersion, ImportedSource
+
+IMPORT_BATCH_SIZE = 5000
+IMPORT_ACTOR = "legacy-import"
+
+
+@dataclass(frozen=True, slots=True)
+class ImportItem:
+    doc_number: str
+    title: str
+    owner_username: str
+    path: str
+
+
+@dataclass(slots=True)
+class ImportStats:
+    documents: int = 0
+    versions: int = 0
+    skipped: int = 0
+    seconds: float = 0.0
+
+    @property
+    def versions_per_second(self) -> float:
+        return self.versions / self.seconds if self.seconds else 0.0
+
+
+def scan_source(source: str | Path, owner_username: str = IMPORT_ACTOR) -> list[ImportItem]:
+    source = Path(source)
+    if source.is_file():
+        with source.open(newline="", encoding="utf-8") as handle:
+            base = source.parent
+            return [
+                ImportItem(row["doc_number"], row["title"], row["owner_username"], str(base / row["path"]))
+                for row in csv.DictReader(handle)
+            ]
+    items = []
+    for doc_dir in sorted(p for p in source.iterdir() if p.is_dir()):
+        for version_file in sorted(p for p in doc_dir.iterdir() if p.is_file()):
+            items.append(ImportItem(doc_dir.name, doc_dir.name, owner_username, str(version_file)))
+    return items
+
+
+def _hash_file(path: str, blob_dir: str | None) -> tuple[str, str | None]:
+    data = Path(path).read_bytes()
+    text = data.decode("utf-8")
+    checksum = hashlib.sha256(data).hexdigest()
+    if blob_dir is None:
+        return checksum, text
+    BlobStore(blob_dir).put_bytes(data, checksum)
+    return checksum, None
+
+
+def _imported_paths(session: Session, items: list[ImportItem]) -> set[tuple[str, str]]:
+    """``(doc_number, source_path)`` pairs among ``items`` that a previous run already imported."""
+    doc_numbers = sorted({item.doc_number for item in items})
+    paths = sorted({item.path for item in items})
+    return set(
+        session.execute(
+            select(Document.doc_number, ImportedSource.source_path)
+            .join(Document, Document.id == ImportedSource.document_id)
+            .where(Document.doc_number.in_(doc_numbers), ImportedSource.source_path.in_(paths))
+        ).all()
+    )
+
+
+def _insert_batch(
+    session: Session, items: list[ImportItem], hashed: list[tuple[str, str | None]]
+) -> tuple[int, int]:
+    """Insert the versions of ``items`` not imported before; returns (new documents, new versions)."""
+    doc_numbers = sorted({item.doc_number for item in items})
+    doc_ids = dict(
+        session.execute(select(Document.doc_number, Document.id).where(Document.doc_number.in_(doc_numbers))).all()
+    )
+    seen = set(
+        session.execute(
+            select(Document.doc_number, ImportedSource.source_path, ImportedSource.checksum)
+            .join(Document, Document.id == ImportedSource.document_id)
+            .where(Document.doc_number.in_(doc_numbers))
+        ).all()
+    )
+    pending = []
+    for item, (checksum, text) in zip(items, hashed):
+        key = (item.doc_number, item.path, checksum)
+        if key not in seen:
+            seen.add(key)
+            pending.append((item, checksum, text))
+    if not pending:
+        return 0, 0
+    new_docs = {}
+    for item, _checksum, _text in pending:
+        if item.doc_number not in doc_ids and item.doc_number not in new_docs:
+            new_docs[item.doc_number] = {
+                "doc_number": item.doc_number,
+                "title": item.title,
+                "owner_username": item.owner_username,
+            }
+    if new_docs:
+        created = session.execute(insert(Document).returning(Document.doc_number, Document.id), list(new_docs.values()))
+        doc_ids.update(dict(created.all()))
+
+    next_version = dict(
+        session.execute(
+            select(DocumentVersion.document_id, func.max(DocumentVersion.version_no))
+            .where(DocumentVersion.document_id.in_(list(doc_ids.values())))
+            .group_by(DocumentVersion.document_id)
+        ).all()
+    )
+    versions = []
+    sources = []
+    events = [
+        {
+            "event_type": "DOCUMENT_CREATE",
+            "actor": IMPORT_ACTOR,
+            "metadata": {"title": doc["title"], "imported": True},
+            "record_type": "document",
+            "record_id": doc["doc_number"],
+        }
+        for doc in new_docs.values()
+    ]
+    for item, checksum, text in pending:
+        document_id = doc_ids[item.doc_number]
+        version_no = next_version.get(document_id, 0) + 1
+        next_version[document_id] = version_no
+        versions.append(
+            {
+                "document_id": document_id,
+                "version_no": version_no,
+                "content": text,
+                "content_ref": None if text is not None else blobstore.blob_ref(checksum),
+                "checksum": checksum,
+                "created_by": item.owner_username,
+            }
+        )
+        sources.append({"document_id": document_id, "version_no": version_no, "source_path": item.path})
+        events.append(
+            {
+                "event_type": "VERSION_ADD",
+                "actor": IMPORT_ACTOR,
+                "metadata": {"version_no": version_no, "checksum": checksum, "source": item.path},
+                "record_type": "document",
+                "record_id": item.doc_number,
+            }
+        )
+    version_ids = {
+        (row.document_id, row.version_no): row.id
+        for row in session.execute(
+            insert(DocumentVersion).returning(
+                DocumentVersion.document_id, DocumentVersion.version_no, DocumentVersion.id
+            ),
+            versions,
+        )
+    }
+    session.execute(
+        insert(ImportedSource),
+        [
+            {
+                "document_id": source["document_id"],
+                "version_id": version_ids[(source["document_id"], source["version_no"])],
+                "source_path": source["source_path"],
+                "checksum": version["checksum"],
+            }
+            for source, version in zip(sources, versions)
+        ],
+    )
+    log_events_bulk(session, events)
+    return len(new_docs), len(versions)
+
+
+def import_items(
+    session: Session,
+    items: list[ImportItem],
+    batch_size: int = IMPORT_BATCH_SIZE,
+    workers: int = os.cpu_count() or 1,
+    progress=None,
+) -> ImportStats:
+    """Import ``items`` in committed batches, skipping files a previous (possibly interrupted) run imported."""
+    blob_dir = str(blobstore.blob_store.root) if blobstore.blob_store is not None else None
+    stats = ImportStats()
+    started = time.perf_counter()
+    executor = ProcessPoolExecutor(max_workers=workers) if workers > 1 else None
+    try:
+        for offset in range(0, len(items), batch_size):
+            batch = items[offset:offset + batch_size]
+            imported = _imported_paths(session, batch)
+            pending = [item for item in batch if (item.doc_number, item.path) not in imported]
+            paths = [item.path for item in pending]
+            if executor is None or not paths:
+                hashed = [_hash_file(path, blob_dir) for path in paths]
+            else:
+                chunksize = max(1, len(paths) // (workers * 4))
+                hashed = list(executor.map(_hash_file, paths, [blob_dir] * len(paths), chunksize=chunksize))
+            documents, versions = _insert_batch(session, pending, hashed) if pending else (0, 0)
+            session.commit()
+            stats.documents += documents
+            stats.versions += versions
+            stats.skipped += len(batch) - versions
+            stats.seconds = time.perf_counter() - started
+            if progress:
+                progress(offset + len(batch), len(items), stats)
+    finally:
+        if executor is not None:
+            executor.shutdown()
+    stats.seconds = time.perf_counter() - started
+    return stats
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("source")
+    parser.add_argument("--owner", default=IMPORT_ACTOR)
+    parser.add_argument("--batch-size", type=int, default=IMPORT_BATCH_SIZE)
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    args = parser.parse_args(argv)
+
+    Base.metadata.create_all(engine)
+    items = scan_source(args.source, args.owner)
+
+    def report(done: int, total: int, stats: ImportStats) -> None:
+        print(f"{done}/{total} versions, {stats.versions_per_second:,.0f} versions/s")
+
+    with SessionLocal() as session:
+        stats = import_items(session, items, args.batch_size, args.workers, report)
+    print(
+        f"Imported {stats.versions} versions ({stats.documents} new documents, "
+        f"{stats.skipped} already imported) in {stats.seconds:.1f}s"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -3,16 +3,22 @@ from __future__ import annotations
 from datetime import datetime
 
 
-from sqlalchemy import Boolean, Enum as SQLEnum, ForeignKey, Integer, String, Text
+from sqlalchemy import Boolean, Enum as SQLEnum, ForeignKey, Index, Integer, String, UniqueConstraint
 from sqlalchemy.orm import Mapped, mapped_column
 
 from backend.db.base import Base
-from backend.db.types import UTCDateTime, utcnow
+from backend.db.types import CompressedText, UTCDateTime, utcnow
+from backend.workflow.engine import workflow_registry
 from backend.workflow.state_machine import DocumentState
 
 
 class Document(Base):
     __tablename__ = "documents"
+    __table_args__ = (
+        Index("ix_documents_created_at_id", "created_at", "id"),
+        Index("ix_documents_state_created_at_id", "state", "created_at", "id"),
+        Index("ix_documents_owner_created_at_id", "owner_username", "created_at", "id"),
+    )
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True)
     doc_number: Mapped[str] = mapped_column(String(64), unique=True, nullable=False)
@@ -20,16 +26,41 @@ class Document(Base):
     owner_username: Mapped[str] = mapped_column(String(100), nullable=False)
     state: Mapped[DocumentState] = mapped_column(SQLEnum(DocumentState), default=DocumentState.DRAFT, nullable=False)
     locked: Mapped[bool] = mapped_column(Boolean, default=False, nullable=False)
+    workflow: Mapped[str] = mapped_column(String(50), default=lambda: workflow_registry.default, nullable=False)
     created_at: Mapped[datetime] = mapped_column(UTCDateTime(), default=utcnow, nullable=False)
+    # Bumped by every state/lock change; ORM flushes compare-and-swap on it and
+    # set-based UPDATEs must increment it themselves.
+    row_version: Mapped[int] = mapped_column(Integer, default=1, nullable=False)
+
+    __mapper_args__ = {"version_id_col": row_version}
 
 
 class DocumentVersion(Base):
     __tablename__ = "document_versions"
+    __table_args__ = (UniqueConstraint("document_id", "version_no", name="uq_document_versions_document_version"),)
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True)
     document_id: Mapped[int] = mapped_column(ForeignKey("documents.id"), nullable=False)
     version_no: Mapped[int] = mapped_column(Integer, nullable=False)
-    content: Mapped[str] = mapped_column(Text, nullable=False)
+    content: Mapped[str | None] = mapped_column(CompressedText(), nullable=True, deferred=True)
+    content_ref: Mapped[str | None] = mapped_column(String(255), nullable=True)
     checksum: Mapped[str] = mapped_column(String(128), nullable=False)
     created_by: Mapped[str] = mapped_column(String(100), nullable=False)
     created_at: Mapped[datetime] = mapped_column(UTCDateTime(), default=utcnow, nullable=False)
+
+
+class ImportedSource(Base):
+    """Which legacy file became which version; written with the version, so a re-run import skips it."""
+
+    __tablename__ = "document_import_sources"
+    __table_args__ = (
+        UniqueConstraint(
+            "document_id", "source_path", "checksum", name="uq_document_import_sources_document_path_checksum"
+        ),
+    )
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    document_id: Mapped[int] = mapped_column(ForeignKey("documents.id"), nullable=False)
+    version_id: Mapped[int] = mapped_column(ForeignKey("document_versions.id"), nullable=False)
+    source_path: Mapped[str] = mapped_column(String(1024), nullable=False)
+    checksum: Mapped[str] = mapped_column(String(128), nullable=False)
@@ -0,0 +1,94 @@
+from __future__ import annotations
+
+import base64
+from datetime import datetime
+import json
+
+from sqlalchemy import and_, or_, select
+from sqlalchemy.orm import Session
+
+from backend.documents.models import Document
+from backend.documents.service import DocumentError
+from backend.workflow.state_machine import DocumentState
+
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 500
+
+_SUMMARY_COLUMNS = (
+    Document.id,
+    Document.doc_number,
+    Document.title,
+    Document.owner_username,
+    Document.state,
+    Document.locked,
+    Document.created_at,
+)
+
+
+def encode_cursor(created_at: datetime, document_id: int) -> str:
+    raw = json.dumps([created_at.isoformat(), document_id], separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).rstrip(b"=").decode("ascii")
+
+
+def decode_cursor(cursor: str) -> tuple[datetime, int]:
+    try:
+        created_at, document_id = json.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+        return datetime.fromisoformat(created_at), int(document_id)
+    except (ValueError, TypeError) as exc:
+        raise DocumentError("Invalid pagination cursor") from exc
+
+
+def _summary(row) -> dict:
+    return {
+        "doc_number": row.doc_number,
+        "title": row.title,
+        "owner_username": row.owner_username,
+        "state": row.state.value,
+        "locked": row.locked,
+        "created_at": row.created_at.isoformat(),
+    }
+
+
+def list_documents(
+    session: Session,
+    *,
+    state: DocumentState | None = None,
+    owner_username: str | None = None,
+    locked: bool | None = None,
+    created_from: datetime | None = None,
+    created_to: datetime | None = None,
+    cursor: str | None = None,
+    limit: int = DEFAULT_PAGE_SIZE,
+) -> tuple[list[dict], str | None]:
+    """Page through documents in ``(created_at, id)`` order using keyset pagination.
+
+    Each page is an index range scan on one of the ``ix_documents_*_created_at_id``
+    indexes, so its cost does not depend on how deep into the listing it is.
+    """
+    limit = max(1, min(limit, MAX_PAGE_SIZE))
+    query = select(*_SUMMARY_COLUMNS)
+    if state is not None:
+        query = query.where(Document.state == state)
+    if owner_username is not None:
+        query = query.where(Document.owner_username == owner_username)
+    if locked is not None:
+        query = query.where(Document.locked.is_(locked))
+    if created_from is not None:
+        query = query.where(Document.created_at >= created_from)
+    if created_to is not None:
+        query = query.where(Document.created_at < created_to)
+    if cursor is not None:
+        after_created, after_id = decode_cursor(cursor)
+        query = query.where(
+            or_(Document.created_at > after_created, and_(Document.created_at == after_created, Document.id > after_id))
+        )
+    rows = session.execute(query.order_by(Document.created_at, Document.id).limit(limit + 1)).all()
+    next_cursor = encode_cursor(rows[limit - 1].created_at, rows[limit - 1].id) if len(rows) > limit else None
+    return [_summary(row) for row in rows[:limit]], next_cursor
+
+
+def get_document_summary(session: Session, doc_number: str) -> dict:
+    row = session.execute(select(*_SUMMARY_COLUMNS).where(Document.doc_number == doc_number)).first()
+    if row is None:
+        raise DocumentError("Document not found")
+    return _summary(row)
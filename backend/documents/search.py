@@ -0,0 +1,180 @@
+"""Full-text search over the latest version of each document.
+
+Usage: python -m backend.documents.search rebuild [--batch-size N]
+"""
+
+from __future__ import annotations
+
+from abc import ABC, abstractmethod
+import argparse
+import os
+
+from sqlalchemy import DDL, event, func, select, text
+from sqlalchemy.orm import Session
+
+from backend.db.base import Base
+from backend.db.session import get_session
+from backend.documents.models import Document, DocumentVersion
+
+SEARCH_TABLE = "document_search"
+SEARCH_REBUILD_BATCH_SIZE = 500
+DEFAULT_SEARCH_LIMIT = 20
+SEARCH_MAX_INDEXED_BYTES = int(os.getenv("SEARCH_MAX_INDEXED_BYTES", str(8 * 1024 * 1024)))
+
+event.listen(
+    Base.metadata,
+    "after_create",
+    DDL(
+        f"CREATE VIRTUAL TABLE IF NOT EXISTS {SEARCH_TABLE} "
+        "USING fts5(doc_number UNINDEXED, version_no UNINDEXED, content, tokenize='porter unicode61')"
+    ).execute_if(dialect="sqlite"),
+)
+
+
+class SearchUnavailable(Exception):
+    pass
+
+
+class SearchBackend(ABC):
+    """Keeps one indexed body per document; subclasses implement a dialect."""
+
+    @abstractmethod
+    def index(self, session: Session, document_id: int, doc_number: str, version_no: int, content: str) -> None:
+        ...
+
+    @abstractmethod
+    def clear(self, session: Session) -> None:
+        ...
+
+    @abstractmethod
+    def search(self, session: Session, query: str, limit: int) -> list[dict]:
+        ...
+
+
+class SqliteFtsBackend(SearchBackend):
+    """FTS5 table whose rowid is the document id, ranked with bm25."""
+
+    def index(self, session: Session, document_id: int, doc_number: str, version_no: int, content: str) -> None:
+        session.execute(text(f"DELETE FROM {SEARCH_TABLE} WHERE rowid = :rowid"), {"rowid": document_id})
+        session.execute(
+            text(
+                f"INSERT INTO {SEARCH_TABLE} (rowid, doc_number, version_no, content) "
+                "VALUES (:rowid, :doc, :ver, :body)"
+            ),
+            {"rowid": document_id, "doc": doc_number, "ver": version_no, "body": content},
+        )
+
+    def clear(self, session: Session) -> None:
+        session.execute(text(f"DELETE FROM {SEARCH_TABLE}"))
+
+    def search(self, session: Session, query: str, limit: int) -> list[dict]:
+        rows = session.execute(
+            text(
+                f"SELECT doc_number, version_no, snippet({SEARCH_TABLE}, 2, '[', ']', '...', 12) AS snippet, "
+                f"bm25({SEARCH_TABLE}) AS score FROM {SEARCH_TABLE} WHERE {SEARCH_TABLE} MATCH :query "
+                "ORDER BY score LIMIT :limit"
+            ),
+            {"query": _fts_phrase_query(query), "limit": limit},
+        ).all()
+        return [
+            {
+                "doc_number": row.doc_number,
+                "version_no": int(row.version_no),
+                "snippet": row.snippet,
+                "score": -row.score,
+            }
+            for row in rows
+        ]
+
+
+class UnsupportedSearchBackend(SearchBackend):
+    """Placeholder for dialects without a registered search backend: writes are no-ops."""
+
+    def index(self, session: Session, document_id: int, doc_number: str, version_no: int, content: str) -> None:
+        return None
+
+    def clear(self, session: Session) -> None:
+        return None
+
+    def search(self, session: Session, query: str, limit: int) -> list[dict]:
+        raise SearchUnavailable(f"Full-text search is not configured for {session.get_bind().dialect.name}")
+
+
+SEARCH_BACKENDS: dict[str, SearchBackend] = {"sqlite": SqliteFtsBackend()}
+
+
+def search_backend(session: Session) -> SearchBackend:
+    return SEARCH_BACKENDS.get(session.get_bind().dialect.name, UnsupportedSearchBackend())
+
+
+def _fts_phrase_query(query: str) -> str:
+    terms = [term.replace('"', '""') for term in query.split()]
+    if not terms:
+        raise SearchUnavailable("Search query is empty")
+    return " ".join(f'"{term}"' for term in terms)
+
+
+def index_latest_version(session: Session, document: Document, version: DocumentVersion, content: str) -> None:
+    """Replace the document's indexed body; text past SEARCH_MAX_INDEXED_BYTES of UTF-8 is not searchable."""
+    searchable = content
+    if len(content) > SEARCH_MAX_INDEXED_BYTES // 4:
+        encoded = content.encode("utf-8")
+        if len(encoded) > SEARCH_MAX_INDEXED_BYTES:
+            # A character cut in half at the limit is dropped.
+            searchable = encoded[:SEARCH_MAX_INDEXED_BYTES].decode("utf-8", errors="ignore")
+    search_backend(session).index(session, document.id, document.doc_number, version.version_no, searchable)
+
+
+def search_documents(session: Session, query: str, limit: int = DEFAULT_SEARCH_LIMIT) -> list[dict]:
+    return search_backend(session).search(session, query, limit)
+
+
+def rebuild_search_index(session: Session, batch_size: int = SEARCH_REBUILD_BATCH_SIZE) -> int:
+    from backend.documents.service import read_version_content
+
+    backend = search_backend(session)
+    backend.clear(session)
+    latest = (
+        select(DocumentVersion.document_id, func.max(DocumentVersion.version_no).label("version_no"))
+        .group_by(DocumentVersion.document_id)
+        .subquery()
+    )
+    indexed = 0
+    last_document_id = 0
+    while True:
+        rows = session.execute(
+            select(Document, DocumentVersion)
+            .join(latest, latest.c.document_id == Document.id)
+            .join(
+                DocumentVersion,
+                (DocumentVersion.document_id == latest.c.document_id)
+                & (DocumentVersion.version_no == latest.c.version_no),
+            )
+            .where(Document.id > last_document_id)
+            .order_by(Document.id)
+            .limit(batch_size)
+        ).all()
+        if not rows:
+            break
+        for document, version in rows:
+            index_latest_version(session, document, version, read_version_content(version))
+        session.flush()
+        last_document_id = rows[-1][0].id
+        for document, version in rows:
+            session.expunge(document)
+            session.expunge(version)
+        indexed += len(rows)
+    return indexed
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("command", choices=["rebuild"])
+    parser.add_argument("--batch-size", type=int, default=SEARCH_REBUILD_BATCH_SIZE)
+    args = parser.parse_args(argv)
+    with get_session() as session:
+        print(f"Indexed {rebuild_search_index(session, args.batch_size)} documents")
+
+
+if __name__ == "__main__":
+    main()
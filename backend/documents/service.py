@@ -1,30 +1,85 @@
 from __future__ import annotations
 
+from collections.abc import Callable, Iterator
+from dataclasses import dataclass, field
 import hashlib
+import os
+import random
+import time
+from typing import TypeVar
 
-from sqlalchemy import select
-from sqlalchemy.orm import Session
+from sqlalchemy import func, select, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session, object_session, undefer
+from sqlalchemy.orm.exc import StaleDataError
 
-from backend.audit.service import log_event
+from backend.audit.service import log_event, log_events_bulk
 from backend.auth.models import Role
 from backend.auth.rbac import PermissionDenied
+from backend.documents import blobstore
+from backend.documents.delta import DeltaError, apply_delta, delta_base_version_no, delta_ref, is_delta_ref, make_delta
 from backend.documents.models import Document, DocumentVersion
-from backend.workflow.state_machine import DocumentState, ensure_transition_allowed
+from backend.documents.search import SEARCH_MAX_INDEXED_BYTES, index_latest_version
+from backend.workflow.engine import workflow_registry
+from backend.workflow.state_machine import DocumentState, WorkflowError
+
+
+VERSION_INSERT_ATTEMPTS = 3
+CONTENT_MIGRATION_BATCH_SIZE = 500
+VERSION_STORAGE_MODE = os.getenv("VERSION_STORAGE_MODE", "full")
+DELTA_SNAPSHOT_INTERVAL = int(os.getenv("DELTA_SNAPSHOT_INTERVAL", "10"))
+BULK_TRANSITION_CHUNK_SIZE = 5000
+CONFLICT_RETRY_ATTEMPTS = 3
+CONFLICT_RETRY_BACKOFF_SECONDS = 0.01
+
+T = TypeVar("T")
 
 
 class DocumentError(Exception):
     pass
 
 
-def create_document(session: Session, doc_number: str, title: str, owner_username: str) -> Document:
-    document = Document(doc_number=doc_number, title=title, owner_username=owner_username)
+class ConcurrentUpdateError(DocumentError):
+    """The document changed after it was read; reload it and re-apply the change."""
+
+
+@dataclass(slots=True)
+class BulkTransitionResult:
+    changed: list[str] = field(default_factory=list)
+    skipped: dict[str, str] = field(default_factory=dict)
+
+
+def _next_version_no(session: Session, document_id: int) -> int:
+    current_max = session.scalar(
+        select(func.max(DocumentVersion.version_no)).where(DocumentVersion.document_id == document_id)
+    )
+    return (current_max or 0) + 1
+
+
+def create_document(
+    session: Session, doc_number: str, title: str, owner_username: str, workflow: str | None = None
+) -> Document:
+    try:
+        lifecycle = workflow_registry.get(workflow or workflow_registry.default)
+    except WorkflowError as exc:
+        raise DocumentError(str(exc)) from exc
+    document = Document(
+        doc_number=doc_number,
+        title=title,
+        owner_username=owner_username,
+        workflow=lifecycle.name,
+        state=lifecycle.initial,
+    )
     session.add(document)
     session.flush()
-    log_event(session, "DOCUMENT_CREATE", owner_username, {"title": title}, "document", doc_number)
+    metadata = {"title": title}
+    if workflow:
+        metadata["workflow"] = lifecycle.name
+    log_event(session, "DOCUMENT_CREATE", owner_username, metadata, "document", doc_number)
     return document
 
 
-def add_version(session: Session, doc_number: str, content: str, created_by: str, actor_role: Role) -> DocumentVersion:
+def get_versionable_document(session: Session, doc_number: str, actor_role: Role) -> Document:
     if actor_role not in {Role.AUTHOR, Role.ADMIN}:
         raise PermissionDenied("Only Author/Admin can version a document")
     document = session.scalar(select(Document).where(Document.doc_number == doc_number))
@@ -32,36 +87,358 @@ def add_version(session: Session, doc_number: str, content: str, created_by: str
         raise DocumentError("Document not found")
     if document.locked:
         raise DocumentError("Document is locked after approval")
-    checksum = hashlib.sha256(content.encode("utf-8")).hexdigest()
-    current_max = session.scalars(select(DocumentVersion).where(DocumentVersion.document_id == document.id)).all()
-    version_no = len(current_max) + 1
-    version = DocumentVersion(
-        document_id=document.id,
-        version_no=version_no,
-        content=content,
-        checksum=checksum,
-        created_by=created_by,
+    return document
+
+
+def _insert_version(
+    session: Session,
+    document: Document,
+    checksum: str,
+    created_by: str,
+    content: str | None = None,
+    content_ref: str | None = None,
+) -> DocumentVersion:
+    for attempt in range(1, VERSION_INSERT_ATTEMPTS + 1):
+        version_no = _next_version_no(session, document.id)
+        version = DocumentVersion(
+            document_id=document.id,
+            version_no=version_no,
+            content=content,
+            content_ref=content_ref,
+            checksum=checksum,
+            created_by=created_by,
+        )
+        try:
+            with session.begin_nested():
+                session.add(version)
+            break
+        except IntegrityError as exc:
+            if attempt == VERSION_INSERT_ATTEMPTS:
+                raise DocumentError("Concurrent version conflict, retry the request") from exc
+    log_event(
+        session,
+        "VERSION_ADD",
+        created_by,
+        {"version_no": version_no, "checksum": checksum},
+        "document",
+        document.doc_number,
     )
-    session.add(version)
-    session.flush()
-    log_event(session, "VERSION_ADD", created_by, {"version_no": version_no, "checksum": checksum}, "document", doc_number)
     return version
 
 
+def add_version(session: Session, doc_number: str, content: str, created_by: str, actor_role: Role) -> DocumentVersion:
+    document = get_versionable_document(session, doc_number, actor_role)
+    encoded = content.encode("utf-8")
+    checksum = hashlib.sha256(encoded).hexdigest()
+    if blobstore.blob_store is None:
+        version = _insert_version(session, document, checksum, created_by, content=content)
+    else:
+        blobstore.blob_store.put_bytes(encoded, checksum)
+        version = _insert_version(session, document, checksum, created_by, content_ref=blobstore.blob_ref(checksum))
+    if VERSION_STORAGE_MODE == "delta":
+        _store_previous_as_delta(session, version, content)
+    index_latest_version(session, document, version, content)
+    return version
+
+
+def _store_previous_as_delta(session: Session, latest: DocumentVersion, latest_content: str) -> None:
+    """Rewrite the previous version as a reverse delta against ``latest``.
+
+    Every ``DELTA_SNAPSHOT_INTERVAL``-th version stays a full snapshot, so a
+    reconstruction never applies more than that many deltas.
+    """
+    previous_no = latest.version_no - 1
+    if previous_no < 1 or previous_no % DELTA_SNAPSHOT_INTERVAL == 0:
+        return
+    previous = session.scalar(
+        select(DocumentVersion)
+        .options(undefer(DocumentVersion.content))
+        .where(DocumentVersion.document_id == latest.document_id, DocumentVersion.version_no == previous_no)
+    )
+    if previous is None or is_delta_ref(previous.content_ref):
+        return
+    previous_content = read_version_content(previous)
+    delta = make_delta(latest_content, previous_content)
+    if len(delta) < len(previous_content):
+        previous.content = delta
+        previous.content_ref = delta_ref(latest.version_no)
+
+
+def add_version_from_blob(
+    session: Session,
+    doc_number: str,
+    checksum: str,
+    created_by: str,
+    actor_role: Role,
+) -> DocumentVersion:
+    """Register a version whose body was already streamed into the blob store."""
+    document = get_versionable_document(session, doc_number, actor_role)
+    if blobstore.blob_store is None or not blobstore.blob_store.exists(checksum):
+        raise DocumentError("Uploaded content not found in blob store")
+    version = _insert_version(session, document, checksum, created_by, content_ref=blobstore.blob_ref(checksum))
+    with blobstore.blob_store.open(checksum) as mapped:
+        searchable = str(mapped[:SEARCH_MAX_INDEXED_BYTES], "utf-8", errors="ignore")
+    index_latest_version(session, document, version, searchable)
+    return version
+
+
+def get_version(session: Session, doc_number: str, version_no: int) -> DocumentVersion:
+    version = session.scalar(
+        select(DocumentVersion)
+        .join(Document, Document.id == DocumentVersion.document_id)
+        .where(Document.doc_number == doc_number, DocumentVersion.version_no == version_no)
+    )
+    if not version:
+        raise DocumentError("Version not found")
+    return version
+
+
+def get_streamable_version(session: Session, doc_number: str, version_no: int) -> DocumentVersion:
+    """Return a detached version whose body can be streamed after the session closes."""
+    version = get_version(session, doc_number, version_no)
+    content = read_version_content(version) if is_delta_ref(version.content_ref) else version.content
+    session.expunge(version)
+    if is_delta_ref(version.content_ref):
+        version.content, version.content_ref = content, None
+    return version
+
+
+def version_content_size(version: DocumentVersion) -> int:
+    if is_delta_ref(version.content_ref):
+        return len(read_version_content(version).encode("utf-8"))
+    if version.content_ref is None:
+        return len(version.content.encode("utf-8"))
+    return _require_blob_store().path_for(blobstore.blob_checksum(version.content_ref)).stat().st_size
+
+
+def iter_version_content(
+    version: DocumentVersion,
+    start: int = 0,
+    end: int | None = None,
+    chunk_size: int = blobstore.BLOB_CHUNK_SIZE,
+) -> Iterator[bytes]:
+    """Yield the byte range ``[start, end)`` of a version body in bounded chunks."""
+    if version.content_ref is None or is_delta_ref(version.content_ref):
+        data = read_version_content(version).encode("utf-8")
+        end = len(data) if end is None else end
+        for offset in range(start, end, chunk_size):
+            yield data[offset:min(offset + chunk_size, end)]
+        return
+    with _require_blob_store().open(blobstore.blob_checksum(version.content_ref)) as mapped:
+        end = len(mapped) if end is None else end
+        for offset in range(start, end, chunk_size):
+            yield mapped[offset:min(offset + chunk_size, end)]
+
+
+def _require_blob_store() -> blobstore.BlobStore:
+    if blobstore.blob_store is None:
+        raise DocumentError("Version content is in the blob store but DOCUMENT_BLOB_DIR is not configured")
+    return blobstore.blob_store
+
+
+def read_version_content(version: DocumentVersion) -> str:
+    if is_delta_ref(version.content_ref):
+        return _reconstruct_from_deltas(version)
+    if version.content_ref is None:
+        return version.content
+    return _require_blob_store().read_text(blobstore.blob_checksum(version.content_ref))
+
+
+def _reconstruct_from_deltas(version: DocumentVersion) -> str:
+    session = object_session(version)
+    if session is None:
+        raise DocumentError("Delta-stored version must be attached to a session")
+    newer = {
+        row.version_no: row
+        for row in session.scalars(
+            select(DocumentVersion)
+            .options(undefer(DocumentVersion.content))
+            .where(
+                DocumentVersion.document_id == version.document_id,
+                DocumentVersion.version_no > version.version_no,
+                DocumentVersion.version_no <= version.version_no + DELTA_SNAPSHOT_INTERVAL,
+            )
+        )
+    }
+    deltas: list[str] = []
+    current = version
+    while is_delta_ref(current.content_ref):
+        deltas.append(current.content)
+        base_no = delta_base_version_no(current.content_ref)
+        current = newer.get(base_no) or get_version_by_number(session, version.document_id, base_no)
+    content = read_version_content(current)
+    try:
+        for delta in reversed(deltas):
+            content = apply_delta(content, delta)
+    except DeltaError as exc:
+        raise DocumentError(f"Cannot reconstruct version {version.version_no}: {exc}") from exc
+    if hashlib.sha256(content.encode("utf-8")).hexdigest() != version.checksum:
+        raise DocumentError(f"Checksum mismatch after reconstructing version {version.version_no}")
+    return content
+
+
+def get_version_by_number(session: Session, document_id: int, version_no: int) -> DocumentVersion:
+    version = session.scalar(
+        select(DocumentVersion)
+        .options(undefer(DocumentVersion.content))
+        .where(DocumentVersion.document_id == document_id, DocumentVersion.version_no == version_no)
+    )
+    if not version:
+        raise DocumentError("Version not found")
+    return version
+
+
+def migrate_content_to_blob_store(session: Session, batch_size: int = CONTENT_MIGRATION_BATCH_SIZE) -> int:
+    if blobstore.blob_store is None:
+        raise DocumentError("DOCUMENT_BLOB_DIR is not configured")
+    moved = 0
+    last_id = 0
+    while True:
+        rows = session.execute(
+            select(DocumentVersion.id, DocumentVersion.content, DocumentVersion.checksum)
+            .where(DocumentVersion.id > last_id, DocumentVersion.content_ref.is_(None))
+            .order_by(DocumentVersion.id)
+            .limit(batch_size)
+        ).all()
+        if not rows:
+            break
+        for row in rows:
+            if blobstore.blob_store.put_bytes(row.content.encode("utf-8")) != row.checksum:
+                raise DocumentError(f"Checksum mismatch for document version {row.id}")
+        session.execute(
+            update(DocumentVersion),
+            [{"id": row.id, "content": None, "content_ref": blobstore.blob_ref(row.checksum)} for row in rows],
+        )
+        session.flush()
+        moved += len(rows)
+        last_id = rows[-1].id
+    return moved
+
+
+def retry_on_conflict(
+    session_scope: Callable,
+    operation: Callable[[Session], T],
+    attempts: int = CONFLICT_RETRY_ATTEMPTS,
+) -> T:
+    """Run ``operation`` in a fresh ``session_scope()`` transaction, retrying on ``ConcurrentUpdateError``.
+
+    Only for idempotent operations: each attempt re-reads the documents, so a
+    retry re-validates the change against whatever the winner committed.
+    """
+    attempt = 1
+    while True:
+        try:
+            with session_scope() as session:
+                return operation(session)
+        except ConcurrentUpdateError:
+            if attempt >= attempts:
+                raise
+            time.sleep(random.uniform(0, CONFLICT_RETRY_BACKOFF_SECONDS * 2**attempt))
+            attempt += 1
+
+
 def transition_document(session: Session, doc_number: str, target_state: DocumentState, actor: str, actor_role: Role) -> Document:
     document = session.scalar(select(Document).where(Document.doc_number == doc_number))
     if not document:
         raise DocumentError("Document not found")
-    if document.locked and target_state != DocumentState.ARCHIVED:
+    transition = workflow_registry.get(document.workflow).authorize(document.state, target_state, actor_role)
+    if document.locked and not transition.allow_locked:
         raise DocumentError("Document is locked")
-    if target_state == DocumentState.REVIEW and actor_role not in {Role.AUTHOR, Role.ADMIN}:
-        raise PermissionDenied("Only Author/Admin can submit to review")
-    if target_state == DocumentState.APPROVED and actor_role not in {Role.APPROVER, Role.ADMIN}:
-        raise PermissionDenied("Only Approver/Admin can approve")
-    ensure_transition_allowed(document.state, target_state)
     old_state = document.state
     document.state = target_state
-    if target_state == DocumentState.APPROVED:
+    if transition.lock:
         document.locked = True
+    try:
+        session.flush([document])
+    except StaleDataError as exc:
+        raise ConcurrentUpdateError(f"Document {doc_number} was changed by another request") from exc
     log_event(session, "STATE_CHANGE", actor, {"from": old_state.value, "to": target_state.value}, "document", doc_number)
     return document
+
+
+def transition_documents_bulk(
+    session: Session, doc_numbers: list[str], target_state: DocumentState, actor: str, actor_role: Role
+) -> BulkTransitionResult:
+    """Move every eligible document to ``target_state`` with conditional UPDATEs instead of per-document loads.
+
+    The compiled workflow tables give, once per call, the source states (and
+    the workflows they belong to) from which ``actor_role`` may reach
+    ``target_state``. Each group matched by some document of a chunk gets
+    one ``UPDATE ... WHERE state = source AND workflow IN (...) AND
+    doc_number IN (...)`` for that chunk, so rows changed concurrently are
+    simply not matched; only the rows actually updated are audited. Every other document is reported in ``skipped``
+    with the reason.
+
+    Approval (and any other transition that locks the document) needs an
+    electronic signature, so it is rejected here; use
+    ``sign_and_approve_batch`` instead.
+    """
+    if target_state == DocumentState.APPROVED:
+        raise WorkflowError("Approval requires an electronic signature, use sign-approve-batch")
+    groups = workflow_registry.bulk_sources(target_state, actor_role)
+    if any(group.lock for group in groups):
+        raise WorkflowError(f"Moving to {target_state.value} locks the document, use sign-approve-batch")
+    doc_numbers = list(dict.fromkeys(doc_numbers))
+    result = BulkTransitionResult()
+    events = []
+    for start in range(0, len(doc_numbers), BULK_TRANSITION_CHUNK_SIZE):
+        chunk = doc_numbers[start:start + BULK_TRANSITION_CHUNK_SIZE]
+        present = set(
+            session.execute(
+                select(Document.workflow, Document.state).where(Document.doc_number.in_(chunk)).distinct()
+            ).all()
+        )
+        for group in groups:
+            # Only groups some document in the chunk can match get an UPDATE.
+            workflows = [workflow for workflow in group.workflows if (workflow, group.source) in present]
+            if not workflows:
+                continue
+            query = update(Document).where(
+                Document.doc_number.in_(chunk), Document.state == group.source, Document.workflow.in_(workflows)
+            )
+            if not group.allow_locked:
+                query = query.where(Document.locked.is_(False))
+            values = {"state": target_state, "row_version": Document.row_version + 1}
+            if group.lock:
+                values["locked"] = True
+            changed = session.scalars(query.values(**values).returning(Document.doc_number)).all()
+            transition = {"from": group.source.value, "to": target_state.value}
+            events += [
+                {
+                    "event_type": "STATE_CHANGE",
+                    "actor": actor,
+                    "metadata": transition,
+                    "record_type": "document",
+                    "record_id": doc_number,
+                }
+                for doc_number in changed
+            ]
+            result.changed += changed
+    changed = set(result.changed)
+    unchanged = [doc_number for doc_number in doc_numbers if doc_number not in changed]
+    for start in range(0, len(unchanged), BULK_TRANSITION_CHUNK_SIZE):
+        chunk = unchanged[start:start + BULK_TRANSITION_CHUNK_SIZE]
+        found = {
+            row.doc_number: row
+            for row in session.execute(
+                select(Document.doc_number, Document.workflow, Document.state, Document.locked).where(
+                    Document.doc_number.in_(chunk)
+                )
+            )
+        }
+        for doc_number in chunk:
+            row = found.get(doc_number)
+            if row is None:
+                result.skipped[doc_number] = "Document not found"
+                continue
+            try:
+                transition = workflow_registry.get(row.workflow).authorize(row.state, target_state, actor_role)
+            except (PermissionDenied, WorkflowError) as exc:
+                result.skipped[doc_number] = str(exc)
+                continue
+            if row.locked and not transition.allow_locked:
+                result.skipped[doc_number] = "Document is locked"
+            else:
+                result.skipped[doc_number] = "Document changed concurrently"
+    log_events_bulk(session, events)
+    return result
@@ -3,7 +3,7 @@ from __future__ import annotations
 from datetime import datetime
 
 
-from sqlalchemy import ForeignKey, Integer, String
+from sqlalchemy import ForeignKey, Index, Integer, String
 from sqlalchemy.orm import Mapped, mapped_column
 
 from backend.db.base import Base
@@ -12,6 +12,11 @@ from backend.db.types import UTCDateTime, utcnow
 
 class ElectronicSignature(Base):
     __tablename__ = "electronic_signatures"
+    __table_args__ = (
+        Index("ix_electronic_signatures_signer_id", "signer_username", "id"),
+        Index("ix_electronic_signatures_document_id_id", "document_id", "id"),
+        Index("ix_electronic_signatures_created_at_id", "created_at", "id"),
+    )
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True)
     document_id: Mapped[int] = mapped_column(ForeignKey("documents.id"), nullable=False)
@@ -1,26 +1,60 @@
 from __future__ import annotations
 
+from dataclasses import dataclass
 import hashlib
 
-from sqlalchemy import select
+from sqlalchemy import func, insert, select, update
 from sqlalchemy.orm import Session
 
-from backend.audit.service import log_event
+from backend.audit.service import log_event, log_events_bulk
 from backend.auth.models import Role
 from backend.auth.rbac import PermissionDenied
 from backend.documents.models import Document, DocumentVersion
-from backend.documents.service import transition_document
+from backend.documents.service import ConcurrentUpdateError, transition_document
 from backend.signatures.models import ElectronicSignature
-from backend.workflow.state_machine import DocumentState
+from backend.workflow.engine import Transition, workflow_registry
+from backend.workflow.state_machine import DocumentState, WorkflowError
+
+MAX_SIGNATURE_BATCH = 500
 
 
 class SignatureError(Exception):
     pass
 
 
+class BatchSignatureError(SignatureError):
+    def __init__(self, results: list[SignatureResult]):
+        self.results = results
+        failed = ", ".join(f"{result.doc_number}: {result.error}" for result in results if result.error)
+        super().__init__(f"Batch signature rejected ({failed})")
+
+
+@dataclass(frozen=True, slots=True)
+class SignatureResult:
+    doc_number: str
+    signature_id: int | None = None
+    version_id: int | None = None
+    signature_hash: str | None = None
+    error: str | None = None
+
+    @property
+    def signed(self) -> bool:
+        return self.error is None
+
+
+def compute_signature_hash(doc_number: str, version_id: int, signer_username: str, meaning: str) -> str:
+    return hashlib.sha256(f"{doc_number}|{version_id}|{signer_username}|{meaning}".encode("utf-8")).hexdigest()
+
+
+def _ensure_can_approve(actor_role: Role) -> None:
+    try:
+        workflow_registry.bulk_sources(DocumentState.APPROVED, actor_role)
+    except PermissionDenied as exc:
+        raise PermissionDenied("Only Approver/Admin can sign") from exc
+
+
 def sign_and_approve(session: Session, doc_number: str, signer_username: str, meaning: str, actor_role: Role) -> ElectronicSignature:
-    if actor_role not in {Role.APPROVER, Role.ADMIN}:
-        raise PermissionDenied("Only Approver/Admin can sign")
+    _ensure_can_approve(actor_role)
     if not meaning.strip():
         raise SignatureError("Signature meaning is required")
     document = session.scalar(select(Document).where(Document.doc_number == doc_number))
@@ -34,9 +68,7 @@ def sign_and_approve(session: Session, doc_number: str, signer_username: str, me
     if not latest_version:
         raise SignatureError("No version available for signature")
 
-    signature_hash = hashlib.sha256(
-        f"{doc_number}|{latest_version.id}|{signer_username}|{meaning}".encode("utf-8")
-    ).hexdigest()
+    signature_hash = compute_signature_hash(doc_number, latest_version.id, signer_username, meaning)
     signature = ElectronicSignature(
         document_id=document.id,
         version_id=latest_version.id,
@@ -57,3 +89,153 @@ def sign_and_approve(session: Session, doc_number: str, signer_username: str, me
         doc_number,
     )
     return signature
+
+
+def _signable_documents(
+    session: Session, doc_numbers: list[str], actor_role: Role
+) -> tuple[dict[str, int], dict[str, int], dict[str, Transition], dict[str, str]]:
+    """Ids, latest version ids and approval transitions for ``doc_numbers``, plus why any cannot be approved."""
+    documents = {
+        row.doc_number: row
+        for row in session.execute(
+            select(Document.id, Document.doc_number, Document.workflow, Document.state, Document.locked).where(
+                Document.doc_number.in_(doc_numbers)
+            )
+        )
+    }
+    latest = (
+        select(DocumentVersion.document_id, func.max(DocumentVersion.version_no).label("version_no"))
+        .where(DocumentVersion.document_id.in_([row.id for row in documents.values()]))
+        .group_by(DocumentVersion.document_id)
+        .subquery()
+    )
+    versions = dict(
+        session.execute(
+            select(DocumentVersion.document_id, DocumentVersion.id).join(
+                latest,
+                (DocumentVersion.document_id == latest.c.document_id)
+                & (DocumentVersion.version_no == latest.c.version_no),
+            )
+        ).all()
+    )
+    document_ids, version_ids, transitions, errors = {}, {}, {}, {}
+    for doc_number in doc_numbers:
+        row = documents.get(doc_number)
+        try:
+            if row is None:
+                raise SignatureError("Document not found")
+            if row.id not in versions:
+                raise SignatureError("No version available for signature")
+            transition = workflow_registry.get(row.workflow).authorize(row.state, DocumentState.APPROVED, actor_role)
+            if row.locked and not transition.allow_locked:
+                raise SignatureError("Document is locked")
+        except (SignatureError, WorkflowError, PermissionDenied) as exc:
+            errors[doc_number] = str(exc)
+            continue
+        document_ids[doc_number] = row.id
+        version_ids[doc_number] = versions[row.id]
+        transitions[doc_number] = transition
+    return document_ids, version_ids, transitions, errors
+
+
+def sign_and_approve_batch(
+    session: Session,
+    doc_numbers: list[str],
+    signer_username: str,
+    meaning: str,
+    actor_role: Role,
+    *,
+    all_or_nothing: bool = True,
+) -> list[SignatureResult]:
+    """Sign and approve the latest version of each document under one (already re-checked) credential.
+
+    Documents and their latest versions are loaded with two set-based queries;
+    signatures, the state change and the audit events are written in bulk.
+    Each signature is bound to its own document's latest version. With
+    ``all_or_nothing`` any unsignable document rejects the whole batch with
+    ``BatchSignatureError``; otherwise the signable ones are signed and the
+    rest are reported in their result's ``error``.
+    """
+    _ensure_can_approve(actor_role)
+    if not meaning.strip():
+        raise SignatureError("Signature meaning is required")
+    doc_numbers = list(dict.fromkeys(doc_numbers))
+    if not doc_numbers:
+        return []
+    if len(doc_numbers) > MAX_SIGNATURE_BATCH:
+        raise SignatureError(f"At most {MAX_SIGNATURE_BATCH} documents can be signed in one batch")
+
+    document_ids, version_ids, transitions, errors = _signable_documents(session, doc_numbers, actor_role)
+    if errors and all_or_nothing:
+        raise BatchSignatureError([SignatureResult(number, error=errors.get(number)) for number in doc_numbers])
+    signable = [doc_number for doc_number in doc_numbers if doc_number not in errors]
+    if not signable:
+        return [SignatureResult(doc_number, error=errors[doc_number]) for doc_number in doc_numbers]
+
+    hashes = {
+        doc_number: compute_signature_hash(doc_number, version_ids[doc_number], signer_username, meaning)
+        for doc_number in signable
+    }
+    by_transition: dict[Transition, list[int]] = {}
+    for doc_number in signable:
+        by_transition.setdefault(transitions[doc_number], []).append(document_ids[doc_number])
+    approved = 0
+    for transition, ids in by_transition.items():
+        query = update(Document).where(Document.id.in_(ids), Document.state == transition.source)
+        if not transition.allow_locked:
+            query = query.where(Document.locked.is_(False))
+        values = {"state": DocumentState.APPROVED, "row_version": Document.row_version + 1}
+        if transition.lock:
+            values["locked"] = True
+        approved += session.execute(query.values(**values)).rowcount
+    if approved != len(signable):
+        raise ConcurrentUpdateError("Documents changed while signing, retry the batch")
+    signature_ids = dict(
+        session.execute(
+            insert(ElectronicSignature).returning(ElectronicSignature.version_id, ElectronicSignature.id),
+            [
+                {
+                    "document_id": document_ids[doc_number],
+                    "version_id": version_ids[doc_number],
+                    "signer_username": signer_username,
+                    "meaning": meaning,
+                    "signature_hash": hashes[doc_number],
+                }
+                for doc_number in signable
+            ],
+        ).all()
+    )
+    log_events_bulk(
+        session,
+        [
+            evt
+            for doc_number in signable
+            for evt in (
+                {
+                    "event_type": "STATE_CHANGE",
+                    "actor": signer_username,
+                    "metadata": {"from": transitions[doc_number].source.value, "to": DocumentState.APPROVED.value},
+                    "record_type": "document",
+                    "record_id": doc_number,
+                },
+                {
+                    "event_type": "DOCUMENT_SIGNED",
+                    "actor": signer_username,
+                    "metadata": {"signature_hash": hashes[doc_number], "meaning": meaning},
+                    "record_type": "document",
+                    "record_id": doc_number,
+                },
+            )
+        ],
+    )
+    return [
+        SignatureResult(
+            doc_number,
+            signature_id=signature_ids[version_ids[doc_number]],
+            version_id=version_ids[doc_number],
+            signature_hash=hashes[doc_number],
+        )
+        if doc_number not in errors
+        else SignatureResult(doc_number, error=errors[doc_number])
+        for doc_number in doc_numbers
+    ]
@@ -0,0 +1,175 @@
+"""Bulk re-verification of electronic signature hashes.
+
+Usage:
+    python -m backend.signatures.verification [--signer USER] [--doc-number N] [--since ISO] [--until ISO]
+                                              [--batch-size N] [--workers N]
+
+Signatures are streamed joined to their documents in ``id`` order from one
+server-side cursor. Each batch of rows is re-hashed in a worker process while
+the next batch is read, and every ``signature_hash`` that no longer matches
+``doc_number|version_id|signer|meaning`` is reported, one JSON line per
+mismatch. The process pool is for this CLI; the API route verifies one
+bounded page of signatures per request in-process.
+"""
+
+from __future__ import annotations
+
+import argparse
+from collections import deque
+from collections.abc import Iterator
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from datetime import datetime
+import json
+import os
+import time
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from backend.db.session import SessionLocal
+from backend.documents.models import Document
+from backend.signatures.models import ElectronicSignature
+from backend.signatures.service import compute_signature_hash
+
+SIGNATURE_VERIFY_BATCH_SIZE = 5000
+SIGNATURE_VERIFY_PAGE_SIZE = 10_000
+SIGNATURE_VERIFY_WORKERS = int(os.getenv("SIGNATURE_VERIFY_WORKERS", str(os.cpu_count() or 1)))
+
+
+@dataclass(frozen=True, slots=True)
+class SignatureFilter:
+    signer: str | None = None
+    doc_number: str | None = None
+    signed_from: datetime | None = None
+    signed_to: datetime | None = None
+
+
+@dataclass(slots=True)
+class SignatureVerification:
+    checked: int = 0
+    mismatches: list[dict] = field(default_factory=list)
+    seconds: float = 0.0
+    last_id: int | None = None
+
+    @property
+    def ok(self) -> bool:
+        return not self.mismatches
+
+
+def check_signature_rows(rows: list[tuple]) -> list[dict]:
+    """Worker: ``rows`` are ``(id, doc_number, version_id, signer, meaning, signature_hash)``."""
+    return [
+        {
+            "record_type": "electronic_signature",
+            "id": signature_id,
+            "doc_number": doc_number,
+            "version_id": version_id,
+            "signer_username": signer,
+            "reason": "signature hash mismatch",
+        }
+        for signature_id, doc_number, version_id, signer, meaning, signature_hash in rows
+        if compute_signature_hash(doc_number, version_id, signer, meaning) != signature_hash
+    ]
+
+
+def signature_query(filters: SignatureFilter):
+    """Hashable signature columns in ``id`` order, served by the signer, document or created_at index."""
+    query = select(
+        ElectronicSignature.id,
+        Document.doc_number,
+        ElectronicSignature.version_id,
+        ElectronicSignature.signer_username,
+        ElectronicSignature.meaning,
+        ElectronicSignature.signature_hash,
+    ).join(Document, Document.id == ElectronicSignature.document_id)
+    if filters.signer is not None:
+        query = query.where(ElectronicSignature.signer_username == filters.signer)
+    if filters.doc_number is not None:
+        query = query.where(Document.doc_number == filters.doc_number)
+    if filters.signed_from is not None:
+        query = query.where(ElectronicSignature.created_at >= filters.signed_from)
+    if filters.signed_to is not None:
+        query = query.where(ElectronicSignature.created_at < filters.signed_to)
+    return query.order_by(ElectronicSignature.id)
+
+
+def iter_signature_batches(
+    session: Session,
+    filters: SignatureFilter,
+    batch_size: int = SIGNATURE_VERIFY_BATCH_SIZE,
+    after_id: int | None = None,
+    limit: int | None = None,
+) -> Iterator[list[tuple]]:
+    query = signature_query(filters)
+    if after_id is not None:
+        query = query.where(ElectronicSignature.id > after_id)
+    if limit is not None:
+        query = query.limit(limit)
+    result = session.execute(query.execution_options(yield_per=batch_size))
+    for partition in result.partitions():
+        yield [tuple(row) for row in partition]
+
+
+def verify_signatures(
+    session: Session,
+    filters: SignatureFilter = SignatureFilter(),
+    batch_size: int = SIGNATURE_VERIFY_BATCH_SIZE,
+    workers: int = SIGNATURE_VERIFY_WORKERS,
+    *,
+    after_id: int | None = None,
+    limit: int | None = None,
+) -> SignatureVerification:
+    """Recompute the hash of every signature matching ``filters``; mismatches come back in ``id`` order.
+
+    At most two batches per worker are in flight, so memory stays bounded
+    however many signatures are checked. ``after_id``/``limit`` verify one
+    page; ``last_id`` of the result continues from there.
+    """
+    started = time.perf_counter()
+    verification = SignatureVerification()
+    batches = iter_signature_batches(session, filters, batch_size, after_id, limit)
+    if workers <= 1:
+        for rows in batches:
+            verification.checked += len(rows)
+            verification.last_id = rows[-1][0]
+            verification.mismatches += check_signature_rows(rows)
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            pending = deque()
+            for rows in batches:
+                verification.checked += len(rows)
+                verification.last_id = rows[-1][0]
+                pending.append(executor.submit(check_signature_rows, rows))
+                if len(pending) >= 2 * workers:
+                    verification.mismatches += pending.popleft().result()
+            while pending:
+                verification.mismatches += pending.popleft().result()
+    verification.seconds = time.perf_counter() - started
+    return verification
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--signer")
+    parser.add_argument("--doc-number")
+    parser.add_argument("--since", type=datetime.fromisoformat)
+    parser.add_argument("--until", type=datetime.fromisoformat)
+    parser.add_argument("--batch-size", type=int, default=SIGNATURE_VERIFY_BATCH_SIZE)
+    parser.add_argument("--workers", type=int, default=SIGNATURE_VERIFY_WORKERS)
+    args = parser.parse_args(argv)
+    filters = SignatureFilter(args.signer, args.doc_number, args.since, args.until)
+    with SessionLocal() as session:
+        verification = verify_signatures(session, filters, args.batch_size, args.workers)
+    for mismatch in verification.mismatches:
+        print(json.dumps(mismatch))
+    print(
+        f"Verified {verification.checked} signatures in {verification.seconds:.1f}s: "
+        f"{len(verification.mismatches)} mismatches"
+    )
+    if not verification.ok:
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,158 @@
+"""Table-driven document lifecycles.
+
+Workflow definitions (states, transitions, role guards, lock behaviour) are
+read from ``WORKFLOW_CONFIG`` (JSON, defaulting to ``workflows.json`` next to
+this module) once, at import, and compiled into dictionaries: a guard check
+is a couple of lookups, whatever the lifecycle, and nothing is re-parsed per
+request. Each document names the workflow it follows.
+
+A transition without ``roles`` may be performed by any role. ``lock`` locks
+the document on entering the target state; ``allow_locked`` lets a locked
+document take the transition.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+import json
+import os
+from pathlib import Path
+
+from backend.auth.models import Role
+from backend.auth.rbac import PermissionDenied
+from backend.workflow.state_machine import DocumentState, WorkflowError
+
+WORKFLOW_CONFIG = os.getenv("WORKFLOW_CONFIG", str(Path(__file__).with_name("workflows.json")))
+
+
+@dataclass(frozen=True, slots=True)
+class Transition:
+    source: DocumentState
+    target: DocumentState
+    roles: frozenset[Role] | None = None
+    lock: bool = False
+    allow_locked: bool = False
+
+    def permits(self, role: Role) -> bool:
+        return self.roles is None or role in self.roles
+
+
+@dataclass(frozen=True, slots=True)
+class BulkSource:
+    """Documents in ``source`` under one of ``workflows`` that a role may move to a given target together."""
+
+    source: DocumentState
+    workflows: tuple[str, ...]
+    lock: bool
+    allow_locked: bool
+
+
+class Workflow:
+    __slots__ = ("name", "initial", "_transitions", "_targets")
+
+    def __init__(self, name: str, initial: DocumentState, transitions: list[Transition]):
+        self.name = name
+        self.initial = initial
+        self._transitions: dict[tuple[DocumentState, DocumentState], Transition] = {}
+        self._targets: dict[DocumentState, frozenset[DocumentState]] = {}
+        for transition in transitions:
+            key = (transition.source, transition.target)
+            if key in self._transitions:
+                source, target = transition.source.value, transition.target.value
+                raise WorkflowError(f"Workflow {name} defines {source} -> {target} twice")
+            self._transitions[key] = transition
+        for source, target in self._transitions:
+            self._targets[source] = self._targets.get(source, frozenset()) | {target}
+
+    @property
+    def transitions(self) -> tuple[Transition, ...]:
+        return tuple(self._transitions.values())
+
+    def targets(self, source: DocumentState) -> frozenset[DocumentState]:
+        return self._targets.get(source, frozenset())
+
+    def transition(self, source: DocumentState, target: DocumentState) -> Transition:
+        transition = self._transitions.get((source, target))
+        if transition is None:
+            raise WorkflowError(f"Transition not allowed: {source.value} -> {target.value}")
+        return transition
+
+    def authorize(self, source: DocumentState, target: DocumentState, role: Role) -> Transition:
+        """The transition ``source -> target``, if it exists and ``role`` may take it."""
+        transition = self.transition(source, target)
+        if not transition.permits(role):
+            raise PermissionDenied(f"Role {role.value} cannot move a document from {source.value} to {target.value}")
+        return transition
+
+
+class WorkflowRegistry:
+    __slots__ = ("default", "_workflows", "_bulk_sources", "_reachable")
+
+    def __init__(self, workflows: dict[str, Workflow], default: str):
+        if default not in workflows:
+            raise WorkflowError(f"Default workflow {default} is not defined")
+        self.default = default
+        self._workflows = workflows
+        groups: dict[tuple[DocumentState, Role], dict[tuple, list[str]]] = {}
+        for workflow in workflows.values():
+            for transition in workflow.transitions:
+                for role in Role:
+                    if transition.permits(role):
+                        key = (transition.source, transition.lock, transition.allow_locked)
+                        groups.setdefault((transition.target, role), {}).setdefault(key, []).append(workflow.name)
+        self._bulk_sources = {
+            target_role: tuple(
+                BulkSource(source, tuple(names), lock, allow_locked)
+                for (source, lock, allow_locked), names in by_source.items()
+            )
+            for target_role, by_source in groups.items()
+        }
+        self._reachable = frozenset(t.target for w in workflows.values() for t in w.transitions)
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._workflows
+
+    def get(self, name: str) -> Workflow:
+        workflow = self._workflows.get(name)
+        if workflow is None:
+            raise WorkflowError(f"Unknown workflow: {name}")
+        return workflow
+
+    def bulk_sources(self, target: DocumentState, role: Role) -> tuple[BulkSource, ...]:
+        """Every (source state, workflows) group from which ``role`` may move documents to ``target``."""
+        sources = self._bulk_sources.get((target, role))
+        if sources:
+            return sources
+        if target in self._reachable:
+            raise PermissionDenied(f"Role {role.value} cannot move documents to {target.value}")
+        raise WorkflowError(f"No state can transition to {target.value}")
+
+
+def _compile(name: str, definition: dict) -> Workflow:
+    try:
+        transitions = [
+            Transition(
+                DocumentState[item["from"]],
+                DocumentState[item["to"]],
+                frozenset(Role[role] for role in item["roles"]) if "roles" in item else None,
+                bool(item.get("lock", False)),
+                bool(item.get("allow_locked", False)),
+            )
+            for item in definition["transitions"]
+        ]
+        initial = DocumentState[definition.get("initial", "DRAFT")]
+    except KeyError as exc:
+        raise WorkflowError(f"Workflow {name}: unknown or missing {exc}") from exc
+    return Workflow(name, initial, transitions)
+
+
+def compile_workflows(config: dict) -> WorkflowRegistry:
+    workflows = {name: _compile(name, definition) for name, definition in config["workflows"].items()}
+    return WorkflowRegistry(workflows, config.get("default", next(iter(workflows))))
+
+
+def load_workflows(path: str | Path = WORKFLOW_CONFIG) -> WorkflowRegistry:
+    return compile_workflows(json.loads(Path(path).read_text(encoding="utf-8")))
+
+
+workflow_registry = load_workflows()
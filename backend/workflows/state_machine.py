@@ -1,17 +1,26 @@
-"""Document lifecycle transition guards for EDMS workflows."""
+"""Document lifecycle transition guards for EDMS workflows.
+
+The lifecycle is the ``controlled`` workflow compiled by
+``backend.workflow.engine``; this module only maps it onto the domain model's
+states, so both layers enforce the same table.
+"""
 
 from __future__ import annotations
 
 from backend.domain.models import DocumentState
+from backend.workflow.engine import workflow_registry
+from backend.workflow.state_machine import DocumentState as WorkflowState
 
+_WORKFLOW_STATES: dict[DocumentState, WorkflowState] = {
+    state: WorkflowState.REVIEW if state is DocumentState.IN_REVIEW else WorkflowState[state.name]
+    for state in DocumentState
+}
+_DOMAIN_STATES = {workflow_state: state for state, workflow_state in _WORKFLOW_STATES.items()}
+_LIFECYCLE = workflow_registry.get("controlled")
 
 ALLOWED_TRANSITIONS: dict[DocumentState, set[DocumentState]] = {
-    DocumentState.DRAFT: {DocumentState.IN_REVIEW},
-    DocumentState.IN_REVIEW: {DocumentState.APPROVED, DocumentState.REJECTED},
-    DocumentState.REJECTED: {DocumentState.DRAFT},
-    DocumentState.APPROVED: {DocumentState.EFFECTIVE},
-    DocumentState.EFFECTIVE: {DocumentState.ARCHIVED},
-    DocumentState.ARCHIVED: set(),
+    state: {_DOMAIN_STATES[target] for target in _LIFECYCLE.targets(_WORKFLOW_STATES[state])}
+    for state in DocumentState
 }
 
 
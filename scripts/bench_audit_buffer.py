@@ -0,0 +1,72 @@
+"""SQL statements issued per request by the document routes, with immediate vs buffered audit writes.
+
+Each request is replayed as its route runs it: one session, one commit.
+
+Usage: PYTHONPATH=. python scripts/bench_audit_buffer.py
+"""
+
+from __future__ import annotations
+
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+
+from backend.audit import service as audit_service
+from backend.auth.models import Role
+from backend.auth.service import complete_login, create_user, hash_password
+from backend.db.base import Base
+from backend.documents.service import add_version, create_document, transition_document
+from backend.signatures.service import sign_and_approve
+from backend.workflow.state_machine import DocumentState
+
+PASSWORD_HASH = hash_password("ComplexPass123")
+
+
+def _requests(doc_number: str) -> list[tuple[str, object]]:
+    return [
+        ("POST /users", lambda s: create_user(s, f"author-{doc_number}", "", Role.AUTHOR, password_hash=PASSWORD_HASH)),
+        ("POST /auth/login", lambda s: complete_login(s, f"author-{doc_number}", True)),
+        ("POST /documents", lambda s: create_document(s, doc_number, "SOP", "author1")),
+        ("POST /documents/{n}/versions", lambda s: add_version(s, doc_number, "v1 body\n", "author1", Role.AUTHOR)),
+        (
+            "POST /documents/{n}/submit-review",
+            lambda s: transition_document(s, doc_number, DocumentState.REVIEW, "author1", Role.AUTHOR),
+        ),
+        (
+            "POST /documents/{n}/sign-approve",
+            lambda s: sign_and_approve(s, doc_number, "approver1", "QA Approval", Role.APPROVER),
+        ),
+    ]
+
+
+def _count(mode: str, rounds: int = 20) -> dict[str, float]:
+    audit_service.AUDIT_WRITE_MODE = mode
+    engine = create_engine("sqlite+pysqlite:///:memory:", future=True)
+    Base.metadata.create_all(engine)
+    session_factory = sessionmaker(bind=engine, future=True)
+    statements = 0
+
+    def count(*_args) -> None:
+        nonlocal statements
+        statements += 1
+
+    event.listen(engine, "before_cursor_execute", count)
+    totals: dict[str, int] = {}
+    for i in range(rounds):
+        for route, handler in _requests(f"DOC-{i}"):
+            statements = 0
+            with session_factory.begin() as session:
+                handler(session)
+            totals[route] = totals.get(route, 0) + statements
+    return {route: total / rounds for route, total in totals.items()}
+
+
+def main() -> None:
+    immediate = _count("immediate")
+    buffered = _count("buffered")
+    print(f"{'route':<36}{'immediate':>10}{'buffered':>10}")
+    for route in immediate:
+        print(f"{route:<36}{immediate[route]:>10.1f}{buffered[route]:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
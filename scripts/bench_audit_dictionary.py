@@ -0,0 +1,138 @@
+"""Bytes per audit event, table and indexes, with string columns vs dictionary-encoded terms.
+
+A synthetic trail (30 event types, 200 actors, 6 record types) is written to
+two SQLite files: the previous layout with ``event_type``/``actor``/
+``record_type`` as strings, and the current one with ``audit_terms`` ids.
+Sizes come from SQLite's ``dbstat`` and grow linearly with the event count,
+so the 50M-event figures are extrapolated from the sample.
+
+Usage: PYTHONPATH=. python scripts/bench_audit_dictionary.py [events]
+"""
+
+from __future__ import annotations
+
+from datetime import datetime, timedelta, timezone
+import hashlib
+import os
+import random
+import sys
+import tempfile
+
+from sqlalchemy import Column, Index, Integer, MetaData, String, Table, create_engine, insert, text
+
+from backend.audit.models import AuditEvent, AuditTerm
+from backend.db.base import Base
+from backend.db.types import CompressedJSON, UTCDateTime
+
+TARGET_EVENTS = 50_000_000
+BATCH_SIZE = 10_000
+EVENT_TYPES = [f"DOCUMENT_{verb}" for verb in ("CREATE", "VERSION", "REVIEW", "APPROVE", "EFFECTIVE", "OBSOLETE")] + [
+    f"{area}_{verb}" for area in ("LOGIN", "SIGNATURE", "PRINT", "USER") for verb in ("SUCCESS", "FAILURE", "LOCKED")
+] + [f"SYSTEM_EVENT_{i}" for i in range(12)]
+ACTORS = [f"user.{i:03d}@site-{i % 7}.example.com" for i in range(200)]
+RECORD_TYPES = ["document", "document_version", "signature", "user", "print_job", "system"]
+
+legacy_metadata = MetaData()
+legacy_events = Table(
+    "audit_events",
+    legacy_metadata,
+    Column("id", Integer, primary_key=True),
+    Column("event_type", String(100), nullable=False),
+    Column("actor", String(100), nullable=False),
+    Column("record_type", String(100), nullable=False),
+    Column("record_id", String(100), nullable=False),
+    Column("metadata", CompressedJSON(), nullable=False),
+    Column("created_at", UTCDateTime(), nullable=False),
+    Column("sequence", Integer, unique=True, nullable=False),
+    Column("prev_hash", String(64), nullable=False),
+    Column("event_hash", String(64), nullable=False),
+    Index("ix_audit_events_record_type_record_id_id", "record_type", "record_id", "id"),
+    Index("ix_audit_events_actor_id", "actor", "id"),
+    Index("ix_audit_events_created_at_id", "created_at", "id"),
+)
+
+
+def _events(count: int):
+    rng = random.Random(42)
+    started = datetime(2024, 1, 1, tzinfo=timezone.utc)
+    prev_hash = "0" * 64
+    for i in range(1, count + 1):
+        event_hash = hashlib.sha256(f"{prev_hash}{i}".encode()).hexdigest()
+        yield {
+            "event_type": rng.choice(EVENT_TYPES),
+            "actor": rng.choice(ACTORS),
+            "record_type": rng.choice(RECORD_TYPES),
+            "record_id": f"DOC-{rng.randrange(20_000):05d}",
+            "metadata": {"state": "REVIEW"},
+            "created_at": started + timedelta(seconds=i),
+            "sequence": i,
+            "prev_hash": prev_hash,
+            "event_hash": event_hash,
+        }
+        prev_hash = event_hash
+
+
+def _sizes(engine) -> tuple[int, int]:
+    with engine.connect() as conn:
+        pages = conn.execute(text("SELECT name, SUM(pgsize) FROM dbstat GROUP BY name")).all()
+    table = sum(size for name, size in pages if name in ("audit_events", "audit_terms"))
+    indexes = sum(size for name, size in pages if name.startswith(("ix_audit_events", "sqlite_autoindex_audit")))
+    return table, indexes
+
+
+def _fill(engine, table, rows, encode=None) -> None:
+    with engine.begin() as conn:
+        batch = []
+        for row in rows:
+            if encode:
+                row = encode(row)
+            batch.append(row)
+            if len(batch) >= BATCH_SIZE:
+                conn.execute(insert(table), batch)
+                batch = []
+        if batch:
+            conn.execute(insert(table), batch)
+
+
+def _legacy(path: str, count: int) -> tuple[int, int]:
+    engine = create_engine(f"sqlite+pysqlite:///{path}", future=True)
+    legacy_metadata.create_all(engine)
+    _fill(engine, legacy_events, _events(count))
+    return _sizes(engine)
+
+
+def _dictionary(path: str, count: int) -> tuple[int, int]:
+    engine = create_engine(f"sqlite+pysqlite:///{path}", future=True)
+    Base.metadata.create_all(engine, tables=[AuditTerm.__table__, AuditEvent.__table__])
+    terms = [("event_type", v) for v in EVENT_TYPES] + [("actor", v) for v in ACTORS]
+    terms += [("record_type", v) for v in RECORD_TYPES]
+    ids = {term: term_id for term_id, term in enumerate(terms, start=1)}
+    with engine.begin() as conn:
+        conn.execute(insert(AuditTerm.__table__), [{"id": i, "kind": k, "value": v} for (k, v), i in ids.items()])
+
+    def encode(row: dict) -> dict:
+        for kind in ("event_type", "actor", "record_type"):
+            row[f"{kind}_id"] = ids[(kind, row.pop(kind))]
+        return row
+
+    _fill(engine, AuditEvent.__table__, _events(count), encode)
+    return _sizes(engine)
+
+
+def main() -> None:
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 200_000
+    with tempfile.TemporaryDirectory() as tmp:
+        legacy = _legacy(os.path.join(tmp, "legacy.db"), count)
+        encoded = _dictionary(os.path.join(tmp, "dictionary.db"), count)
+    print(f"{count} events; 50M figures extrapolated linearly")
+    print(f"{'layout':<12}{'table B/evt':>12}{'index B/evt':>12}{'table @50M':>14}{'indexes @50M':>14}")
+    for name, (table, indexes) in (("strings", legacy), ("dictionary", encoded)):
+        scale = TARGET_EVENTS / count / 2**30
+        print(
+            f"{name:<12}{table / count:>12.1f}{indexes / count:>12.1f}"
+            f"{table * scale:>11.1f}GiB{indexes * scale:>11.1f}GiB"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,62 @@
+"""Archiving N approved documents: per-document transitions vs one bulk transition.
+
+Usage: PYTHONPATH=. python scripts/bench_bulk_transitions.py [documents]
+"""
+
+from __future__ import annotations
+
+import sys
+import time
+
+from sqlalchemy import create_engine, event, insert
+from sqlalchemy.orm import sessionmaker
+
+from backend.auth.models import Role
+from backend.db.base import Base
+from backend.documents.models import Document
+from backend.documents.service import transition_document, transition_documents_bulk
+from backend.workflow.state_machine import DocumentState
+
+APPROVED = DocumentState.APPROVED
+
+
+def _run(count: int, bulk: bool) -> tuple[float, int]:
+    engine = create_engine("sqlite+pysqlite:///:memory:", future=True)
+    Base.metadata.create_all(engine)
+    doc_numbers = [f"DOC-{i:06d}" for i in range(count)]
+    with engine.begin() as conn:
+        conn.execute(
+            insert(Document),
+            [
+                {"doc_number": n, "title": "SOP", "owner_username": "author1", "state": APPROVED, "locked": True}
+                for n in doc_numbers
+            ],
+        )
+    statements = 0
+
+    def count_statement(*_args) -> None:
+        nonlocal statements
+        statements += 1
+
+    event.listen(engine, "before_cursor_execute", count_statement)
+    started = time.perf_counter()
+    with sessionmaker(bind=engine, future=True).begin() as session:
+        if bulk:
+            result = transition_documents_bulk(session, doc_numbers, DocumentState.ARCHIVED, "admin1", Role.ADMIN)
+            assert len(result.changed) == count
+        else:
+            for doc_number in doc_numbers:
+                transition_document(session, doc_number, DocumentState.ARCHIVED, "admin1", Role.ADMIN)
+    return time.perf_counter() - started, statements
+
+
+def main() -> None:
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 20_000
+    print(f"{'mode':<16}{'seconds':>10}{'statements':>12}")
+    for name, bulk in (("per-document", False), ("bulk", True)):
+        seconds, statements = _run(count, bulk)
+        print(f"{name:<16}{seconds:>10.2f}{statements:>12}")
+
+
+if __name__ == "__main__":
+    main()
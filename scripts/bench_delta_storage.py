@@ -0,0 +1,73 @@
+"""Storage size and read latency of full vs reverse-delta version storage.
+
+Usage: PYTHONPATH=. python scripts/bench_delta_storage.py [revisions] [lines]
+"""
+
+from __future__ import annotations
+
+import random
+import sys
+import time
+
+from sqlalchemy import create_engine, func, select
+from sqlalchemy.orm import sessionmaker
+
+from backend.auth.models import Role
+from backend.db.base import Base
+from backend.documents import service as document_service
+from backend.documents.models import DocumentVersion
+from backend.documents.service import add_version, create_document, get_version, read_version_content
+
+
+def _revision_history(revisions: int, line_count: int) -> list[str]:
+    rng = random.Random(42)
+    lines = [f"{i}. Verify equipment status and record reading {i} in the batch record.\n" for i in range(line_count)]
+    history = []
+    for rev in range(revisions):
+        for _ in range(rng.randint(1, 5)):
+            position = rng.randrange(len(lines))
+            action = rng.random()
+            if action < 0.6:
+                lines[position] = f"{position}. Revised instruction (rev {rev}): confirm with second operator.\n"
+            elif action < 0.8:
+                lines.insert(position, f"New note added in revision {rev}.\n")
+            elif len(lines) > 10:
+                del lines[position]
+        history.append("".join(lines))
+    return history
+
+
+def _run(mode: str, history: list[str]) -> tuple[int, float]:
+    document_service.VERSION_STORAGE_MODE = mode
+    engine = create_engine("sqlite+pysqlite:///:memory:", future=True)
+    Base.metadata.create_all(engine)
+    session_factory = sessionmaker(bind=engine, future=True)
+    with session_factory.begin() as session:
+        create_document(session, "DOC-BENCH", "Benchmark SOP", "author1")
+        for text in history:
+            add_version(session, "DOC-BENCH", text, "author1", Role.AUTHOR)
+    with session_factory() as session:
+        stored = session.scalar(select(func.sum(func.length(DocumentVersion.content))))
+        rng = random.Random(7)
+        samples = [rng.randint(1, len(history)) for _ in range(200)]
+        started = time.perf_counter()
+        for version_no in samples:
+            session.expunge_all()
+            assert read_version_content(get_version(session, "DOC-BENCH", version_no)) == history[version_no - 1]
+        latency_ms = (time.perf_counter() - started) * 1000 / len(samples)
+    return stored, latency_ms
+
+
+def main() -> None:
+    revisions = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    line_count = int(sys.argv[2]) if len(sys.argv) > 2 else 800
+    history = _revision_history(revisions, line_count)
+    print(f"{revisions} revisions, ~{len(history[-1]) // 1024} KiB per version, "
+          f"snapshot every {document_service.DELTA_SNAPSHOT_INTERVAL}")
+    for mode in ("full", "delta"):
+        stored, latency_ms = _run(mode, history)
+        print(f"{mode:>6}: {stored / 1024 / 1024:8.2f} MiB stored, {latency_ms:6.2f} ms per random version read")
+
+
+if __name__ == "__main__":
+    main()
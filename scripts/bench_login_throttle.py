@@ -0,0 +1,69 @@
+"""CPU cost of a credential-stuffing flood against login, with and without throttling.
+
+Usage: PYTHONPATH=. python scripts/bench_login_throttle.py [attempts]
+"""
+
+from __future__ import annotations
+
+import sys
+import time
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from backend.auth.models import Role
+from backend.auth.service import (
+    AuthError,
+    complete_login,
+    create_user,
+    get_password_hash,
+    log_login_failure,
+    verify_password,
+)
+from backend.auth.throttle import LoginThrottle
+from backend.db.base import Base
+
+
+def _flood(session_factory, attempts: int, throttle: LoginThrottle | None) -> tuple[float, int, int]:
+    verified_attempts = 0
+    audit_events = 0
+    started = time.process_time()
+    for i in range(attempts):
+        username = f"operator{i % 10}"
+        if throttle is None or throttle.allow(username, "10.0.0.66"):
+            with session_factory.begin() as session:
+                encoded = get_password_hash(session, username)
+            verified = encoded is not None and verify_password("wrong-password-guess", encoded)
+            verified_attempts += 1
+            try:
+                with session_factory.begin() as session:
+                    complete_login(session, username, verified, audit_failure=throttle is None)
+                continue
+            except AuthError:
+                if throttle is None:
+                    audit_events += 1
+                    continue
+        attempts_to_report = throttle.record_failure(username)
+        if attempts_to_report:
+            with session_factory.begin() as session:
+                log_login_failure(session, username, attempts_to_report)
+            audit_events += 1
+    return time.process_time() - started, verified_attempts, audit_events
+
+
+def main() -> None:
+    attempts = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    engine = create_engine("sqlite+pysqlite:///:memory:", future=True)
+    Base.metadata.create_all(engine)
+    session_factory = sessionmaker(bind=engine, future=True)
+    with session_factory.begin() as session:
+        for i in range(10):
+            create_user(session, f"operator{i}", "ComplexPass123", Role.AUTHOR)
+
+    for label, throttle in (("unthrottled", None), ("token-bucket", LoginThrottle())):
+        cpu, hashed, events = _flood(session_factory, attempts, throttle)
+        print(f"{label:>12}: {attempts} attempts, {hashed} PBKDF2 verifications, {events} audit events, {cpu:.2f}s CPU")
+
+
+if __name__ == "__main__":
+    main()
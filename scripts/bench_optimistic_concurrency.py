@@ -0,0 +1,101 @@
+"""Transition throughput under concurrent requests: one global lock vs optimistic row versions.
+
+Each request reads a random document, waits ``work_ms`` (standing in for the
+request's own latency: token checks, network round trips) and toggles it
+between Review and Draft. The global-lock mode serializes whole requests, as
+the old workaround did; the optimistic mode lets them overlap and retries the
+ones that lose a compare-and-swap. Both end with the audited transition count
+equal to the row-version increments, i.e. no lost updates.
+
+Usage: PYTHONPATH=. python scripts/bench_optimistic_concurrency.py [threads] [requests] [documents] [work_ms]
+"""
+
+from __future__ import annotations
+
+from concurrent.futures import ThreadPoolExecutor
+import os
+import random
+import sys
+import tempfile
+import threading
+import time
+
+from sqlalchemy import create_engine, func, insert, select
+from sqlalchemy.orm import sessionmaker
+
+from backend.audit.models import AuditEvent
+from backend.auth.models import Role
+from backend.db.base import Base
+from backend.documents.models import Document
+from backend.documents.service import ConcurrentUpdateError, retry_on_conflict, transition_document
+from backend.workflow.state_machine import DocumentState
+
+REVIEW = DocumentState.REVIEW
+
+
+def _run(mode: str, threads: int, requests: int, documents: int, work_ms: float) -> tuple[float, int]:
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = create_engine(f"sqlite:///{os.path.join(tmp, 'occ.db')}", connect_args={"timeout": 60})
+        Base.metadata.create_all(engine)
+        with engine.begin() as conn:
+            conn.execute(
+                insert(Document),
+                [
+                    {"doc_number": f"DOC-{i}", "title": "SOP", "owner_username": "author1", "state": REVIEW}
+                    for i in range(documents)
+                ],
+            )
+        Session = sessionmaker(bind=engine)
+        global_lock = threading.Lock()
+        conflicts = 0
+
+        def toggle(session, doc_number: str) -> None:
+            nonlocal conflicts
+            document = session.scalar(select(Document).where(Document.doc_number == doc_number))
+            time.sleep(work_ms / 1000)
+            target = DocumentState.DRAFT if document.state == DocumentState.REVIEW else DocumentState.REVIEW
+            try:
+                transition_document(session, doc_number, target, "author1", Role.AUTHOR)
+            except ConcurrentUpdateError:
+                conflicts += 1
+                raise
+
+        def worker(seed: int) -> None:
+            rng = random.Random(seed)
+            for _ in range(requests // threads):
+                doc_number = f"DOC-{rng.randrange(documents)}"
+                if mode == "global lock":
+                    with global_lock, Session.begin() as session:
+                        toggle(session, doc_number)
+                else:
+                    retry_on_conflict(Session.begin, lambda session: toggle(session, doc_number), attempts=20)
+
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=threads) as pool:
+            list(pool.map(worker, range(threads)))
+        elapsed = time.perf_counter() - started
+        with Session() as session:
+            versions = session.scalar(select(func.sum(Document.row_version - 1)))
+            audited = session.scalar(
+                select(func.count()).select_from(AuditEvent).where(AuditEvent.event_type == "STATE_CHANGE")
+            )
+        assert versions == audited == requests // threads * threads, (versions, audited)
+        engine.dispose()
+    return audited / elapsed, conflicts
+
+
+def main() -> None:
+    args = sys.argv[1:]
+    threads = int(args[0]) if len(args) > 0 else 8
+    requests = int(args[1]) if len(args) > 1 else 800
+    documents = int(args[2]) if len(args) > 2 else 200
+    work_ms = float(args[3]) if len(args) > 3 else 2.0
+    print(f"{threads} threads, {requests} requests over {documents} documents, {work_ms} ms request latency")
+    print(f"{'mode':<14}{'transitions/s':>14}{'conflicts':>11}")
+    for mode in ("global lock", "optimistic"):
+        rate, conflicts = _run(mode, threads, requests, documents, work_ms)
+        print(f"{mode:<14}{rate:>14,.0f}{conflicts:>11}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+"""Full-text query latency against corpus size, FTS5 index vs a LIKE scan.
+
+Usage: PYTHONPATH=. python scripts/bench_search.py [corpus sizes...]
+"""
+
+from __future__ import annotations
+
+import random
+import sys
+import time
+
+from sqlalchemy import create_engine, text
+from sqlalchemy.orm import Session
+
+from backend.db.base import Base
+from backend.documents.search import SqliteFtsBackend, search_documents
+
+COMMON_WORDS = [
+    "granulator", "blender", "tablet", "capsule", "cleaning", "validation", "deviation", "sterile",
+    "gowning", "balance", "calibration", "humidity", "temperature", "batch", "record", "operator",
+]
+RARE_WORDS = [f"term{i}" for i in range(20_000)]
+
+
+def _body(rng: random.Random, doc_id: int) -> str:
+    words = [rng.choice(COMMON_WORDS) if rng.random() < 0.5 else rng.choice(RARE_WORDS) for _ in range(300)]
+    if doc_id % 10_000 == 7:
+        words.append("nitrosamine")
+    return " ".join(words)
+
+
+def _measure(session: Session, query, runs: int = 20) -> float:
+    started = time.perf_counter()
+    for _ in range(runs):
+        query()
+    return (time.perf_counter() - started) * 1000 / runs
+
+
+def main() -> None:
+    sizes = [int(arg) for arg in sys.argv[1:]] or [1_000, 10_000, 50_000]
+    rng = random.Random(1)
+    backend = SqliteFtsBackend()
+    print(f"{'documents':>10} {'fts common':>12} {'fts rare':>10} {'like rare':>10}  (ms/query)")
+    for size in sizes:
+        engine = create_engine("sqlite+pysqlite:///:memory:", future=True)
+        Base.metadata.create_all(engine)
+        with Session(engine) as session:
+            session.execute(text("CREATE TABLE raw_bodies (id INTEGER PRIMARY KEY, body TEXT)"))
+            for doc_id in range(1, size + 1):
+                body = _body(rng, doc_id)
+                backend.index(session, doc_id, f"DOC-{doc_id}", 1, body)
+                session.execute(text("INSERT INTO raw_bodies VALUES (:id, :body)"), {"id": doc_id, "body": body})
+            session.commit()
+            common = _measure(session, lambda: search_documents(session, "granulator cleaning"))
+            rare = _measure(session, lambda: search_documents(session, "nitrosamine"))
+            like = _measure(
+                session,
+                lambda: session.execute(text("SELECT id FROM raw_bodies WHERE body LIKE '%nitrosamine%'")).all(),
+                runs=3,
+            )
+        print(f"{size:>10} {common:>12.2f} {rare:>10.2f} {like:>10.2f}")
+
+
+if __name__ == "__main__":
+    main()
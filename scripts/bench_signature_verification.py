@@ -0,0 +1,101 @@
+"""Signature verification throughput: streamed set-based recomputation vs row-by-row ORM loads.
+
+The ORM baseline loads each signature and its document as entities, the way a
+per-signature check would, and is timed on a 20k-signature sample.
+
+Usage: PYTHONPATH=. python scripts/bench_signature_verification.py [signatures] [workers...]
+"""
+
+from __future__ import annotations
+
+import os
+import random
+import sys
+import tempfile
+import time
+
+from sqlalchemy import create_engine, insert, select
+from sqlalchemy.orm import Session
+
+from backend.db.base import Base
+from backend.documents.models import Document, DocumentVersion
+from backend.signatures.models import ElectronicSignature
+from backend.signatures.service import compute_signature_hash
+from backend.signatures.verification import SignatureFilter, verify_signatures
+from backend.workflow.state_machine import DocumentState
+
+DOCUMENTS = 50_000
+ORM_SAMPLE = 20_000
+BATCH_SIZE = 20_000
+APPROVED = DocumentState.APPROVED
+
+
+def _seed(engine, count: int) -> None:
+    rng = random.Random(42)
+    with engine.begin() as conn:
+        conn.execute(
+            insert(Document),
+            [
+                {"doc_number": f"DOC-{i:06d}", "title": "SOP", "owner_username": "author1", "state": APPROVED}
+                for i in range(1, DOCUMENTS + 1)
+            ],
+        )
+        conn.execute(
+            insert(DocumentVersion),
+            [
+                {"document_id": i, "version_no": 1, "content": "", "checksum": "0" * 64, "created_by": "author1"}
+                for i in range(1, DOCUMENTS + 1)
+            ],
+        )
+        for start in range(0, count, BATCH_SIZE):
+            rows = []
+            for _ in range(start, min(start + BATCH_SIZE, count)):
+                document_id = rng.randint(1, DOCUMENTS)
+                doc_number = f"DOC-{document_id:06d}"
+                signer = f"approver{rng.randrange(40)}"
+                rows.append(
+                    {
+                        "document_id": document_id,
+                        "version_id": document_id,
+                        "signer_username": signer,
+                        "meaning": "QA Approval",
+                        "signature_hash": compute_signature_hash(doc_number, document_id, signer, "QA Approval"),
+                    }
+                )
+            conn.execute(insert(ElectronicSignature), rows)
+
+
+def _orm_rate(engine) -> float:
+    with Session(engine) as session:
+        ids = session.scalars(select(ElectronicSignature.id).order_by(ElectronicSignature.id).limit(ORM_SAMPLE)).all()
+        started = time.perf_counter()
+        for signature_id in ids:
+            signature = session.get(ElectronicSignature, signature_id)
+            document = session.get(Document, signature.document_id)
+            expected = compute_signature_hash(
+                document.doc_number, signature.version_id, signature.signer_username, signature.meaning
+            )
+            assert expected == signature.signature_hash
+        return len(ids) / (time.perf_counter() - started)
+
+
+def main() -> None:
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 2_000_000
+    worker_counts = [int(arg) for arg in sys.argv[2:]] or sorted({1, os.cpu_count() or 1})
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = create_engine(f"sqlite+pysqlite:///{os.path.join(tmp, 'signatures.db')}", future=True)
+        Base.metadata.create_all(engine)
+        _seed(engine, count)
+        print(f"{count} signatures, {os.cpu_count()} CPUs")
+        print(f"{'mode':<24}{'signatures/s':>14}{'seconds':>10}")
+        orm_rate = _orm_rate(engine)
+        print(f"{'ORM row by row':<24}{orm_rate:>14,.0f}{count / orm_rate:>10.1f} (extrapolated)")
+        for workers in worker_counts:
+            with Session(engine) as session:
+                result = verify_signatures(session, SignatureFilter(), workers=workers)
+            assert result.checked == count and result.ok
+            print(f"{f'streamed, {workers} worker(s)':<24}{count / result.seconds:>14,.0f}{result.seconds:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
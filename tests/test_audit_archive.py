@@ -0,0 +1,117 @@
+from __future__ import annotations
+
+from datetime import datetime, timezone
+import os
+
+import pytest
+from sqlalchemy import func, select
+
+from backend.audit import archive, chain
+from backend.audit.archive import ArchiveError, iter_cold_rows, seal_before, verify_segments
+from backend.audit.chain import verify_chain, verify_event
+from backend.audit.export import EXPORT_COLUMNS, AuditExportFilter, iter_audit_rows
+from backend.audit.models import AuditEvent, AuditSegment
+from backend.audit.service import log_event, log_events_bulk
+
+
+def _seed(db_session) -> None:
+    events = [
+        {
+            "event_type": "STATE_CHANGE",
+            "actor": "author1",
+            "metadata": {"month": month, "i": i},
+            "record_type": "document",
+            "record_id": f"DOC-8{i % 2}",
+            "created_at": datetime(2026, month, 1 + i, tzinfo=timezone.utc),
+        }
+        for month in (1, 2, 3)
+        for i in range(5)
+    ]
+    log_events_bulk(db_session, events)
+    db_session.commit()
+
+
+@pytest.fixture()
+def archive_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(archive, "AUDIT_ARCHIVE_DIR", str(tmp_path / "archive"))
+    monkeypatch.setattr(chain, "AUDIT_CHECKPOINT_INTERVAL", 5)
+    return tmp_path / "archive"
+
+
+def test_sealing_moves_old_months_to_read_only_segments(db_session, archive_dir):
+    _seed(db_session)
+    segments = seal_before(db_session, datetime(2026, 3, 1, tzinfo=timezone.utc), block_events=2)
+    db_session.commit()
+
+    assert [(s.period, s.first_sequence, s.last_sequence) for s in segments] == [("2026-01", 1, 5), ("2026-02", 6, 10)]
+    assert (archive_dir / segments[0].filename).stat().st_mode & 0o222 == 0
+    hot = db_session.scalars(select(AuditEvent.event_type).order_by(AuditEvent.sequence)).all()
+    assert hot == ["STATE_CHANGE"] * 5 + ["AUDIT_SEGMENT_SEAL"]
+    assert verify_segments(db_session) == []
+    assert verify_chain(db_session).ok
+
+
+def test_reads_span_cold_segments_and_the_hot_table(db_session, archive_dir):
+    _seed(db_session)
+    seal_before(db_session, datetime(2026, 3, 1, tzinfo=timezone.utc), block_events=2)
+    db_session.commit()
+
+    rows = list(iter_audit_rows(db_session, AuditExportFilter(record_type="document")))
+    assert [row[0] for row in rows] == list(range(1, 16))
+
+    doc_rows = list(iter_audit_rows(db_session, AuditExportFilter(record_id="DOC-81", after_id=3)))
+    assert [(row[7]["month"], row[7]["i"]) for row in doc_rows] == [(1, 3), (2, 1), (2, 3), (3, 1), (3, 3)]
+
+    february = AuditExportFilter(created_from=datetime(2026, 2, 2), created_to=datetime(2026, 2, 4))
+    assert [row[7]["i"] for row in iter_cold_rows(db_session, february, EXPORT_COLUMNS)] == [1, 2]
+
+
+def test_chain_continues_across_repeated_seals(db_session, archive_dir):
+    _seed(db_session)
+    seal_before(db_session, datetime(2099, 1, 1, tzinfo=timezone.utc))
+    db_session.commit()
+    for i in range(4):
+        log_event(db_session, "TEST", "qa1", {"i": i})
+    db_session.commit()
+    seal_before(db_session, datetime(2099, 1, 1, tzinfo=timezone.utc))
+    db_session.commit()
+    assert db_session.scalars(select(AuditEvent.sequence)).all() == [21]
+
+    log_event(db_session, "TEST", "qa1", {})
+    db_session.commit()
+    assert db_session.scalar(select(func.max(AuditEvent.sequence))) == 22
+    assert verify_chain(db_session).ok
+    assert verify_segments(db_session) == []
+
+
+def test_seal_stops_at_the_last_completed_checkpoint_block(db_session, archive_dir, monkeypatch):
+    monkeypatch.setattr(chain, "AUDIT_CHECKPOINT_INTERVAL", 8)
+    _seed(db_session)
+    segments = seal_before(db_session, datetime(2026, 3, 1, tzinfo=timezone.utc))
+    db_session.commit()
+    assert segments[-1].last_sequence == 8
+    assert seal_before(db_session, datetime(2026, 3, 1, tzinfo=timezone.utc)) == []
+
+    for i in range(12):
+        log_event(db_session, "TEST", "qa1", {"i": i})
+    db_session.commit()
+
+    assert verify_chain(db_session).ok
+    assert all(verify_event(db_session, sequence) for sequence in range(9, 25))
+    assert verify_segments(db_session) == []
+
+
+def test_corrupted_segment_is_detected(db_session, archive_dir):
+    _seed(db_session)
+    segment = seal_before(db_session, datetime(2026, 2, 1, tzinfo=timezone.utc))[0]
+    db_session.commit()
+    path = archive_dir / segment.filename
+    os.chmod(path, 0o644)
+    data = bytearray(path.read_bytes())
+    data[10] ^= 0xFF
+    path.write_bytes(bytes(data))
+
+    assert verify_segments(db_session) == [f"{segment.filename}: file checksum mismatch"]
+    with pytest.raises(ArchiveError):
+        list(iter_audit_rows(db_session, AuditExportFilter()))
+    assert db_session.scalar(select(func.count()).select_from(AuditSegment)) == 1
@@ -0,0 +1,67 @@
+from __future__ import annotations
+
+from sqlalchemy import event, func, select
+
+from backend.audit.chain import verify_chain
+from backend.audit.models import AuditEvent
+from backend.audit.service import log_event, pending_events
+from backend.auth.models import Role
+from backend.documents.service import add_version, create_document, transition_document
+from backend.signatures.service import sign_and_approve
+from backend.workflow.state_machine import DocumentState
+
+
+def test_events_are_written_in_one_insert_at_commit(db_session):
+    create_document(db_session, "DOC-60", "SOP", "author1")
+    add_version(db_session, "DOC-60", "body", "author1", Role.AUTHOR)
+    transition_document(db_session, "DOC-60", DocumentState.REVIEW, "author1", Role.AUTHOR)
+    db_session.commit()
+
+    inserts = []
+    engine = db_session.get_bind()
+
+    def capture(_conn, _cursor, statement, *_args) -> None:
+        if statement.startswith("INSERT INTO audit_events"):
+            inserts.append(statement)
+
+    event.listen(engine, "before_cursor_execute", capture)
+    try:
+        sign_and_approve(db_session, "DOC-60", "approver1", "QA Approval", Role.APPROVER)
+        assert [evt["event_type"] for evt in pending_events(db_session)] == ["STATE_CHANGE", "DOCUMENT_SIGNED"]
+        assert inserts == []
+        db_session.commit()
+    finally:
+        event.remove(engine, "before_cursor_execute", capture)
+
+    assert len(inserts) == 1
+    types = db_session.scalars(select(AuditEvent.event_type).order_by(AuditEvent.sequence)).all()
+    assert types == ["DOCUMENT_CREATE", "VERSION_ADD", "STATE_CHANGE", "STATE_CHANGE", "DOCUMENT_SIGNED"]
+    assert verify_chain(db_session).ok
+
+
+def test_reads_see_events_logged_earlier_in_the_transaction(db_session):
+    log_event(db_session, "TEST", "qa1", {})
+    assert db_session.scalar(select(func.count()).select_from(AuditEvent)) == 1
+    assert pending_events(db_session) == []
+
+
+def test_rollback_discards_the_transactions_events(db_session):
+    log_event(db_session, "KEPT", "qa1", {})
+    db_session.commit()
+    log_event(db_session, "DISCARDED", "qa1", {})
+    db_session.rollback()
+    db_session.commit()
+
+    assert db_session.scalars(select(AuditEvent.event_type)).all() == ["KEPT"]
+
+
+def test_savepoint_rollback_discards_only_its_own_events(db_session):
+    log_event(db_session, "OUTER", "qa1", {})
+    savepoint = db_session.begin_nested()
+    log_event(db_session, "INNER", "qa1", {})
+    savepoint.rollback()
+    log_event(db_session, "AFTER", "qa1", {})
+    db_session.commit()
+
+    types = db_session.scalars(select(AuditEvent.event_type).order_by(AuditEvent.sequence)).all()
+    assert types == ["OUTER", "AFTER"]
@@ -0,0 +1,52 @@
+from __future__ import annotations
+
+import csv
+import io
+import json
+
+import pytest
+from sqlalchemy.orm import sessionmaker
+
+from backend.audit import export
+from backend.audit.export import AuditExportFilter, ExportError, iter_audit_rows, render_export, stream_audit_export
+from backend.audit.service import log_event
+
+
+def _seed(db_session) -> None:
+    for i in range(5):
+        log_event(db_session, "STATE_CHANGE", "author1", {"step": i}, "document", "DOC-70")
+        log_event(db_session, "STATE_CHANGE", "author2", {"step": i}, "document", "DOC-71")
+    db_session.commit()
+
+
+def test_ndjson_export_filters_by_record_in_id_order_and_resumes(db_session):
+    _seed(db_session)
+    filters = AuditExportFilter(record_id="DOC-70")
+    lines = "".join(render_export(iter_audit_rows(db_session, filters), "ndjson", fetch_size=2)).splitlines()
+    records = [json.loads(line) for line in lines]
+
+    assert [r["metadata"]["step"] for r in records] == [0, 1, 2, 3, 4]
+    assert {r["record_id"] for r in records} == {"DOC-70"}
+    assert [r["id"] for r in records] == sorted(r["id"] for r in records)
+
+    resumed = AuditExportFilter(record_id="DOC-70", after_id=records[2]["id"])
+    rest = "".join(render_export(iter_audit_rows(db_session, resumed), "ndjson")).splitlines()
+    rest = [json.loads(line) for line in rest]
+    assert [r["id"] for r in rest] == [r["id"] for r in records[3:]]
+
+
+def test_csv_export_by_actor_streams_from_its_own_session(db_session, monkeypatch):
+    _seed(db_session)
+    monkeypatch.setattr(export, "SessionLocal", sessionmaker(bind=db_session.get_bind()))
+
+    chunks = stream_audit_export("csv", AuditExportFilter(actor="author2"), fetch_size=2)
+    rows = list(csv.DictReader(io.StringIO("".join(chunks))))
+
+    assert len(rows) == 5
+    assert {row["actor"] for row in rows} == {"author2"}
+    assert json.loads(rows[-1]["metadata"]) == {"step": 4}
+
+
+def test_unknown_export_format_is_rejected():
+    with pytest.raises(ExportError):
+        stream_audit_export("xml", AuditExportFilter())
@@ -0,0 +1,68 @@
+from __future__ import annotations
+
+from concurrent.futures import ThreadPoolExecutor
+
+from sqlalchemy import create_engine, func, select, update
+from sqlalchemy.orm import sessionmaker
+
+from backend.audit import chain
+from backend.audit.chain import GENESIS_HASH, verify_chain, verify_event
+from backend.audit.models import AuditCheckpoint, AuditEvent
+from backend.audit.service import log_event, log_events_bulk
+from backend.db.base import Base
+
+
+def test_events_form_a_verifiable_chain_with_checkpoints(db_session, monkeypatch):
+    monkeypatch.setattr(chain, "AUDIT_CHECKPOINT_INTERVAL", 4)
+    for i in range(6):
+        log_event(db_session, "TEST", "qa1", {"step": i}, "document", "DOC-50")
+    log_events_bulk(db_session, [{"event_type": "BULK", "actor": "qa1", "metadata": {"n": i}} for i in range(5)])
+    db_session.commit()
+
+    events = db_session.scalars(select(AuditEvent).order_by(AuditEvent.sequence)).all()
+    assert [evt.sequence for evt in events] == list(range(1, 12))
+    assert events[0].prev_hash == GENESIS_HASH
+    assert all(evt.prev_hash == prev.event_hash for prev, evt in zip(events, events[1:]))
+    assert db_session.scalars(select(AuditCheckpoint.last_sequence).order_by(AuditCheckpoint.id)).all() == [4, 8]
+
+    result = verify_chain(db_session)
+    assert result.ok and (result.events, result.checkpoints) == (11, 2)
+    assert all(verify_event(db_session, sequence) for sequence in range(1, 9))
+
+
+def test_raw_sql_tampering_breaks_the_chain(db_session, monkeypatch):
+    monkeypatch.setattr(chain, "AUDIT_CHECKPOINT_INTERVAL", 4)
+    for i in range(8):
+        log_event(db_session, "TEST", "qa1", {"step": i}, "document", "DOC-51")
+    db_session.commit()
+
+    table = AuditEvent.__table__
+    db_session.execute(update(table).where(table.c.sequence == 3).values(metadata={"step": "edited"}))
+    db_session.commit()
+    db_session.expire_all()
+
+    result = verify_chain(db_session)
+    assert result.broken == [3]
+    assert verify_event(db_session, 3) is False
+    assert verify_event(db_session, 6) is True
+
+
+def test_concurrent_writers_never_fork_the_chain(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'audit.db'}", connect_args={"timeout": 30})
+    Base.metadata.create_all(engine)
+    Session = sessionmaker(bind=engine)
+
+    def writer(name: str) -> None:
+        for i in range(20):
+            with Session() as session:
+                log_event(session, "TEST", name, {"i": i})
+                session.commit()
+
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        list(pool.map(writer, [f"writer{n}" for n in range(4)]))
+
+    with Session() as session:
+        assert session.scalar(select(func.count()).select_from(AuditEvent)) == 80
+        assert session.scalar(select(func.max(AuditEvent.sequence))) == 80
+        assert verify_chain(session).ok
+    engine.dispose()
@@ -0,0 +1,70 @@
+from __future__ import annotations
+
+from sqlalchemy import event, func, select, text
+
+from backend.audit.chain import verify_chain
+from backend.audit.export import AuditExportFilter, iter_audit_rows
+from backend.audit.models import AuditEvent, AuditTerm
+from backend.audit.service import flush_audit_buffer, log_event
+from backend.audit.terms import cached_term_id
+
+
+def test_events_store_term_ids_and_read_back_strings(db_session):
+    for i in range(5):
+        log_event(db_session, "DOC_VIEW", "qa1", {"n": i}, "document", f"DOC-{i}")
+    log_event(db_session, "LOGIN_SUCCESS", "qa1", {})
+    db_session.commit()
+
+    assert db_session.scalar(select(func.count()).select_from(AuditTerm)) == 5
+    evt = db_session.scalar(select(AuditEvent).where(AuditEvent.record_id == "DOC-3"))
+    assert (evt.event_type, evt.actor, evt.record_type) == ("DOC_VIEW", "qa1", "document")
+    assert db_session.get(AuditTerm, evt.actor_id).value == "qa1"
+    view = db_session.execute(text("SELECT event_type, actor, record_type FROM audit_events_readable WHERE id = 6"))
+    assert view.one() == ("LOGIN_SUCCESS", "qa1", "system")
+    assert verify_chain(db_session).ok
+
+
+def test_warm_cache_writes_without_term_lookups(db_session):
+    log_event(db_session, "DOC_VIEW", "qa1", {}, "document", "DOC-1")
+    db_session.commit()
+
+    statements = []
+    engine = db_session.get_bind()
+
+    def capture(_conn, _cursor, statement, *_args) -> None:
+        statements.append(statement)
+
+    event.listen(engine, "before_cursor_execute", capture)
+    try:
+        log_event(db_session, "DOC_VIEW", "qa1", {}, "document", "DOC-2")
+        db_session.commit()
+    finally:
+        event.remove(engine, "before_cursor_execute", capture)
+
+    assert not [statement for statement in statements if "audit_terms" in statement]
+
+
+def test_terms_from_a_rolled_back_transaction_are_not_cached(db_session):
+    log_event(db_session, "DOC_VIEW", "ghost", {})
+    flush_audit_buffer(db_session)
+    assert cached_term_id(db_session, "actor", "ghost") is not None
+    db_session.rollback()
+
+    assert cached_term_id(db_session, "actor", "ghost") is None
+    log_event(db_session, "DOC_VIEW", "ghost", {})
+    db_session.commit()
+    evt = db_session.scalar(select(AuditEvent))
+    assert evt.actor == "ghost"
+    assert db_session.get(AuditTerm, evt.actor_id).value == "ghost"
+    assert cached_term_id(db_session, "actor", "ghost") == evt.actor_id
+
+
+def test_export_filters_on_term_ids(db_session):
+    log_event(db_session, "DOC_VIEW", "qa1", {}, "document", "DOC-1")
+    log_event(db_session, "DOC_VIEW", "qa2", {}, "document", "DOC-1")
+    log_event(db_session, "DOC_VIEW", "qa1", {}, "user", "DOC-1")
+    db_session.commit()
+
+    assert len(list(iter_audit_rows(db_session, AuditExportFilter(record_id="DOC-1")))) == 2
+    assert len(list(iter_audit_rows(db_session, AuditExportFilter(actor="qa1")))) == 2
+    assert list(iter_audit_rows(db_session, AuditExportFilter(actor="nobody"))) == []
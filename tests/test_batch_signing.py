@@ -0,0 +1,91 @@
+from __future__ import annotations
+
+import pytest
+from sqlalchemy import event, select
+
+from backend.audit.chain import verify_chain
+from backend.audit.models import AuditEvent
+from backend.auth.models import Role
+from backend.auth.rbac import PermissionDenied
+from backend.documents.models import Document
+from backend.documents.service import add_version, create_document, transition_document
+from backend.signatures.models import ElectronicSignature
+from backend.signatures.service import BatchSignatureError, compute_signature_hash, sign_and_approve_batch
+from backend.workflow.state_machine import DocumentState
+
+
+def _in_review(session, doc_number: str, versions: int = 1) -> int:
+    create_document(session, doc_number, "SOP", "author1")
+    for i in range(versions):
+        version = add_version(session, doc_number, f"{doc_number} v{i + 1}\n", "author1", Role.AUTHOR)
+    transition_document(session, doc_number, DocumentState.REVIEW, "author1", Role.AUTHOR)
+    return version.id
+
+
+def test_batch_binds_each_signature_to_its_own_latest_version(db_session):
+    version_ids = {f"DOC-B{i}": _in_review(db_session, f"DOC-B{i}", versions=i + 1) for i in range(3)}
+    db_session.commit()
+
+    statements = []
+    engine = db_session.get_bind()
+
+    def capture(_conn, _cursor, statement, *_args) -> None:
+        statements.append(statement)
+
+    event.listen(engine, "before_cursor_execute", capture)
+    try:
+        results = sign_and_approve_batch(db_session, list(version_ids), "approver1", "QA Approval", Role.APPROVER)
+        db_session.commit()
+    finally:
+        event.remove(engine, "before_cursor_execute", capture)
+
+    assert [result.signed for result in results] == [True, True, True]
+    assert sum(statement.startswith("INSERT INTO electronic_signatures") for statement in statements) == 1
+    assert sum(statement.startswith("INSERT INTO audit_events") for statement in statements) == 1
+    for result in results:
+        signature = db_session.get(ElectronicSignature, result.signature_id)
+        assert signature.version_id == version_ids[result.doc_number]
+        assert signature.signature_hash == compute_signature_hash(
+            result.doc_number, signature.version_id, "approver1", "QA Approval"
+        )
+    documents = db_session.scalars(select(Document)).all()
+    assert {(doc.state, doc.locked) for doc in documents} == {(DocumentState.APPROVED, True)}
+    signed = db_session.scalars(select(AuditEvent).where(AuditEvent.event_type == "DOCUMENT_SIGNED")).all()
+    assert sorted(evt.record_id for evt in signed) == sorted(version_ids)
+    assert verify_chain(db_session).ok
+
+
+def test_batch_is_all_or_nothing_by_default(db_session):
+    _in_review(db_session, "DOC-B1")
+    create_document(db_session, "DOC-B2", "Draft SOP", "author1")
+    add_version(db_session, "DOC-B2", "draft\n", "author1", Role.AUTHOR)
+    db_session.commit()
+
+    with pytest.raises(BatchSignatureError) as excinfo:
+        sign_and_approve_batch(db_session, ["DOC-B1", "DOC-B2", "DOC-MISSING"], "approver1", "QA", Role.APPROVER)
+
+    errors = {result.doc_number: result.error for result in excinfo.value.results}
+    assert errors["DOC-B1"] is None
+    assert "Draft -> Approved" in errors["DOC-B2"]
+    assert errors["DOC-MISSING"] == "Document not found"
+    assert db_session.scalar(select(ElectronicSignature)) is None
+
+
+def test_batch_can_report_per_item_results(db_session):
+    _in_review(db_session, "DOC-B1")
+    _in_review(db_session, "DOC-B2")
+    sign_and_approve_batch(db_session, ["DOC-B2"], "approver1", "QA", Role.APPROVER)
+    db_session.commit()
+
+    results = sign_and_approve_batch(
+        db_session, ["DOC-B1", "DOC-B2", "DOC-B1"], "approver1", "QA", Role.APPROVER, all_or_nothing=False
+    )
+
+    assert [(result.doc_number, result.signed) for result in results] == [("DOC-B1", True), ("DOC-B2", False)]
+    assert db_session.scalar(select(Document.state).where(Document.doc_number == "DOC-B1")) == DocumentState.APPROVED
+
+
+def test_batch_requires_an_approver(db_session):
+    _in_review(db_session, "DOC-B1")
+    with pytest.raises(PermissionDenied):
+        sign_and_approve_batch(db_session, ["DOC-B1"], "author1", "QA", Role.AUTHOR)
@@ -0,0 +1,56 @@
+from __future__ import annotations
+
+import hashlib
+
+import pytest
+from sqlalchemy import select
+
+from backend.auth.models import Role
+from backend.documents import blobstore
+from backend.documents.blobstore import BlobStore, BlobStoreError
+from backend.documents.models import DocumentVersion
+from backend.documents.service import (
+    add_version,
+    create_document,
+    migrate_content_to_blob_store,
+    read_version_content,
+)
+
+
+def test_blob_store_deduplicates_and_shards(tmp_path):
+    store = BlobStore(tmp_path)
+    first = store.put_bytes(b"same body")
+    second = store.put_bytes(b"same body")
+
+    assert first == second == hashlib.sha256(b"same body").hexdigest()
+    assert store.path_for(first) == tmp_path / first[:2] / first[2:4] / first
+    assert len([p for p in tmp_path.rglob("*") if p.is_file()]) == 1
+    assert store.read_text(store.put_bytes(b"")) == ""
+    with pytest.raises(BlobStoreError):
+        store.read_text("0" * 64)
+
+
+def test_versions_reference_deduplicated_blobs(db_session, tmp_path, monkeypatch):
+    monkeypatch.setattr(blobstore, "blob_store", BlobStore(tmp_path))
+    create_document(db_session, "DOC-8", "SOP", "author1")
+    create_document(db_session, "DOC-9", "SOP", "author1")
+    v1 = add_version(db_session, "DOC-8", "shared body", "author1", Role.AUTHOR)
+    v2 = add_version(db_session, "DOC-9", "shared body", "author1", Role.AUTHOR)
+
+    assert v1.content is None
+    assert v1.content_ref == v2.content_ref == f"blob:{v1.checksum}"
+    assert read_version_content(v2) == "shared body"
+    assert len([p for p in tmp_path.rglob("*") if p.is_file()]) == 1
+
+
+def test_migrate_inline_content_to_blob_store(db_session, tmp_path, monkeypatch):
+    create_document(db_session, "DOC-10", "SOP", "author1")
+    for i in range(3):
+        add_version(db_session, "DOC-10", f"body {i}", "author1", Role.AUTHOR)
+
+    monkeypatch.setattr(blobstore, "blob_store", BlobStore(tmp_path))
+    assert migrate_content_to_blob_store(db_session, batch_size=2) == 3
+    db_session.expire_all()
+    versions = db_session.scalars(select(DocumentVersion).order_by(DocumentVersion.version_no)).all()
+    assert [read_version_content(v) for v in versions] == ["body 0", "body 1", "body 2"]
+    assert all(v.content is None for v in versions)
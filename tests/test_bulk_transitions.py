@@ -0,0 +1,90 @@
+from __future__ import annotations
+
+import pytest
+from sqlalchemy import event, func, select
+
+from backend.audit.chain import verify_chain
+from backend.audit.models import AuditEvent
+from backend.auth.models import Role
+from backend.auth.rbac import PermissionDenied
+from backend.documents.models import Document
+from backend.documents.service import add_version, create_document, transition_document, transition_documents_bulk
+from backend.signatures.models import ElectronicSignature
+from backend.signatures.service import sign_and_approve_batch
+from backend.workflow.state_machine import DocumentState, WorkflowError
+
+
+def _documents(session, count: int, state: DocumentState = DocumentState.DRAFT) -> list[str]:
+    doc_numbers = []
+    for i in range(count):
+        doc_number = f"DOC-9{i:02d}"
+        create_document(session, doc_number, "SOP", "author1")
+        add_version(session, doc_number, "body", "author1", Role.AUTHOR)
+        if state != DocumentState.DRAFT:
+            transition_document(session, doc_number, DocumentState.REVIEW, "author1", Role.AUTHOR)
+        if state in {DocumentState.APPROVED, DocumentState.ARCHIVED}:
+            transition_document(session, doc_number, DocumentState.APPROVED, "approver1", Role.APPROVER)
+        if state == DocumentState.ARCHIVED:
+            transition_document(session, doc_number, DocumentState.ARCHIVED, "admin1", Role.ADMIN)
+        doc_numbers.append(doc_number)
+    session.commit()
+    return doc_numbers
+
+
+def test_bulk_archive_updates_only_eligible_documents(db_session):
+    approved = _documents(db_session, 4, DocumentState.APPROVED)
+    transition_document(db_session, approved[3], DocumentState.ARCHIVED, "admin1", Role.ADMIN)
+    create_document(db_session, "DOC-DRAFT", "SOP", "author1")
+    db_session.commit()
+
+    statements = []
+    engine = db_session.get_bind()
+
+    def capture(_conn, _cursor, statement, *_args) -> None:
+        statements.append(statement)
+
+    event.listen(engine, "before_cursor_execute", capture)
+    try:
+        result = transition_documents_bulk(
+            db_session, approved + ["DOC-DRAFT", "DOC-MISSING"], DocumentState.ARCHIVED, "admin1", Role.ADMIN
+        )
+        db_session.commit()
+    finally:
+        event.remove(engine, "before_cursor_execute", capture)
+
+    assert sorted(result.changed) == approved[:3]
+    assert result.skipped == {
+        approved[3]: "Transition not allowed: Archived -> Archived",
+        "DOC-DRAFT": "Transition not allowed: Draft -> Archived",
+        "DOC-MISSING": "Document not found",
+    }
+    assert sum(statement.startswith("UPDATE documents") for statement in statements) == 1
+    assert sum(statement.startswith("INSERT INTO audit_events") for statement in statements) == 1
+    states = dict(db_session.execute(select(Document.doc_number, Document.state)).all())
+    assert {states[doc_number] for doc_number in approved} == {DocumentState.ARCHIVED}
+    archived = db_session.scalars(
+        select(AuditEvent.record_id).where(AuditEvent.event_type == "STATE_CHANGE", AuditEvent.actor == "admin1")
+    ).all()
+    assert sorted(archived) == approved
+    assert verify_chain(db_session).ok
+
+
+def test_bulk_transition_respects_locks_and_roles(db_session):
+    drafts = _documents(db_session, 2)
+    result = transition_documents_bulk(db_session, drafts, DocumentState.REVIEW, "author1", Role.AUTHOR)
+    assert sorted(result.changed) == drafts
+
+    with pytest.raises(WorkflowError, match="sign-approve-batch"):
+        transition_documents_bulk(db_session, drafts, DocumentState.APPROVED, "approver1", Role.APPROVER)
+    assert db_session.scalar(select(Document.state).where(Document.doc_number == drafts[0])) == DocumentState.REVIEW
+    assert db_session.scalar(select(func.count()).select_from(ElectronicSignature)) == 0
+
+    results = sign_and_approve_batch(db_session, drafts, "approver1", "QA Approval", Role.APPROVER)
+    assert all(result.signed for result in results)
+    assert db_session.scalar(select(Document.locked).where(Document.doc_number == drafts[0])) is True
+
+    back = transition_documents_bulk(db_session, drafts, DocumentState.DRAFT, "author1", Role.AUTHOR)
+    assert back.skipped == {doc_number: "Transition not allowed: Approved -> Draft" for doc_number in drafts}
+
+    with pytest.raises(PermissionDenied):
+        transition_documents_bulk(db_session, drafts, DocumentState.REVIEW, "reviewer1", Role.REVIEWER)
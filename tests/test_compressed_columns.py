@@ -0,0 +1,82 @@
+from __future__ import annotations
+
+from sqlalchemy import Text, inspect, select, text, type_coerce
+
+from backend.audit.models import AuditEvent
+from backend.auth.models import Role
+from backend.db.maintenance import recompress_column
+from backend.db.types import CompressedJSON, CompressedText
+from backend.documents.models import DocumentVersion
+from backend.documents.service import add_version, create_document, read_version_content
+
+
+def _raw(db_session, column):
+    return db_session.scalars(select(type_coerce(column, Text)).order_by(column.table.c.id)).all()
+
+
+def test_compressed_text_round_trip_and_threshold():
+    zlib_type = CompressedText(algorithm="zlib", threshold=16)
+    lzma_type = CompressedText(algorithm="lzma", level=1, threshold=16)
+    body = "Clean the granulator and record the lot number.\n" * 200
+
+    for column_type in (zlib_type, lzma_type):
+        stored = column_type.process_bind_param(body, None)
+        assert len(stored) < len(body) / 10
+        assert column_type.process_result_value(stored, None) == body
+    assert zlib_type.process_bind_param("short", None) == "short"
+    assert zlib_type.process_result_value("legacy raw text", None) == "legacy raw text"
+    escaped = zlib_type.process_bind_param("\x01z not compressed", None)
+    assert zlib_type.process_result_value(escaped, None) == "\x01z not compressed"
+
+    json_type = CompressedJSON(threshold=16)
+    metadata = {"lines": ["Clean the granulator."] * 100}
+    stored = json_type.process_bind_param(metadata, None)
+    assert stored.startswith("\x01z")
+    assert json_type.process_result_value(stored, None) == metadata
+    assert json_type.process_bind_param({"small": 1}, None) == {"small": 1}
+    assert json_type.process_result_value({"legacy": True}, None) == {"legacy": True}
+
+
+def test_versions_and_audit_metadata_are_stored_compressed(db_session):
+    create_document(db_session, "DOC-15", "SOP", "author1")
+    body = "Verify line clearance before starting the batch.\n" * 100
+    version = add_version(db_session, "DOC-15", body, "author1", Role.AUTHOR)
+    db_session.flush()
+    db_session.expire_all()
+
+    assert read_version_content(version) == body
+    assert _raw(db_session, DocumentVersion.__table__.c.content)[0][:2] == "\x01z"
+    assert db_session.scalars(select(AuditEvent.event_metadata)).first() == {"title": "SOP"}
+
+
+def test_columns_keep_declared_types_and_load_lazily(db_session):
+    columns = {column["name"]: column["type"] for column in inspect(db_session.get_bind()).get_columns("audit_events")}
+    assert type(columns["metadata"]).__name__ == "JSON"
+    assert str(DocumentVersion.__table__.c.content.type.impl) == "TEXT"
+
+    create_document(db_session, "DOC-17", "SOP", "author1")
+    add_version(db_session, "DOC-17", "Check the balance calibration.\n" * 100, "author1", Role.AUTHOR)
+    db_session.commit()
+    db_session.expire_all()
+    evt = db_session.scalars(select(AuditEvent).order_by(AuditEvent.id)).first()
+    version = db_session.scalars(select(DocumentVersion)).one()
+    assert {"event_metadata"} <= inspect(evt).unloaded
+    assert {"content"} <= inspect(version).unloaded
+    assert evt.event_metadata == {"title": "SOP"}
+
+
+def test_recompress_rewrites_legacy_rows(db_session):
+    create_document(db_session, "DOC-16", "SOP", "author1")
+    add_version(db_session, "DOC-16", "placeholder", "author1", Role.AUTHOR)
+    db_session.commit()
+    legacy = "Legacy body stored before compression was enabled.\n" * 50
+    db_session.execute(text("UPDATE document_versions SET content = :content"), {"content": legacy})
+    db_session.execute(text("UPDATE audit_events SET metadata = :metadata"), {"metadata": '{"legacy": true}'})
+
+    assert recompress_column(db_session, DocumentVersion.__table__.c.content, batch_size=1) == 1
+    assert recompress_column(db_session, AuditEvent.__table__.c.metadata, batch_size=1) == 2
+    db_session.expire_all()
+
+    assert _raw(db_session, DocumentVersion.__table__.c.content)[0][:2] == "\x01z"
+    assert db_session.scalars(select(DocumentVersion.content)).one() == legacy
+    assert db_session.scalars(select(AuditEvent.event_metadata)).all() == [{"legacy": True}, {"legacy": True}]
@@ -0,0 +1,56 @@
+from __future__ import annotations
+
+import pytest
+from sqlalchemy import select
+
+from backend.auth.models import Role
+from backend.documents import service as document_service
+from backend.documents.delta import apply_delta, make_delta
+from backend.documents.models import DocumentVersion
+from backend.documents.service import DocumentError, add_version, create_document, get_version, read_version_content
+
+
+def _revisions(count: int) -> list[str]:
+    lines = [f"{i}. Perform step {i} per SOP.\n" for i in range(200)]
+    revisions = []
+    for rev in range(count):
+        lines[(rev * 7) % len(lines)] = f"{rev}. Revised wording for revision {rev}.\n"
+        revisions.append("".join(lines))
+    return revisions
+
+
+def test_delta_round_trip_preserves_exact_text():
+    base = "line one\nline two\nline three"
+    target = "line zero\nline one\nline three\n"
+    assert apply_delta(base, make_delta(base, target)) == target
+
+
+def test_reverse_deltas_with_periodic_snapshots(db_session, monkeypatch):
+    monkeypatch.setattr(document_service, "VERSION_STORAGE_MODE", "delta")
+    monkeypatch.setattr(document_service, "DELTA_SNAPSHOT_INTERVAL", 4)
+    revisions = _revisions(10)
+    create_document(db_session, "DOC-13", "SOP", "author1")
+    for text in revisions:
+        add_version(db_session, "DOC-13", text, "author1", Role.AUTHOR)
+    db_session.flush()
+    db_session.expire_all()
+
+    refs = db_session.execute(
+        select(DocumentVersion.version_no, DocumentVersion.content_ref).order_by(DocumentVersion.version_no)
+    ).all()
+    full = [no for no, ref in refs if ref is None]
+    assert full == [4, 8, 10]
+    for no, text in enumerate(revisions, start=1):
+        assert read_version_content(get_version(db_session, "DOC-13", no)) == text
+
+
+def test_reconstruction_detects_checksum_mismatch(db_session, monkeypatch):
+    monkeypatch.setattr(document_service, "VERSION_STORAGE_MODE", "delta")
+    create_document(db_session, "DOC-14", "SOP", "author1")
+    for text in _revisions(2):
+        add_version(db_session, "DOC-14", text, "author1", Role.AUTHOR)
+    db_session.flush()
+
+    get_version(db_session, "DOC-14", 2).content = "tampered latest\n"
+    with pytest.raises(DocumentError):
+        read_version_content(get_version(db_session, "DOC-14", 1))
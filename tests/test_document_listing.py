@@ -0,0 +1,64 @@
+from __future__ import annotations
+
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from sqlalchemy import insert, text
+
+from backend.documents.models import Document
+from backend.documents.queries import list_documents
+from backend.documents.service import DocumentError
+from backend.workflow.state_machine import DocumentState
+
+
+def _seed(db_session, count: int = 25):
+    start = datetime(2026, 1, 1, tzinfo=timezone.utc)
+    db_session.execute(
+        insert(Document),
+        [
+            {
+                "doc_number": f"DOC-{i:04d}",
+                "title": f"SOP {i}",
+                "owner_username": "author1" if i % 2 else "author2",
+                "state": DocumentState.APPROVED if i % 5 == 0 else DocumentState.DRAFT,
+                "locked": i % 5 == 0,
+                "created_at": start + timedelta(hours=i // 3),
+            }
+            for i in range(count)
+        ],
+    )
+    return start
+
+
+def test_keyset_pagination_visits_every_document_once(db_session):
+    _seed(db_session)
+    seen, cursor = [], None
+    while True:
+        page, cursor = list_documents(db_session, cursor=cursor, limit=4)
+        seen.extend(item["doc_number"] for item in page)
+        if cursor is None:
+            break
+    assert seen == [f"DOC-{i:04d}" for i in range(25)]
+
+
+def test_listing_filters_by_state_owner_locked_and_created_range(db_session):
+    start = _seed(db_session)
+    approved, _ = list_documents(db_session, state=DocumentState.APPROVED, owner_username="author1")
+    assert [item["doc_number"] for item in approved] == ["DOC-0005", "DOC-0015"]
+
+    window, _ = list_documents(
+        db_session, locked=False, created_from=start + timedelta(hours=1), created_to=start + timedelta(hours=2)
+    )
+    assert [item["doc_number"] for item in window] == ["DOC-0003", "DOC-0004"]
+    with pytest.raises(DocumentError):
+        list_documents(db_session, cursor="not-a-cursor")
+
+
+def test_filtered_listing_uses_composite_index(db_session):
+    plan = db_session.execute(
+        text(
+            "EXPLAIN QUERY PLAN SELECT id FROM documents WHERE state = 'DRAFT' AND created_at > '2026' "
+            "ORDER BY created_at, id LIMIT 50"
+        )
+    ).all()
+    assert any("ix_documents_state_created_at_id" in row[-1] for row in plan)
@@ -0,0 +1,47 @@
+from __future__ import annotations
+
+import pytest
+from sqlalchemy import text
+
+from backend.auth.models import Role
+from backend.documents import search
+from backend.documents.search import SearchBackend, rebuild_search_index, search_documents
+from backend.documents.service import add_version, create_document
+
+
+def test_search_ranks_latest_version_only(db_session):
+    create_document(db_session, "SOP-1", "Cleaning", "author1")
+    create_document(db_session, "SOP-2", "Gowning", "author1")
+    add_version(db_session, "SOP-1", "Clean the granulator with purified water.", "author1", Role.AUTHOR)
+    add_version(db_session, "SOP-1", "Clean the granulator with 70% isopropyl alcohol.", "author1", Role.AUTHOR)
+    add_version(db_session, "SOP-2", "Granulator room gowning: granulator needs gloves.", "author1", Role.AUTHOR)
+
+    hits = search_documents(db_session, "granulator")
+    assert [hit["doc_number"] for hit in hits] == ["SOP-2", "SOP-1"]
+    assert search_documents(db_session, "purified water") == []
+    hit = search_documents(db_session, "isopropyl")[0]
+    assert (hit["doc_number"], hit["version_no"]) == ("SOP-1", 2)
+    assert "[isopropyl]" in hit["snippet"]
+    assert search_documents(db_session, 'alcohol" OR "water') == []
+
+
+def test_rebuild_reindexes_existing_versions(db_session):
+    create_document(db_session, "SOP-3", "Weighing", "author1")
+    add_version(db_session, "SOP-3", "Tare the balance before weighing.", "author1", Role.AUTHOR)
+    db_session.execute(text("DELETE FROM document_search"))
+    assert search_documents(db_session, "balance") == []
+
+    assert rebuild_search_index(db_session, batch_size=1) == 1
+    assert [hit["doc_number"] for hit in search_documents(db_session, "balance")] == ["SOP-3"]
+
+
+def test_indexed_text_is_capped_in_utf8_bytes(db_session, monkeypatch):
+    monkeypatch.setattr(search, "SEARCH_MAX_INDEXED_BYTES", 10)
+    create_document(db_session, "SOP-4", "Dispensing", "author1")
+    add_version(db_session, "SOP-4", "Ébauche µg dosage überprüfen", "author1", Role.AUTHOR)
+
+    indexed = db_session.scalar(text("SELECT content FROM document_search"))
+    # "µ" would take bytes 10-11, so it is dropped rather than split.
+    assert indexed == "Ébauche "
+    with pytest.raises(TypeError):
+        SearchBackend()
@@ -0,0 +1,51 @@
+from __future__ import annotations
+
+from sqlalchemy import func, select
+
+from backend.audit.models import DocumentTimelineEntry
+from backend.audit.service import log_event
+from backend.audit.timeline import document_history, latest_events, rebuild_timeline, timeline_length
+from backend.auth.models import Role
+from backend.documents.service import add_version, create_document, transition_document
+from backend.workflow.state_machine import DocumentState
+
+
+def _lifecycle(db_session, doc_number: str, versions: int = 3) -> None:
+    create_document(db_session, doc_number, "SOP", "author1")
+    for i in range(versions):
+        add_version(db_session, doc_number, f"{doc_number} body {i}", "author1", Role.AUTHOR)
+    transition_document(db_session, doc_number, DocumentState.REVIEW, "author1", Role.AUTHOR)
+
+
+def test_timeline_is_projected_with_the_events(db_session):
+    _lifecycle(db_session, "DOC-90")
+    _lifecycle(db_session, "DOC-91", versions=1)
+    log_event(db_session, "LOGIN_SUCCESS", "author1", {})
+    db_session.commit()
+
+    assert timeline_length(db_session, "DOC-90") == 5
+    assert [e["event_type"] for e in latest_events(db_session, "DOC-90", 2)] == ["STATE_CHANGE", "VERSION_ADD"]
+    history = document_history(db_session, "DOC-90", before_position=3)
+    assert [(e["position"], e["event_type"]) for e in history] == [(2, "VERSION_ADD"), (1, "DOCUMENT_CREATE")]
+    assert document_history(db_session, "DOC-91")[0]["metadata"] == {"from": "Draft", "to": "Review"}
+
+
+def test_rolled_back_events_leave_no_timeline_entries(db_session):
+    _lifecycle(db_session, "DOC-92", versions=1)
+    db_session.commit()
+    transition_document(db_session, "DOC-92", DocumentState.DRAFT, "author1", Role.AUTHOR)
+    db_session.rollback()
+
+    assert timeline_length(db_session, "DOC-92") == 3
+
+
+def test_rebuild_replays_the_full_trail(db_session):
+    _lifecycle(db_session, "DOC-93")
+    db_session.commit()
+    before = latest_events(db_session, "DOC-93", 10)
+    db_session.query(DocumentTimelineEntry).delete()
+    db_session.commit()
+
+    assert rebuild_timeline(db_session, batch_size=2) == 5
+    assert latest_events(db_session, "DOC-93", 10) == before
+    assert db_session.scalar(select(func.count()).select_from(DocumentTimelineEntry)) == 5
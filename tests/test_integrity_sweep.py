@@ -0,0 +1,78 @@
+from __future__ import annotations
+
+import json
+
+from sqlalchemy import select, update
+
+from backend.audit.integrity import verify_integrity
+from backend.audit.models import AuditEvent
+from backend.auth.models import Role
+from backend.documents import service as document_service
+from backend.documents.service import add_version, create_document, get_version, transition_document
+from backend.signatures.models import ElectronicSignature
+from backend.signatures.service import sign_and_approve
+from backend.workflow.state_machine import DocumentState
+
+
+def _seed(db_session, count: int = 3) -> None:
+    for i in range(count):
+        doc_number = f"DOC-4{i}"
+        create_document(db_session, doc_number, "SOP", "author1")
+        add_version(db_session, doc_number, f"body {i} draft", "author1", Role.AUTHOR)
+        add_version(db_session, doc_number, f"body {i} final", "author1", Role.AUTHOR)
+        transition_document(db_session, doc_number, DocumentState.REVIEW, "author1", Role.AUTHOR)
+        sign_and_approve(db_session, doc_number, "approver1", "QA Approval", Role.APPROVER)
+    db_session.commit()
+
+
+def test_sweep_reports_tampered_versions_and_signatures(db_session, tmp_path):
+    _seed(db_session)
+    tampered = get_version(db_session, "DOC-41", 1)
+    versions = tampered.__table__
+    db_session.execute(update(versions).where(versions.c.id == tampered.id).values(checksum="0" * 64))
+    db_session.execute(
+        update(ElectronicSignature.__table__).where(ElectronicSignature.__table__.c.id == 3).values(meaning="Forged")
+    )
+    db_session.commit()
+
+    report = tmp_path / "report.jsonl"
+    stats = verify_integrity(db_session, report, batch_size=2, workers=2)
+
+    assert (stats.versions, stats.signatures, stats.mismatches) == (6, 3, 2)
+    findings = [json.loads(line) for line in report.read_text(encoding="utf-8").splitlines()]
+    assert [(f["record_type"], f["doc_number"]) for f in findings] == [
+        ("document_version", "DOC-41"),
+        ("electronic_signature", "DOC-42"),
+    ]
+    summary = db_session.scalar(select(AuditEvent).where(AuditEvent.event_type == "INTEGRITY_SWEEP"))
+    assert summary.event_metadata["mismatches"] == 2
+
+
+def test_sweep_resumes_from_checkpoint_and_verifies_deltas(db_session, tmp_path, monkeypatch):
+    monkeypatch.setattr(document_service, "VERSION_STORAGE_MODE", "delta")
+    _seed(db_session, count=2)
+    checkpoint = tmp_path / "sweep.checkpoint"
+    report = tmp_path / "report.jsonl"
+    checkpointed = '{"record_type": "document_version", "id": 1}\n'
+    # A finding written after the last checkpoint, before the crash.
+    report.write_text(checkpointed + '{"record_type": "document_version", "id": 3}\n', encoding="utf-8")
+    checkpoint.write_text(
+        json.dumps(
+            {
+                "versions": 2,
+                "mismatches": 1,
+                "versions_last_id": 2,
+                "signatures_last_id": 0,
+                "report_bytes": len(checkpointed),
+            }
+        ),
+        encoding="utf-8",
+    )
+    held = get_version(db_session, "DOC-40", 1)
+
+    stats = verify_integrity(db_session, report, checkpoint=checkpoint, batch_size=1, workers=0)
+
+    assert (stats.versions, stats.signatures, stats.mismatches) == (4, 2, 1)
+    assert report.read_text(encoding="utf-8") == checkpointed
+    assert not checkpoint.exists()
+    assert held in db_session
@@ -0,0 +1,72 @@
+from __future__ import annotations
+
+import hashlib
+from pathlib import Path
+
+from sqlalchemy import func, select
+
+from backend.audit.models import AuditEvent
+from backend.documents.importer import import_items, scan_source
+from backend.documents.models import Document, DocumentVersion, ImportedSource
+from backend.documents.service import get_version, read_version_content
+
+
+def _legacy_tree(root, documents: int = 3, versions: int = 4):
+    for d in range(documents):
+        doc_dir = root / f"SOP-{d:03d}"
+        doc_dir.mkdir(parents=True)
+        for v in range(versions):
+            (doc_dir / f"v{v:03d}.txt").write_text(f"SOP {d} revision {v}\n", encoding="utf-8")
+
+
+def test_bulk_import_from_tree_with_process_pool(db_session, tmp_path):
+    _legacy_tree(tmp_path / "legacy")
+    stats = import_items(db_session, scan_source(tmp_path / "legacy"), batch_size=5, workers=2)
+
+    assert (stats.documents, stats.versions) == (3, 12)
+    version = get_version(db_session, "SOP-001", 4)
+    assert read_version_content(version) == "SOP 1 revision 3\n"
+    assert version.checksum == hashlib.sha256(b"SOP 1 revision 3\n").hexdigest()
+    event_count = db_session.scalar(select(func.count()).select_from(AuditEvent))
+    assert event_count == 3 + 12
+
+
+def test_bulk_import_resumes_by_source_path(db_session, tmp_path):
+    _legacy_tree(tmp_path / "legacy", documents=2, versions=3)
+    items = scan_source(tmp_path / "legacy")
+    import_items(db_session, items[:4], batch_size=2, workers=0)
+
+    # A file added ahead of the imported ones shifts every list position.
+    (tmp_path / "legacy" / "ADD-000").mkdir()
+    (tmp_path / "legacy" / "ADD-000" / "v000.txt").write_text("added\n", encoding="utf-8")
+    stats = import_items(db_session, scan_source(tmp_path / "legacy"), batch_size=2, workers=0)
+
+    assert (stats.documents, stats.versions, stats.skipped) == (1, 3, 4)
+    assert db_session.scalar(select(func.count()).select_from(Document)) == 3
+    version_numbers = db_session.scalars(
+        select(DocumentVersion.version_no).join(Document).where(Document.doc_number == "SOP-001")
+    ).all()
+    assert sorted(version_numbers) == [1, 2, 3]
+
+
+def test_rerun_after_commit_does_not_duplicate_versions(db_session, tmp_path):
+    _legacy_tree(tmp_path / "legacy", documents=2, versions=2)
+    items = scan_source(tmp_path / "legacy")
+    import_items(db_session, items, batch_size=3, workers=0)
+    stats = import_items(db_session, items, batch_size=3, workers=0)
+
+    assert (stats.documents, stats.versions, stats.skipped) == (0, 0, 4)
+    assert db_session.scalar(select(func.count()).select_from(DocumentVersion)) == 4
+    assert db_session.scalar(select(func.count()).select_from(ImportedSource)) == 4
+
+
+def test_rerun_does_not_read_files_already_imported(db_session, tmp_path):
+    _legacy_tree(tmp_path / "legacy", documents=2, versions=2)
+    items = scan_source(tmp_path / "legacy")
+    import_items(db_session, items[:3], batch_size=2, workers=0)
+    for item in items[:3]:
+        Path(item.path).unlink()
+
+    stats = import_items(db_session, items, batch_size=2, workers=0)
+    assert (stats.documents, stats.versions, stats.skipped) == (0, 1, 3)
+    assert db_session.scalar(select(func.count()).select_from(ImportedSource)) == 4
@@ -0,0 +1,69 @@
+from __future__ import annotations
+
+from backend.auth.throttle import LoginThrottle, TokenBucketLimiter, login_throttle, signature_reauth_throttle
+
+
+def test_token_bucket_limits_bursts_and_refills():
+    limiter = TokenBucketLimiter(capacity=3, refill_per_second=1.0)
+    assert [limiter.allow("author1", now=0.0) for _ in range(4)] == [True, True, True, False]
+    assert limiter.allow("author1", now=1.0) is True
+    assert limiter.allow("author1", now=1.0) is False
+
+
+def test_token_bucket_memory_is_bounded_and_idle_buckets_dropped():
+    limiter = TokenBucketLimiter(capacity=2, refill_per_second=1.0, max_keys=100)
+    for i in range(1000):
+        limiter.allow(f"user{i}", now=0.0)
+    assert len(limiter) == 100
+
+    limiter = TokenBucketLimiter(capacity=2, refill_per_second=1.0, max_keys=100)
+    limiter.allow("idle", now=0.0)
+    limiter.allow("active", now=10.0)
+    assert len(limiter) == 1
+
+
+def test_login_throttle_checks_username_and_address():
+    throttle = LoginThrottle(
+        by_username=TokenBucketLimiter(capacity=5, refill_per_second=0.0),
+        by_address=TokenBucketLimiter(capacity=2, refill_per_second=0.0),
+    )
+    assert throttle.allow("author1", "10.0.0.1", now=0.0)
+    assert throttle.allow("author2", "10.0.0.1", now=0.0)
+    assert not throttle.allow("author3", "10.0.0.1", now=0.0)
+    assert throttle.allow("author3", "10.0.0.2", now=0.0)
+
+
+def test_repeated_failures_collapse_into_one_audit_event_per_window():
+    throttle = LoginThrottle(failure_window_seconds=60)
+    reported = [throttle.record_failure("author1", now=float(t)) for t in range(0, 60, 10)]
+    assert reported == [1, 0, 0, 0, 0, 0]
+    assert throttle.record_failure("author1", now=61.0) == 6
+
+
+def test_trailing_and_evicted_failures_are_flushed():
+    throttle = LoginThrottle(failure_window_seconds=60, max_keys=2)
+    assert throttle.record_failure("author1", now=0.0) == 1
+    assert throttle.record_failure("author1", now=10.0) == 0
+    assert throttle.record_failure("author1", now=20.0) == 0
+    assert throttle.flush(now=30.0) == []
+    assert throttle.flush(now=60.0) == [("author1", 2)]
+    assert throttle.record_failure("author1", now=70.0) == 1
+
+    throttle.record_failure("author1", now=71.0)
+    throttle.record_failure("author2", now=72.0)
+    throttle.record_failure("author3", now=73.0)
+    assert throttle.take_evicted() == [("author1", 1)]
+    assert throttle.take_evicted() == []
+
+
+def test_zero_capacity_limiter_denies_without_error():
+    limiter = TokenBucketLimiter(capacity=0, refill_per_second=1.0, max_keys=0)
+    assert limiter.allow("author1", now=0.0) is False
+    assert len(limiter) == 0
+
+
+def test_signature_reauth_shares_login_buckets_but_not_audit_windows():
+    assert signature_reauth_throttle.by_username is login_throttle.by_username
+    throttle = LoginThrottle(login_throttle.by_username, login_throttle.by_address)
+    assert throttle.record_failure("approver9", now=0.0) == 1
+    assert login_throttle.record_failure("approver9", now=0.0) == 1
@@ -0,0 +1,99 @@
+from __future__ import annotations
+
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from sqlalchemy import create_engine, func, select
+from sqlalchemy.orm import sessionmaker
+
+from backend.audit.models import AuditEvent
+from backend.auth.models import Role
+from backend.db.base import Base
+from backend.documents.models import Document
+from backend.documents.service import (
+    ConcurrentUpdateError,
+    add_version,
+    create_document,
+    retry_on_conflict,
+    transition_document,
+)
+from backend.signatures.models import ElectronicSignature
+from backend.signatures.service import sign_and_approve
+from backend.workflow.state_machine import DocumentState
+
+
+@pytest.fixture()
+def file_sessions(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'occ.db'}", connect_args={"timeout": 30})
+    Base.metadata.create_all(engine)
+    yield sessionmaker(bind=engine)
+    engine.dispose()
+
+
+def _in_review(Session, doc_number: str) -> None:
+    with Session.begin() as session:
+        create_document(session, doc_number, "SOP", "author1")
+        add_version(session, doc_number, "body", "author1", Role.AUTHOR)
+        transition_document(session, doc_number, DocumentState.REVIEW, "author1", Role.AUTHOR)
+
+
+def test_stale_state_change_is_rejected(file_sessions):
+    _in_review(file_sessions, "DOC-80")
+    with file_sessions() as stale, file_sessions.begin() as winner:
+        read = stale.scalar(select(Document).where(Document.doc_number == "DOC-80"))
+        transition_document(winner, "DOC-80", DocumentState.DRAFT, "author1", Role.AUTHOR)
+        winner.commit()
+
+        with pytest.raises(ConcurrentUpdateError):
+            transition_document(stale, "DOC-80", DocumentState.APPROVED, "approver1", Role.APPROVER)
+        stale.rollback()
+        assert read.state == DocumentState.DRAFT
+
+
+def test_racing_approvers_sign_once(file_sessions):
+    _in_review(file_sessions, "DOC-81")
+    with file_sessions() as first, file_sessions() as second:
+        read = second.scalar(select(Document).where(Document.doc_number == "DOC-81"))
+        sign_and_approve(first, "DOC-81", "approver1", "QA Approval", Role.APPROVER)
+        first.commit()
+
+        with pytest.raises(ConcurrentUpdateError):
+            sign_and_approve(second, "DOC-81", "approver2", "QA Approval", Role.APPROVER)
+        second.rollback()
+        assert read.state == DocumentState.APPROVED
+
+    with file_sessions() as session:
+        assert session.scalar(select(func.count()).select_from(ElectronicSignature)) == 1
+        assert session.scalar(select(Document.row_version).where(Document.doc_number == "DOC-81")) == 3
+
+
+def test_concurrent_toggles_lose_no_updates(file_sessions):
+    _in_review(file_sessions, "DOC-82")
+
+    def toggle(session) -> None:
+        document = session.scalar(select(Document).where(Document.doc_number == "DOC-82"))
+        target = DocumentState.DRAFT if document.state == DocumentState.REVIEW else DocumentState.REVIEW
+        transition_document(session, "DOC-82", target, "author1", Role.AUTHOR)
+
+    def worker(_n: int) -> int:
+        done = 0
+        for _ in range(15):
+            retry_on_conflict(file_sessions.begin, toggle, attempts=50)
+            done += 1
+        return done
+
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        toggles = sum(pool.map(worker, range(4)))
+
+    with file_sessions() as session:
+        document = session.scalar(select(Document).where(Document.doc_number == "DOC-82"))
+        changes = session.scalars(
+            select(AuditEvent.event_metadata).where(
+                AuditEvent.event_type == "STATE_CHANGE", AuditEvent.record_id == "DOC-82"
+            ).order_by(AuditEvent.sequence)
+        ).all()
+    assert toggles == 60
+    assert len(changes) == 1 + toggles
+    assert all(prev["to"] == nxt["from"] for prev, nxt in zip(changes, changes[1:]))
+    assert document.row_version == 2 + toggles
+    assert document.state == DocumentState.REVIEW
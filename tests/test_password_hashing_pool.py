@@ -0,0 +1,42 @@
+from __future__ import annotations
+
+import threading
+
+import pytest
+
+from backend.auth.hashing import HashingBusy, HashingPool
+from backend.auth.service import AuthError, hash_password, verify_password
+
+
+def test_hashing_pool_rejects_when_saturated_and_records_timings():
+    pool = HashingPool(workers=1, queue_limit=0)
+    started = threading.Event()
+    release = threading.Event()
+
+    def blocking() -> str:
+        started.set()
+        release.wait(5)
+        return "done"
+
+    results: list[str] = []
+    worker = threading.Thread(target=lambda: results.append(pool.run(blocking)))
+    worker.start()
+    started.wait(5)
+    with pytest.raises(HashingBusy):
+        pool.run(hash_password, "ComplexPass123")
+    release.set()
+    worker.join(5)
+
+    encoded = pool.run(hash_password, "ComplexPass123")
+    assert results == ["done"]
+    assert pool.run(verify_password, "ComplexPass123", encoded) is True
+    stats = pool.stats()
+    assert stats["rejected"] == 1
+    assert stats["completed"] == 3
+    assert stats["hash_seconds"] > 0
+
+
+def test_hashing_pool_propagates_policy_errors():
+    pool = HashingPool(workers=1, queue_limit=1)
+    with pytest.raises(AuthError):
+        pool.run(hash_password, "short")
@@ -0,0 +1,54 @@
+from __future__ import annotations
+
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from sqlalchemy import event, func, select
+
+from backend.audit.models import AuditEvent
+from backend.auth.models import Role, UserSession
+from backend.auth.service import (
+    AuthError,
+    create_user,
+    login,
+    logout,
+    revoke_all_sessions,
+    sweep_sessions,
+    validate_token,
+)
+
+
+def test_revoke_all_sessions_uses_single_update(db_session):
+    create_user(db_session, "author1", "ComplexPass123", Role.AUTHOR)
+    tokens = [login(db_session, "author1", "ComplexPass123") for _ in range(3)]
+    validate_token(db_session, tokens[0])
+
+    updates: list[str] = []
+    event.listen(
+        db_session.get_bind(),
+        "before_cursor_execute",
+        lambda *args: updates.append(args[2]) if args[2].startswith("UPDATE") else None,
+    )
+    assert revoke_all_sessions(db_session, "author1", "admin1") == 3
+    assert len(updates) == 1
+    for token in tokens:
+        with pytest.raises(AuthError):
+            validate_token(db_session, token)
+
+
+def test_sweep_removes_expired_and_revoked_sessions_in_batches(db_session):
+    create_user(db_session, "author1", "ComplexPass123", Role.AUTHOR)
+    tokens = [login(db_session, "author1", "ComplexPass123") for _ in range(5)]
+    logout(db_session, validate_token(db_session, tokens[0])["sid"], "author1")
+
+    removed = sweep_sessions(db_session, batch_size=2, now=datetime.now(timezone.utc))
+    assert removed == 1
+    assert db_session.scalar(select(func.count()).select_from(UserSession)) == 4
+
+    commits: list[int] = []
+    event.listen(db_session.get_bind(), "commit", lambda _conn: commits.append(1))
+    removed = sweep_sessions(db_session, batch_size=2, now=datetime.now(timezone.utc) + timedelta(days=1))
+    assert removed == 4
+    assert len(commits) == 3
+    summaries = db_session.scalars(select(AuditEvent).where(AuditEvent.event_type == "SESSION_SWEEP")).all()
+    assert [evt.event_metadata for evt in summaries] == [{"removed": 1, "batches": 1}, {"removed": 4, "batches": 2}]
@@ -0,0 +1,67 @@
+from __future__ import annotations
+
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import update
+
+from backend.auth.models import Role
+from backend.documents.service import add_version, create_document, transition_document
+from backend.signatures.models import ElectronicSignature
+from backend.signatures.service import sign_and_approve_batch
+from backend.signatures.verification import SignatureFilter, verify_signatures
+from backend.workflow.state_machine import DocumentState
+
+
+def _seed(db_session, count: int = 6) -> None:
+    for i in range(count):
+        doc_number = f"DOC-7{i}"
+        create_document(db_session, doc_number, "SOP", "author1")
+        add_version(db_session, doc_number, f"body {i}", "author1", Role.AUTHOR)
+        transition_document(db_session, doc_number, DocumentState.REVIEW, "author1", Role.AUTHOR)
+    sign_and_approve_batch(db_session, [f"DOC-7{i}" for i in range(0, count, 2)], "approver1", "QA", Role.APPROVER)
+    sign_and_approve_batch(db_session, [f"DOC-7{i}" for i in range(1, count, 2)], "approver2", "QA", Role.APPROVER)
+    db_session.commit()
+
+
+def _tamper(db_session, signature_id: int, **values) -> None:
+    table = ElectronicSignature.__table__
+    db_session.execute(update(table).where(table.c.id == signature_id).values(**values))
+    db_session.commit()
+
+
+def test_bulk_verification_reports_tampered_signatures(db_session):
+    _seed(db_session)
+    _tamper(db_session, 2, meaning="Forged")
+    _tamper(db_session, 5, version_id=1)
+
+    result = verify_signatures(db_session, batch_size=2, workers=2)
+
+    assert result.checked == 6
+    assert not result.ok
+    assert [(m["id"], m["doc_number"], m["reason"]) for m in result.mismatches] == [
+        (2, "DOC-72", "signature hash mismatch"),
+        (5, "DOC-73", "signature hash mismatch"),
+    ]
+
+
+def test_bulk_verification_filters(db_session):
+    _seed(db_session)
+    _tamper(db_session, 2, meaning="Forged")
+
+    by_signer = verify_signatures(db_session, SignatureFilter(signer="approver2"), workers=1)
+    assert (by_signer.checked, by_signer.ok) == (3, True)
+    by_document = verify_signatures(db_session, SignatureFilter(doc_number="DOC-72"), workers=1)
+    assert (by_document.checked, [m["id"] for m in by_document.mismatches]) == (1, [2])
+    future = datetime.now(timezone.utc) + timedelta(days=1)
+    assert verify_signatures(db_session, SignatureFilter(signed_from=future), workers=1).checked == 0
+    assert verify_signatures(db_session, SignatureFilter(signed_to=future), workers=1).checked == 6
+
+
+def test_bulk_verification_pages_by_id(db_session):
+    _seed(db_session)
+    _tamper(db_session, 5, meaning="Forged")
+
+    first = verify_signatures(db_session, workers=1, limit=4)
+    assert (first.checked, first.last_id, first.ok) == (4, 4, True)
+    rest = verify_signatures(db_session, workers=1, after_id=first.last_id, limit=4)
+    assert (rest.checked, rest.last_id, [m["id"] for m in rest.mismatches]) == (2, 6, [5])
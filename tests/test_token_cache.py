@@ -0,0 +1,58 @@
+from __future__ import annotations
+
+import pytest
+from sqlalchemy import event
+
+from backend.auth.models import Role
+from backend.auth.service import AuthError, create_user, deactivate_user, login, logout, validate_token
+from backend.auth.token_cache import ValidatedTokenCache, token_cache
+
+
+def _count_statements(db_session) -> list[str]:
+    statements: list[str] = []
+    event.listen(db_session.get_bind(), "before_cursor_execute", lambda *args: statements.append(args[2]))
+    return statements
+
+
+def test_validated_token_served_from_cache_without_queries(db_session):
+    token_cache.clear()
+    create_user(db_session, "author1", "ComplexPass123", Role.AUTHOR)
+    token = login(db_session, "author1", "ComplexPass123")
+    validate_token(db_session, token)
+
+    statements = _count_statements(db_session)
+    claims = validate_token(db_session, token)
+
+    assert claims["sub"] == "author1"
+    assert statements == []
+    assert token_cache.stats()["hits"] == 1
+    assert token_cache.stats()["misses"] == 1
+
+
+def test_logout_and_deactivation_drop_cached_sessions(db_session):
+    token_cache.clear()
+    create_user(db_session, "author1", "ComplexPass123", Role.AUTHOR)
+    token = login(db_session, "author1", "ComplexPass123")
+    claims = validate_token(db_session, token)
+    logout(db_session, claims["sid"], "author1")
+    with pytest.raises(AuthError):
+        validate_token(db_session, token)
+
+    token = login(db_session, "author1", "ComplexPass123")
+    validate_token(db_session, token)
+    deactivate_user(db_session, "author1", "admin1")
+    with pytest.raises(AuthError):
+        validate_token(db_session, token)
+
+
+def test_cache_evicts_least_recently_used_and_expired_entries():
+    cache = ValidatedTokenCache(ttl_seconds=60, max_entries=2)
+    cache.put("a", {"sub": "u1"}, session_expires_at=float("inf"))
+    cache.put("b", {"sub": "u2"}, session_expires_at=float("inf"))
+    cache.get("a")
+    cache.put("c", {"sub": "u3"}, session_expires_at=float("inf"))
+    assert cache.get("b") is None
+    assert cache.get("a") == {"sub": "u1"}
+
+    cache.put("d", {"sub": "u4"}, session_expires_at=0)
+    assert cache.get("d") is None
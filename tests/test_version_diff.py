@@ -0,0 +1,35 @@
+from __future__ import annotations
+
+from backend.auth.models import Role
+from backend.documents import diff as diff_module
+from backend.documents.diff import DiffCache, diff_versions
+from backend.documents.service import add_version, create_document
+
+
+def test_diff_between_versions_is_cached_by_checksum_pair(db_session, monkeypatch):
+    monkeypatch.setattr(diff_module, "diff_cache", DiffCache(max_bytes=1024 * 1024))
+    create_document(db_session, "SOP-20", "Cleaning", "author1")
+    add_version(db_session, "SOP-20", "Step 1: rinse\nStep 2: dry\n", "author1", Role.AUTHOR)
+    add_version(db_session, "SOP-20", "Step 1: rinse\nStep 2: wipe with IPA\nStep 3: dry\n", "author1", Role.AUTHOR)
+
+    first = "".join(diff_versions(db_session, "SOP-20", 1, 2))
+    second = "".join(diff_versions(db_session, "SOP-20", 1, 2))
+
+    assert first == second
+    assert first.startswith("--- SOP-20 v1 (")
+    assert "-Step 2: dry\n+Step 2: wipe with IPA\n+Step 3: dry\n" in first
+    assert diff_module.diff_cache.stats()["hits"] == 1
+
+
+def test_diff_cache_is_bounded_and_skips_oversized_diffs():
+    cache = DiffCache(max_bytes=1200)
+    list(cache.stream_through(("a", "b"), ["x" * 50] * 3))
+    list(cache.stream_through(("c", "d"), ["é" * 60]))
+    assert cache.stats()["bytes"] == 0
+
+    for i in range(10):
+        list(cache.stream_through((str(i), "n"), ["z" * 90]))
+    stats = cache.stats()
+    assert stats["bytes"] <= 1200
+    assert cache.get(("0", "n")) is None
+    assert cache.get(("9", "n")) == ("z" * 90,)
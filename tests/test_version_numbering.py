@@ -0,0 +1,38 @@
+from __future__ import annotations
+
+from sqlalchemy import event, inspect, select
+
+from backend.auth.models import Role
+from backend.documents import service as document_service
+from backend.documents.models import DocumentVersion
+from backend.documents.service import add_version, create_document
+
+
+def test_version_numbering_does_not_load_prior_content(db_session):
+    create_document(db_session, "DOC-6", "SOP", "author1")
+    for i in range(3):
+        add_version(db_session, "DOC-6", f"content-v{i}", "author1", Role.AUTHOR)
+    db_session.expunge_all()
+
+    statements: list[str] = []
+    event.listen(db_session.get_bind(), "before_cursor_execute", lambda *args: statements.append(args[2]))
+    version = add_version(db_session, "DOC-6", "content-v4", "author1", Role.AUTHOR)
+
+    assert version.version_no == 4
+    assert not any("document_versions.content" in stmt for stmt in statements)
+    loaded = db_session.scalars(select(DocumentVersion).where(DocumentVersion.version_no == 1)).one()
+    assert "content" in inspect(loaded).unloaded
+
+
+def test_add_version_retries_on_version_number_conflict(db_session, monkeypatch):
+    create_document(db_session, "DOC-7", "SOP", "author1")
+    add_version(db_session, "DOC-7", "content-v1", "author1", Role.AUTHOR)
+
+    real_next = document_service._next_version_no
+    stale = iter([1])
+    monkeypatch.setattr(document_service, "_next_version_no", lambda s, d: next(stale, None) or real_next(s, d))
+    version = add_version(db_session, "DOC-7", "content-v2", "author1", Role.AUTHOR)
+
+    assert version.version_no == 2
+    versions = db_session.scalars(select(DocumentVersion.version_no).order_by(DocumentVersion.version_no)).all()
+    assert versions == [1, 2]
@@ -0,0 +1,66 @@
+from __future__ import annotations
+
+import hashlib
+
+import pytest
+from fastapi import HTTPException
+
+from backend.api.routes import _parse_range
+from backend.auth.models import Role
+from backend.documents import blobstore
+from backend.documents.blobstore import BlobStore, BlobStoreError, BlobTooLarge
+from backend.documents.service import (
+    add_version,
+    add_version_from_blob,
+    create_document,
+    get_version,
+    iter_version_content,
+)
+
+
+def test_streamed_upload_hashes_incrementally_and_serves_ranges(db_session, tmp_path, monkeypatch):
+    store = BlobStore(tmp_path)
+    monkeypatch.setattr(blobstore, "blob_store", store)
+    body = b"".join(f"step {i}: verify line clearance\n".encode("utf-8") for i in range(10_000))
+    chunks = (body[i:i + 4096] for i in range(0, len(body), 4096))
+
+    create_document(db_session, "DOC-11", "Batch record", "author1")
+    checksum, size = store.put_stream(chunks)
+    version = add_version_from_blob(db_session, "DOC-11", checksum, "author1", Role.AUTHOR)
+
+    assert (checksum, size) == (hashlib.sha256(body).hexdigest(), len(body))
+    assert version.checksum == checksum
+    served = list(iter_version_content(get_version(db_session, "DOC-11", 1), 100, 200_000, chunk_size=65536))
+    assert b"".join(served) == body[100:200_000]
+    assert max(len(chunk) for chunk in served) <= 65536
+
+
+def test_inline_versions_stream_and_invalid_uploads_are_rejected(db_session, tmp_path):
+    create_document(db_session, "DOC-12", "SOP", "author1")
+    add_version(db_session, "DOC-12", "inline body", "author1", Role.AUTHOR)
+    assert b"".join(iter_version_content(get_version(db_session, "DOC-12", 1), 7)) == b"body"
+
+    store = BlobStore(tmp_path)
+    with pytest.raises(BlobStoreError):
+        store.put_stream([b"\xff\xfe"])
+    assert [p for p in tmp_path.rglob("*") if p.is_file()] == []
+
+
+def test_oversized_upload_is_aborted(tmp_path):
+    store = BlobStore(tmp_path)
+    with pytest.raises(BlobTooLarge):
+        store.put_stream([b"a" * 4096, b"b" * 4096], max_size=6000)
+    assert [p for p in tmp_path.rglob("*") if p.is_file()] == []
+    assert store.put_stream([b"a" * 4096], max_size=6000)[1] == 4096
+
+
+def test_parse_range_header():
+    assert _parse_range(None, 100) is None
+    assert _parse_range("bytes=0-9", 100) == (0, 10)
+    assert _parse_range("bytes=90-", 100) == (90, 100)
+    assert _parse_range("bytes=-5", 100) == (95, 100)
+    assert _parse_range("bytes=50-500", 100) == (50, 100)
+    with pytest.raises(HTTPException):
+        _parse_range("bytes=200-", 100)
+    with pytest.raises(HTTPException):
+        _parse_range("items=0-1", 100)
@@ -0,0 +1,152 @@
+from __future__ import annotations
+
+import json
+
+import pytest
+from sqlalchemy import create_engine, select, text
+from sqlalchemy.orm import Session
+
+from backend.auth.models import Role
+from backend.auth.rbac import PermissionDenied
+from backend.db.maintenance import upgrade_schema
+from backend.documents.models import Document
+from backend.documents.service import (
+    DocumentError,
+    add_version,
+    create_document,
+    transition_document,
+    transition_documents_bulk,
+)
+from backend.signatures.service import sign_and_approve, sign_and_approve_batch
+from backend.workflow.engine import compile_workflows, load_workflows, workflow_registry
+from backend.workflow.state_machine import DocumentState, WorkflowError
+
+CONFIG = {
+    "default": "simple",
+    "workflows": {
+        "simple": {
+            "transitions": [
+                {"from": "DRAFT", "to": "REVIEW", "roles": ["AUTHOR"]},
+                {"from": "REVIEW", "to": "APPROVED", "roles": ["APPROVER"], "lock": True},
+            ]
+        }
+    },
+}
+
+
+def test_compiled_guards_enforce_roles_and_transitions():
+    registry = compile_workflows(CONFIG)
+    simple = registry.get(registry.default)
+
+    assert simple.initial == DocumentState.DRAFT
+    assert simple.targets(DocumentState.REVIEW) == {DocumentState.APPROVED}
+    assert simple.authorize(DocumentState.REVIEW, DocumentState.APPROVED, Role.APPROVER).lock
+    with pytest.raises(PermissionDenied):
+        simple.authorize(DocumentState.DRAFT, DocumentState.REVIEW, Role.APPROVER)
+    with pytest.raises(WorkflowError, match="Transition not allowed: Draft -> Approved"):
+        simple.transition(DocumentState.DRAFT, DocumentState.APPROVED)
+    with pytest.raises(PermissionDenied):
+        registry.bulk_sources(DocumentState.APPROVED, Role.AUTHOR)
+    with pytest.raises(WorkflowError):
+        registry.bulk_sources(DocumentState.ARCHIVED, Role.ADMIN)
+    with pytest.raises(WorkflowError):
+        registry.get("missing")
+
+
+@pytest.mark.parametrize(
+    "transition",
+    [
+        {"from": "DRAFT", "to": "PUBLISHED"},
+        {"from": "DRAFT", "to": "REVIEW", "roles": ["EDITOR"]},
+        {"to": "REVIEW"},
+    ],
+)
+def test_invalid_definitions_are_rejected(tmp_path, transition):
+    path = tmp_path / "workflows.json"
+    path.write_text(json.dumps({"workflows": {"broken": {"transitions": [transition]}}}), encoding="utf-8")
+    with pytest.raises(WorkflowError):
+        load_workflows(path)
+
+
+def test_duplicate_transition_and_unknown_default_are_rejected():
+    duplicate = {"workflows": {"twice": {"transitions": [{"from": "DRAFT", "to": "REVIEW"}] * 2}}}
+    with pytest.raises(WorkflowError):
+        compile_workflows(duplicate)
+    with pytest.raises(WorkflowError):
+        compile_workflows({**CONFIG, "default": "missing"})
+
+
+def test_controlled_document_follows_its_own_lifecycle(db_session):
+    create_document(db_session, "DOC-C1", "SOP", "author1", workflow="controlled")
+    add_version(db_session, "DOC-C1", "body", "author1", Role.AUTHOR)
+    transition_document(db_session, "DOC-C1", DocumentState.REVIEW, "author1", Role.AUTHOR)
+    transition_document(db_session, "DOC-C1", DocumentState.REJECTED, "reviewer1", Role.REVIEWER)
+    with pytest.raises(WorkflowError):
+        transition_document(db_session, "DOC-C1", DocumentState.APPROVED, "approver1", Role.APPROVER)
+    transition_document(db_session, "DOC-C1", DocumentState.DRAFT, "author1", Role.AUTHOR)
+    transition_document(db_session, "DOC-C1", DocumentState.REVIEW, "author1", Role.AUTHOR)
+    sign_and_approve(db_session, "DOC-C1", "approver1", "QA Approval", Role.APPROVER)
+
+    with pytest.raises(WorkflowError):
+        transition_document(db_session, "DOC-C1", DocumentState.ARCHIVED, "approver1", Role.APPROVER)
+    with pytest.raises(PermissionDenied):
+        transition_document(db_session, "DOC-C1", DocumentState.EFFECTIVE, "author1", Role.AUTHOR)
+    document = transition_document(db_session, "DOC-C1", DocumentState.EFFECTIVE, "approver1", Role.APPROVER)
+    assert (document.state, document.locked) == (DocumentState.EFFECTIVE, True)
+    transition_document(db_session, "DOC-C1", DocumentState.ARCHIVED, "approver1", Role.APPROVER)
+
+
+def test_default_workflow_is_unchanged(db_session):
+    document = create_document(db_session, "DOC-D1", "SOP", "author1")
+    assert document.workflow == workflow_registry.default == "document"
+    transition_document(db_session, "DOC-D1", DocumentState.REVIEW, "author1", Role.AUTHOR)
+    with pytest.raises(WorkflowError):
+        transition_document(db_session, "DOC-D1", DocumentState.REJECTED, "reviewer1", Role.REVIEWER)
+    with pytest.raises(DocumentError):
+        create_document(db_session, "DOC-D2", "SOP", "author1", workflow="missing")
+
+
+def test_bulk_and_batch_operations_span_workflows(db_session):
+    for doc_number, workflow in (("DOC-B1", "document"), ("DOC-B2", "controlled")):
+        create_document(db_session, doc_number, "SOP", "author1", workflow=workflow)
+        add_version(db_session, doc_number, "body", "author1", Role.AUTHOR)
+    reviewed = transition_documents_bulk(db_session, ["DOC-B1", "DOC-B2"], DocumentState.REVIEW, "author1", Role.AUTHOR)
+    assert sorted(reviewed.changed) == ["DOC-B1", "DOC-B2"]
+
+    results = sign_and_approve_batch(db_session, ["DOC-B1", "DOC-B2"], "approver1", "QA Approval", Role.APPROVER)
+    assert all(result.signed for result in results)
+
+    effective = transition_documents_bulk(
+        db_session, ["DOC-B1", "DOC-B2"], DocumentState.EFFECTIVE, "approver1", Role.APPROVER
+    )
+    assert effective.changed == ["DOC-B2"]
+    assert effective.skipped == {"DOC-B1": "Transition not allowed: Approved -> Effective"}
+    states = dict(db_session.execute(select(Document.doc_number, Document.state)).all())
+    assert states == {"DOC-B1": DocumentState.APPROVED, "DOC-B2": DocumentState.EFFECTIVE}
+
+
+def test_upgrade_adds_columns_to_an_existing_documents_table():
+    engine = create_engine("sqlite+pysqlite:///:memory:")
+    with engine.begin() as conn:
+        conn.execute(
+            text(
+                "CREATE TABLE documents (id INTEGER PRIMARY KEY, doc_number VARCHAR(64) UNIQUE NOT NULL, "
+                "title VARCHAR(255) NOT NULL, owner_username VARCHAR(100) NOT NULL, state VARCHAR(8) NOT NULL, "
+                "locked BOOLEAN NOT NULL, created_at DATETIME NOT NULL)"
+            )
+        )
+        conn.execute(
+            text(
+                "INSERT INTO documents (doc_number, title, owner_username, state, locked, created_at) "
+                "VALUES ('DOC-OLD', 'SOP', 'author1', 'REVIEW', 0, '2024-01-01 00:00:00')"
+            )
+        )
+
+    assert len(upgrade_schema(engine)) == 2
+    assert upgrade_schema(engine) == []
+    with Session(engine) as session:
+        document = session.scalar(select(Document).where(Document.doc_number == "DOC-OLD"))
+        assert (document.workflow, document.row_version) == ("document", 1)
+        transition_document(session, "DOC-OLD", DocumentState.DRAFT, "author1", Role.AUTHOR)
+        assert document.row_version == 2
+    engine.dispose()